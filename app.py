@@ -1,13 +1,25 @@
 # --- 1. 라이브러리 및 모듈 임포트 ---
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for
+from flask import Flask, render_template, request, jsonify, session, redirect, url_for, Response, stream_with_context, g, send_from_directory
 from datetime import timedelta, date
-from calendar import monthrange
-import re  # 정규표현식
+import io
+import csv
+import json
+import time
 
 # 사용자 정의 모듈 (modules 폴더 안에 있어야 함)
 import modules.user as user_db       # modules/user.py
 import modules.ledger as ledger_db   # modules/ledger.py
 import modules.config as config      # modules/config.py
+import modules.importer as importer  # modules/importer.py
+import modules.cache as stats_cache  # modules/cache.py
+import modules.passwords as passwords  # modules/passwords.py
+import modules.ratelimit as ratelimit  # modules/ratelimit.py
+import modules.metrics as metrics      # modules/metrics.py
+import modules.advice as advice        # modules/advice.py
+import modules.assets as assets        # modules/assets.py
+import modules.serializer as serializer  # modules/serializer.py
+import modules.recurring as recurring    # modules/recurring.py
+import modules.web as web                # modules/web.py (asgi.py 와 같이 쓰는 파싱/검사 함수)
 
 # ====================== flask & session 설정 ======================
 app = Flask(__name__)
@@ -20,6 +32,34 @@ app.config.update(
     SESSION_COOKIE_SAMESITE="Lax"
 )
 
+# JSON 응답은 orjson(없으면 표준 json) 으로 직렬화, 큰 응답은 gzip (modules/serializer.py)
+app.json_provider_class = serializer.json_provider(app.json_provider_class)
+app.json = app.json_provider_class(app)
+
+@app.after_request
+def compress_response(resp):
+    if (serializer.should_compress(resp, request.accept_encodings)
+            and not resp.direct_passthrough and not resp.is_streamed):
+        serializer.compress(resp, resp.get_data())
+    return resp
+
+# ====================== 계측 (/metrics) ======================
+# 로그인 확인보다 먼저 등록해야 리다이렉트/401 응답 시간도 잡힘
+if metrics.ENABLED:
+    app.json = metrics.timed_json_provider(app.json_provider_class)(app)
+
+    @app.before_request
+    def start_request_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def observe_request_time(resp):
+        started = g.get('request_started')
+        if started is not None:
+            metrics.observe_request(request.endpoint, request.method, resp.status_code,
+                                    time.perf_counter() - started)
+        return resp
+
 # ====================== 전역 설정 (Context Processor) ======================
 @app.context_processor
 def inject_user():
@@ -29,20 +69,42 @@ def inject_user():
         'id': session.get('id')
     }
 
+@app.template_global()
+def asset_url(filename):
+    """ 정적 파일 주소: 빌드(python -m modules.assets build)가 있으면 내용 해시가 붙은 파일 """
+    built = assets.built_path(filename)
+    if built:
+        return url_for('static_dist', filename=built)
+    return url_for('static', filename=filename)
+
+@app.route('/static/dist/<path:filename>')
+def static_dist(filename):
+    """ 빌드된 정적 파일 (이름이 내용 해시라서 1년 캐시 + immutable, 미리 압축한 .br/.gz 우선) """
+    served, encoding = assets.negotiate(filename, request.accept_encodings)
+    resp = send_from_directory(assets.DIST_DIR, served, mimetype=assets.mimetype(filename))
+    if encoding:
+        resp.headers['Content-Encoding'] = encoding
+    resp.headers['Vary'] = 'Accept-Encoding'
+    resp.headers['Cache-Control'] = assets.CACHE_CONTROL
+    return resp
+
 @app.before_request
 def require_login_for_all_except_public():
-    """로그인 안 한 사용자는 로그인 페이지로 튕겨내기 (화이트리스트 방식)"""
-    # 접근 허용할 엔드포인트 이름들
-    public_endpoints = {'login_view', 'login', 'register_view', 'register', 'static'}
-    
-    ep = (request.endpoint or '').split('.')[0]
-    
-    if ep in public_endpoints:
-        return 
+    """로그인 안 한 사용자는 로그인 페이지로 튕겨내기 (web.PUBLIC_ENDPOINTS 화이트리스트)"""
+    if web.is_public(request.endpoint):
+        return
+
+    # 세션의 사용자가 아직 있는지 확인 (사용자 캐시 덕분에 대부분 DB 조회 없이 끝남)
+    user_id = session.get('id')
+    try:
+        if user_id and user_db.get_user(user_id) is None:
+            session.clear()
+    except Exception as e:
+        print(f"[SESSION CHECK ERROR] {type(e).__name__}: {e}")
 
     if not session.get('id'):
         # API 요청이면 401 에러 반환, 일반 페이지 요청이면 로그인 페이지로 이동
-        if request.is_json or request.path.startswith(('/add', '/delete', '/transactions', '/api')):
+        if web.wants_401(request.is_json, request.path):
             return jsonify(success=False, message='Login required'), 401
         return redirect(url_for('login_view', next=request.path))
 
@@ -61,27 +123,43 @@ def login_view():
 
 @app.route('/register')
 def register_view():
-    """ [신규] 회원가입 페이지 보여주기 """
+    """ 회원가입 페이지 """
     if session.get('id'):
         return redirect(url_for('ledger_view'))
     return render_template('register.html')
 
 @app.route('/ledger')
 def ledger_view():
-    return render_template('ledger.html')
+    initial_data = None
+    if web.INLINE_INITIAL_DATA:
+        try:
+            # 달력 세 달의 내역 있는 날짜 + 오늘 내역 (두 쿼리를 동시에)
+            initial = ledger_db.select_ledger_initial(session.get('id'), date.today())
+            initial_data = web.inline_json(app.json.dumps(initial))
+        except Exception as e:
+            # 실패하면 브라우저가 기존처럼 API 로 받아감
+            print(f"[PAGE DATA ERROR] {type(e).__name__}: {e}")
+    return render_template('ledger.html', initial_data=initial_data)
 
 @app.route('/statistics')
 def statistics_view():
-    return render_template('statistics.html')
+    initial = None
+    if web.INLINE_INITIAL_DATA:
+        today = date.today()
+        try:
+            # /api/stats/dashboard 와 같은 캐시 항목 (이번 달, 최근 10주)
+            _, body = _dashboard_cached(session.get('id'), today.year, today.month, web.DASHBOARD_WEEKS, today)
+            initial = {'year': today.year, 'month': today.month, 'dashboard': web.inline_json(body)}
+        except Exception as e:
+            print(f"[PAGE DATA ERROR] {type(e).__name__}: {e}")
+    return render_template('statistics.html', initial=initial)
 
 # ====================== 회원가입 & 로그인 API ======================
 
 @app.route('/api/register', methods=['POST'])
 def register():
-    """
-    [신규] 회원가입 처리 API
-    """
-    data = request.get_json()
+    """ 회원가입 처리 API """
+    data = request.get_json(silent=True)
     if not data:
         return jsonify({"ok": False, "error": "잘못된 요청입니다."}), 400
 
@@ -91,271 +169,566 @@ def register():
 
     if not all([username, user_id, password]):
         return jsonify({"ok": False, "error": "모든 항목을 입력해주세요."}), 400
-    
+    if not all(isinstance(v, str) for v in (username, user_id, password)):
+        return jsonify({"ok": False, "error": "잘못된 요청입니다."}), 400
+
+    # 비밀번호 해시 비용이 크므로 로그인과 같은 IP 제한을 적용
+    allowed, wait = ratelimit.login_by_ip.allow(request.remote_addr)
+    if not allowed:
+        return web.too_many_requests(wait, 'error', ok=False)
+
     try:
-        # user_db.create_user 함수 호출
         success, reason = user_db.create_user(username, user_id, password)
-        
         if success:
             return jsonify({"ok": True, "username": user_id}), 201
-        else:
-            if reason == "duplicate_id":
-                return jsonify({"ok": False, "error": "이미 사용 중인 아이디입니다."}), 400
-            else:
-                return jsonify({"ok": False, "error": "서버 내부 오류가 발생했습니다."}), 500
-
+        if reason == "duplicate_id":
+            return jsonify({"ok": False, "error": "이미 사용 중인 아이디입니다."}), 400
+        return jsonify({"ok": False, "error": "서버 내부 오류가 발생했습니다."}), 500
+    except passwords.PasswordBusyError as e:
+        return jsonify({"ok": False, "error": str(e)}), 503
     except Exception as e:
         print(f"API Error: {e}")
         return jsonify({"ok": False, "error": "알 수 없는 오류가 발생했습니다."}), 500
 
 @app.route('/login_check', methods=['POST'])
 def login():
-    data = request.get_json()
+    data = request.get_json(silent=True) or {}
     id = data.get('id')
     password = data.get('password')
+    if not isinstance(id, str) or not isinstance(password, str):
+        return jsonify(success=False, message='아이디와 비밀번호를 입력해주세요.'), 400
 
-    result = user_db.select_user_info(id, password)
-    if result == None:
+    # 같은 IP / 같은 아이디의 연속 시도 제한 (비밀번호 해시 계산 전에 거름)
+    allowed, wait = ratelimit.check_login(request.remote_addr, id)
+    if not allowed:
+        return web.too_many_requests(wait, success=False)
+
+    try:
+        result = user_db.select_user_info(id, password)
+    except passwords.PasswordBusyError as e:
+        return jsonify(success=False, message=str(e)), 503
+    if result is None:
         return jsonify(success=False)
 
-    session['id'] = result['id']       
-    session['username'] = result['user_name']   
+    ratelimit.login_by_id.reset(str(id))
+
+    session['id'] = result['id']
+    session['username'] = result['user_name']
     session.permanent = True
 
-    nxt = request.args.get('next') or data.get('next')
-    if not nxt or not nxt.startswith('/'):
-        nxt = url_for('index')
+    nxt = web.next_url(request.args.get('next') or data.get('next'), url_for('index'))
     return jsonify(success=True, next=nxt)
 
 @app.route('/logout', methods=['GET', 'POST'])
 def logout():
-    session.clear() 
+    user_db.invalidate_user(session.get('id'))
+    session.clear()
     return redirect(url_for('login_view'))
 
 # ====================== 가계부(Ledger) API ======================
 
+def _day_payload(user_id, day):
+    """
+    쓰기 API(/add, /delete) 응답용
+    전체 내역 대신 해당 날짜의 내역 + 그 달에 내역이 있는 날짜만 돌려줌
+    """
+    day = web.day_of(day)
+    return {
+        'date': day.isoformat(),
+        'transactions': serializer.rows(ledger_db.select_transactions_by_date(user_id, day)),
+        'activeDates': ledger_db.select_month_active_days(user_id, day.year, day.month),
+    }
+
+# 스트리밍/CSV 응답에 내보낼 컬럼 순서
+EXPORT_COLUMNS = ['id', 'date', 'type', 'description', 'amount', 'category', 'pay']
+
+def _stream_transactions(user_id, fmt):
+    """ NDJSON / CSV 스트리밍 응답 (서버측 커서로 한 행씩 전송) """
+    def ndjson_rows():
+        for row in ledger_db.iter_ledger_by_user(user_id):
+            yield serializer.dumps(serializer.row(row)) + '\n'
+
+    def csv_rows():
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        writer.writerow(EXPORT_COLUMNS)
+        for row in ledger_db.iter_ledger_by_user(user_id):
+            writer.writerow([row.get(c) for c in EXPORT_COLUMNS])
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+        yield buf.getvalue()  # 내역이 없을 때도 헤더는 보냄
+
+    if fmt == 'csv':
+        return Response(
+            stream_with_context(csv_rows()),
+            mimetype='text/csv',
+            headers={'Content-Disposition': 'attachment; filename=transactions.csv'},
+        )
+    return Response(stream_with_context(ndjson_rows()), mimetype='application/x-ndjson')
+
 @app.route('/transactions')
 def get_transactions():
+    """
+    가계부 전체 내역
+    - ?format=ndjson|csv : 서버측 커서로 스트리밍 (메모리 사용 일정)
+    - ?after=<date,id>&limit=N : 커서 기반 페이지 조회, 응답의 next 를 다음 after 로 사용
+    - (파라미터 없음) : 기존처럼 전체 목록을 한 번에 반환
+    """
     user_id = session.get('id')
+
+    fmt = request.args.get('format')
+    if fmt in ('ndjson', 'csv'):
+        return _stream_transactions(user_id, fmt)
+
+    if 'after' in request.args or 'limit' in request.args:
+        try:
+            after = request.args.get('after')
+            after = web.parse_after(after) if after else None
+            limit = int(request.args.get('limit', 100))
+        except ValueError:
+            return jsonify({"error": "after=YYYY-MM-DD,id / limit=정수 형식이어야 합니다."}), 400
+
+        rows, next_cursor = ledger_db.select_ledger_page(user_id, after, limit)
+        return jsonify({'transactions': serializer.rows(rows, web.compact(request.args)),
+                        'next': web.format_after(next_cursor)})
+
     transactions_list = ledger_db.select_ledger_by_user(user_id)
+    return jsonify({'transactions': serializer.rows(transactions_list, web.compact(request.args))})
 
-    for item in transactions_list:
-        if 'date' in item and hasattr(item['date'], 'isoformat'):
-            item['date'] = item['date'].isoformat()
+@app.route('/api/transactions/search')
+def search_transactions():
+    """
+    내역 검색 (최신순, 커서 기반 페이지)
+    ?q=설명 검색어&category=&pay=&min_amount=&max_amount=&after=<date,id>&limit=N
+    응답의 next 를 다음 after 로 사용
+    """
+    user_id = session.get('id')
+    try:
+        kwargs = web.search_args(request.args)
+    except ValueError:
+        return jsonify({"error": "min_amount / max_amount / limit=정수, after=YYYY-MM-DD,id 형식이어야 합니다."}), 400
 
-    return jsonify({'transactions': transactions_list})
+    try:
+        rows, next_cursor = ledger_db.search_transactions(user_id, **kwargs)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        print(f"[API SEARCH ERROR] {type(e).__name__}: {e}")
+        return jsonify({'error': str(e)}), 500
+
+    return jsonify({'transactions': serializer.rows(rows, web.compact(request.args)),
+                    'next': web.format_after(next_cursor)})
 
 @app.route('/transactions-by-date')
 def get_transactions_by_date():
     user_id = session.get('id')
     selected_date = request.args.get('date')
-    
+
     if not selected_date:
         return jsonify({"error": "Date parameter is required"}), 400
 
     transactions_list = ledger_db.select_transactions_by_date(user_id, selected_date)
-
-    for item in transactions_list:
-        if 'date' in item and hasattr(item['date'], 'isoformat'):
-            item['date'] = item['date'].isoformat()
-
-    return jsonify({'transactions': transactions_list})
+    return jsonify({'transactions': serializer.rows(transactions_list, web.compact(request.args))})
 
 @app.route('/month-active-dates')
 def get_month_active_dates():
+    """
+    내역이 있는 날짜 목록
+    - ?year=&month= : 한 달 -> ['YYYY-MM-DD', ...]
+    - ?months=2025-10,2025-11,2025-12 : 여러 달 한 번에 -> {'2025-10': [...], ...}
+    """
     user_id = session.get('id')
+
+    months_param = request.args.get('months')
+    if months_param:
+        try:
+            months = web.parse_months(months_param)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        result = ledger_db.select_active_days_for_months(user_id, months)
+        return jsonify({web.month_key(y, m): days for (y, m), days in result.items()})
+
     year = request.args.get('year', type=int)
     month = request.args.get('month', type=int)
-    
-    if not user_id or not year or not month:
+
+    if not user_id or year is None or month is None:
         return jsonify([])
+    try:
+        ledger_db.check_month(year, month)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
-    # modules/ledger.py 안에 있는 함수를 ledger_db.함수명 으로 호출
     active_dates = ledger_db.select_month_active_days(user_id, year, month)
     return jsonify(active_dates)
 
 @app.route('/add', methods=['POST'])
 def add_transaction():
     user_id = session.get('id')
-    if request.is_json:
-        data = request.get_json()
-        try:
-            ledger_db.insert_transaction(
-                user_id,
-                data.get('date'),
-                data.get('type'),
-                data.get('desc'),
-                data.get('amount'),
-                data.get('category'),
-                data.get('payment_method')
-            )
-            # 갱신된 목록 반환
-            latest_transactions = ledger_db.select_ledger_by_user(user_id)
-            for item in latest_transactions:
-                if 'date' in item and hasattr(item['date'], 'isoformat'):
-                    item['date'] = item['date'].isoformat()
-            return jsonify({'transactions': latest_transactions})
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Request must be JSON"}), 400
+    # 배치 API 와 같은 검사/정규화 (잘못된 값은 DB 오류 대신 400)
+    try:
+        fields = web.add_fields(data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
-        except Exception as e:
-            return jsonify({'error': str(e)}), 500
-    return jsonify({"error": "Request must be JSON"}), 400
+    try:
+        new_id = ledger_db.insert_transaction(
+            user_id,
+            fields['date'],
+            fields['type'],
+            fields['description'],
+            fields['amount'],
+            fields['category'],
+            fields['pay']
+        )
+        # 새 id + 해당 날짜 목록 + 그 달 내역 있는 날짜 반환
+        return jsonify({'id': new_id, **_day_payload(user_id, fields['date'])})
+    except Exception as e:
+        print(f"[API ADD ERROR] {type(e).__name__}: {e}")
+        return jsonify({'error': '서버 내부 오류가 발생했습니다.'}), 500
 
 @app.route('/delete', methods=['POST'])
 def delete_transaction():
     user_id = session.get('id')
-    if request.is_json:
-        data = request.get_json()
-        transaction_id = data.get('id')
-        try:
-            ledger_db.delete_transaction_by_id(transaction_id, user_id)
-            # 갱신된 목록 반환
-            latest_transactions = ledger_db.select_ledger_by_user(user_id)
-            for item in latest_transactions:
-                if 'date' in item and hasattr(item['date'], 'isoformat'):
-                    item['date'] = item['date'].isoformat()
-            return jsonify({'transactions': latest_transactions})
-        except Exception as e:
-            return jsonify({'error': str(e)}), 500
-    return jsonify({"error": "Request must be JSON"}), 400
+    data = request.get_json(silent=True)
+    if data is None:
+        return jsonify({"error": "Request must be JSON"}), 400
+    transaction_id = data.get('id')
+    try:
+        deleted_date = ledger_db.delete_transaction_by_id(transaction_id, user_id)
+        if deleted_date is None:
+            return jsonify({'error': '내역을 찾을 수 없습니다.'}), 404
+        # 삭제된 id + 해당 날짜 목록 + 그 달 내역 있는 날짜 반환
+        return jsonify({'id': transaction_id, **_day_payload(user_id, deleted_date)})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
 @app.route('/edit', methods=['POST'])
 def edit_transaction():
     user_id = session.get('id')
-    if request.is_json:
-        data = request.get_json()
-        
-        transaction_id = data.get('id')
-        new_date = data.get('date')
-        new_type = data.get('type')
-        new_desc = data.get('desc')
-        new_amount = data.get('amount')
-
-        if not all([transaction_id, new_date, new_type, new_desc, new_amount is not None]):
-             return jsonify({'error': '모든 값이 필요합니다.'}), 400
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Request must be JSON"}), 400
+    try:
+        fields = web.edit_fields(data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
-        try:
-            ledger_db.update_transaction(
-                transaction_id, user_id, new_date, new_type, new_desc, new_amount
-            )
-            return jsonify({'success': True})
-        except Exception as e:
-            return jsonify({'error': str(e)}), 500
-    return jsonify({"error": "Request must be JSON"}), 400
+    try:
+        updated = ledger_db.update_transaction(data['id'], user_id, fields['date'], fields['type'],
+                                               fields['description'], fields['amount'])
+        if not updated:
+            return jsonify({'error': '내역을 찾을 수 없습니다.'}), 404
+        return jsonify({'success': True})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/transactions/batch', methods=['POST'])
+def batch_transactions():
+    """
+    여러 건의 추가/수정/삭제를 한 트랜잭션으로 처리
+    body: {"operations": [{"op": "create"|"update"|"delete", ...}, ...]}
+    """
+    user_id = session.get('id')
+    data = request.get_json(silent=True) or {}
+    operations = data.get('operations')
+    if not isinstance(operations, list) or not operations:
+        return jsonify({"ok": False, "error": "operations 목록이 필요합니다."}), 400
+    if not all(isinstance(op, dict) for op in operations):
+        return jsonify({"ok": False, "error": "operations 의 각 항목은 객체여야 합니다."}), 400
+
+    try:
+        applied, results = ledger_db.apply_transaction_batch(user_id, operations)
+        return jsonify({"ok": applied, "results": results}), (200 if applied else 400)
+    except Exception as e:
+        print(f"[API BATCH ERROR] {type(e).__name__}: {e}")
+        return jsonify({"ok": False, "error": str(e)}), 500
+
+@app.route('/api/import', methods=['POST'])
+def import_transactions():
+    """
+    은행 거래내역 파일(CSV/XLSX) 일괄 가져오기
+    form-data: file (필수), encoding (CSV, 기본 utf-8-sig / 은행 파일은 cp949 인 경우가 많음), dry_run=1
+    """
+    user_id = session.get('id')
+    upload = request.files.get('file')
+    if upload is None or not upload.filename:
+        return jsonify({"error": "file 항목으로 CSV/XLSX 파일을 올려주세요."}), 400
+
+    filename = upload.filename.lower()
+    dry_run = request.form.get('dry_run') in ('1', 'true', 'yes')
+
+    try:
+        if filename.endswith('.xlsx'):
+            rows = importer.iter_xlsx_rows(upload.stream)
+        elif filename.endswith('.csv') or filename.endswith('.txt'):
+            rows = importer.iter_csv_rows(upload.stream, request.form.get('encoding') or 'utf-8-sig')
+        else:
+            return jsonify({"error": "CSV 또는 XLSX 파일만 가져올 수 있습니다."}), 400
+
+        report = importer.import_rows(user_id, rows, dry_run=dry_run)
+        return jsonify(report)
+
+    except importer.ImportFormatError as e:
+        return jsonify({"error": str(e)}), 400
+    except UnicodeDecodeError:
+        return jsonify({"error": "파일 인코딩을 읽을 수 없습니다. encoding=cp949 로 다시 시도해 보세요."}), 400
+    except Exception as e:
+        print(f"[API IMPORT ERROR] {type(e).__name__}: {e}")
+        return jsonify({'error': str(e)}), 500
 
 # ====================== 통계(Stats) API ======================
 
+def _cached_stats(name, months, params, compute):
+    """
+    통계 응답 캐시 + ETag
+    months 에 걸친 달에 쓰기가 없으면 캐시된 본문을 그대로 보내고,
+    브라우저가 보낸 If-None-Match 가 같으면 본문 없이 304 를 보냄
+    """
+    etag, body = stats_cache.get_or_compute(
+        name, session.get('id'), months, params, compute, app.json.dumps
+    )
+    return _etag_response(etag, body)
+
+def _etag_response(etag, body):
+    """ 캐시된 [etag, 본문] -> 응답 (If-None-Match 가 같으면 304) """
+    if request.if_none_match.contains_weak(etag):
+        return Response(status=304, headers=web.etag_headers(etag))
+    return Response(body, mimetype='application/json', headers=web.etag_headers(etag))
+
+def _dashboard_cached(user_id, year, month, n, today):
+    """
+    대시보드 [etag, 본문] (통계 페이지에 넣어 보내는 첫 화면 데이터와 캐시를 같이 씀)
+    이번 달이면 monthly 에 반복 내역 예정 금액을 더한 누적(projected)도 담음
+    """
+    months, params = web.dashboard_key(year, month, n, today)
+    return stats_cache.get_or_compute(
+        'dashboard', user_id, months, params,
+        lambda: ledger_db.select_month_dashboard(
+            user_id, year, month, n, today, recurring.select_upcoming(user_id, year, month, today),
+        ),
+        app.json.dumps,
+    )
+
+def _dashboard_part(name, params, year, month, n, today, pick):
+    """
+    대시보드 결과의 일부만 보내는 통계 API
+    대시보드 캐시 항목을 꺼내(없으면 집계 한 번) pick(대시보드) 를 따로 캐시하므로,
+    통계 페이지와 개별 API 가 같은 집계 쿼리 하나를 나눠 씀
+    """
+    def compute():
+        _, body = _dashboard_cached(session.get('id'), year, month, n, today)
+        return pick(json.loads(body))
+
+    months, _ = web.dashboard_key(year, month, n, today)
+    return _cached_stats(name, months, {**params, 'today': today}, compute)
+
 @app.route('/api/stats/monthly-total')
 def stats_monthly_total():
-    user_id = session.get('id')
-    today = date.today()
-    year = int(request.args.get('year', today.year))
-    month = int(request.args.get('month', today.month))
-    days = monthrange(year, month)[1]
-    start = date(year, month, 1)
-    end = date(year + (month == 12), 1 if month == 12 else month + 1, 1)
+    """ 월간 일별 누적 지출 (대시보드 monthly 의 cumSpend) """
+    try:
+        year, month = web.year_month(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
-    data = ledger_db.select_month_ledger_by_user(user_id, year, month, days, start, end)
-    return jsonify(data)  
+    return _dashboard_part('monthly-total', {'year': year, 'month': month},
+                           year, month, web.DASHBOARD_WEEKS, date.today(), web.pick_monthly_total)
 
 @app.route('/api/stats/monthly-spend')
 def stats_monthly_spend():
-    user_id = session.get('id')
-    today = date.today()
-    year = int(request.args.get('year', today.year))
-    month = int(request.args.get('month', today.month))
-    days = monthrange(year, month)[1]
-    start = date(year, month, 1)
-    end = date(year + (month == 12), 1 if month == 12 else month + 1, 1)
+    """ 월간 수입/지출 누적 (대시보드 monthly) """
+    try:
+        year, month = web.year_month(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    # ?projected=1 : 이번 달이면 아직 넣지 않은 반복 내역까지 더한 누적(projected)도 같이 보냄
+    projected = web.is_projected(request.args)
+    params = {'year': year, 'month': month}
+    if projected:
+        params['projected'] = True
 
-    data = ledger_db.select_month_daily_spend_income(user_id, start, end, year, month, days)
-    return jsonify(data)
+    return _dashboard_part('monthly-spend', params, year, month, web.DASHBOARD_WEEKS, date.today(),
+                           lambda dashboard: web.pick_monthly_spend(dashboard, projected))
 
 @app.route('/api/stats/monthly-cats')
 def stats_monthly_cats():
-    user_id = session.get('id')
-    today = date.today()
-    year  = int(request.args.get('year',  today.year))
-    month = int(request.args.get('month', today.month))
-    start = date(year, month, 1)
-    end   = date(year + (month == 12), 1 if month == 12 else month + 1, 1)
+    """ 월간 카테고리별 지출 (대시보드 categories) """
+    try:
+        year, month = web.year_month(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
-    data = ledger_db.select_month_category_spend(user_id, start, end)
-    return jsonify(data)
+    return _dashboard_part('monthly-cats', {'year': year, 'month': month},
+                           year, month, web.DASHBOARD_WEEKS, date.today(), web.pick_monthly_cats)
 
 @app.route('/api/stats/weekly')
 def stats_weekly():
+    """
+    최근 n주 순변화 (?n=주 수, 최대 52 / ?offset=n주 단위로 과거로 넘긴 페이지 수)
+    첫 페이지(offset=0)는 이번 달 대시보드 weekly, 과거 페이지만 따로 집계
+    """
     user_id = session.get('id')
-    n = int(request.args.get('n', 10))
-    data = ledger_db.select_recent_weeks(user_id, n)
-    return jsonify(data)
+    try:
+        n, offset = web.weekly_args(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
+    today = date.today()
+    if offset == 0:
+        return _dashboard_part('weekly', {'n': n, 'offset': 0},
+                               today.year, today.month, n, today, web.pick_weekly)
+
+    return _cached_stats(
+        'weekly', stats_cache.recent_weeks_months(today, n, offset), {'n': n, 'offset': offset, 'today': today},
+        lambda: ledger_db.select_recent_weeks(user_id, n, offset, today),
+    )
+
+@app.route('/api/stats/range')
+def stats_range():
+    """
+    기간 통계 (연간 리뷰 등)
+    ?from=YYYY-MM-DD&to=YYYY-MM-DD(포함)&granularity=day|week|month&tz=Asia/Seoul
+    - to 생략: tz 기준 오늘, from 생략: to 가 속한 해의 1월 1일
+    """
+    user_id = session.get('id')
+    try:
+        start, end, to, granularity = web.range_args(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
+    try:
+        return _cached_stats(
+            'range', stats_cache.months_between(start, end),
+            {'from': start, 'to': to, 'granularity': granularity},
+            lambda: ledger_db.select_range_stats(user_id, start, end, granularity),
+        )
+    except Exception as e:
+        print(f"[API RANGE ERROR] {type(e).__name__}: {e}")
+        return jsonify({'error': str(e)}), 500
 
 @app.route('/api/stats/spending-advice')
 def stats_spending_advice():
     """
-    (신규) 지출 조언 API
+    지출 조언 API
     로직: (지난달 예산 + 이번달 수입) 대비 이번달 지출이 70% 넘으면 경고
     """
     user_id = session.get('id')
-    if not user_id:
-        return jsonify({'error': '로그인이 필요합니다.'}), 401
+    today = date.today()
 
     try:
-        # --- 1. 이번 달 정보 계산 ---
-        today = date.today()
-        this_month_start = today.replace(day=1)
-        this_month_days = monthrange(today.year, today.month)[1]
-        next_month_start = (this_month_start + timedelta(days=32)).replace(day=1)
-
-        # 님 BAEK 님 BAEK의 기존 함수를 재활용하여 '이번 달' 데이터 가져오기
-        this_month_data = ledger_db.select_month_daily_spend_income(
-            user_id, this_month_start, next_month_start, 
-            today.year, today.month, this_month_days
-        )
-
-        TMI = this_month_data.get('totalIncome', 0) # This Month Income
-        TMS = this_month_data.get('totalSpend', 0)  # This Month Spending
+        # 미리 계산해 둔 조언을 캐시에서 꺼냄 (없으면 두 달치 합계 쿼리 한 번, modules/advice.py)
+        advice.touch(user_id)
+        return _cached_stats(advice.NAME, stats_cache.advice_months(today), advice.cache_params(today),
+                             lambda: advice.compute(user_id, today))
+    except Exception as e:
+        print(f"[API ADVICE ERROR] {type(e).__name__}: {e}")
+        return jsonify({'error': str(e)}), 500
 
-        # --- 2. 지난달 정보 계산 ---
-        last_month_end = this_month_start
-        last_month_start = (last_month_end - timedelta(days=1)).replace(day=1)
-        last_month_year = last_month_start.year
-        last_month_month = last_month_start.month
-        last_month_days = monthrange(last_month_year, last_month_month)[1]
+@app.route('/api/stats/dashboard')
+def stats_dashboard():
+    """
+    통계 페이지 묶음 API
+    월간 누적(이번달/지난달), 카테고리, 최근 주간, 지출 조언을 한 번에 반환
+    """
+    user_id = session.get('id')
+    today = date.today()
+    try:
+        year, month = web.year_month(request.args)
+        n = int(request.args.get('n', web.DASHBOARD_WEEKS))
+        ledger_db.check_weekly(n, 0)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
-        # 님 BAEK 님 BAEK의 기존 함수를 재활용하여 '지난달' 데이터 가져오기
-        last_month_data = ledger_db.select_month_daily_spend_income(
-            user_id, last_month_start, last_month_end,
-            last_month_year, last_month_month, last_month_days
-        )
+    try:
+        return _etag_response(*_dashboard_cached(user_id, year, month, n, today))
+    except Exception as e:
+        print(f"[API DASHBOARD ERROR] {type(e).__name__}: {e}")
+        return jsonify({'error': str(e)}), 500
 
-        LMI = last_month_data.get('totalIncome', 0) # Last Month Income
-        LMS = last_month_data.get('totalSpend', 0)  # Last Month Spending
+# ====================== 반복 내역 API ======================
 
-        # --- 3. 조언 로직 계산 ---
-        last_month_budget = LMI - LMS  # (지난달 수입 - 지난달 지출)
-        total_allowable = last_month_budget + TMI # (지난달 예산 + 이번달 수입)
+@app.route('/api/recurring', methods=['GET'])
+def list_recurring():
+    """ 반복 내역 규칙 목록 (next_date: 아직 넣지 않은 다음 회차, null 이면 끝난 규칙) """
+    rules = recurring.select_rules(session.get('id'))
+    return jsonify({'rules': [web.rule_payload(r) for r in rules]})
 
-        warning_message = None
+@app.route('/api/recurring', methods=['POST'])
+def create_recurring():
+    """
+    반복 내역 규칙 추가
+    body: {type, desc, amount, category, payment_method, freq: daily|weekly|monthly, every, start_date, end_date}
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Request must be JSON"}), 400
+    try:
+        rule_id = recurring.create_rule(session.get('id'), data)
+        return jsonify({'id': rule_id}), 201
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        print(f"[API RECURRING ERROR] {type(e).__name__}: {e}")
+        return jsonify({'error': str(e)}), 500
 
-        if total_allowable > 0:
-            spending_ratio = TMS / total_allowable
+@app.route('/api/recurring/<int:rule_id>', methods=['PATCH'])
+def end_recurring(rule_id):
+    """ 종료일 변경 body: {end_date: YYYY-MM-DD | null} (이미 넣은 내역은 그대로) """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or 'end_date' not in data:
+        return jsonify({"error": "end_date 가 필요합니다."}), 400
+    try:
+        if not recurring.end_rule(session.get('id'), rule_id, data['end_date']):
+            return jsonify({'error': '규칙을 찾을 수 없습니다.'}), 404
+        return jsonify({'id': rule_id})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        print(f"[API RECURRING ERROR] {type(e).__name__}: {e}")
+        return jsonify({'error': str(e)}), 500
 
-            if spending_ratio > 0.7: # 70% 초과 시
-                warning_message = f"지출이 총 예산의 {spending_ratio*100:.0f}%에 도달했습니다! 지출에 유의하세요."
-            elif TMS > TMI: # (보너스) 이번달 수입보다 지출이 많을 때
-                warning_message = "이번 달 수입보다 지출이 더 많습니다! 지출 관리가 필요합니다."
+@app.route('/api/recurring/<int:rule_id>', methods=['DELETE'])
+def delete_recurring(rule_id):
+    """ 규칙 삭제 (이미 넣은 내역은 일반 내역으로 남음) """
+    try:
+        if not recurring.delete_rule(session.get('id'), rule_id):
+            return jsonify({'error': '규칙을 찾을 수 없습니다.'}), 404
+        return jsonify({'id': rule_id})
+    except Exception as e:
+        print(f"[API RECURRING ERROR] {type(e).__name__}: {e}")
+        return jsonify({'error': str(e)}), 500
 
-        # 4. JSON으로 '조언' 반환
+# ====================== 운영(Admin) API ======================
 
-        return jsonify({'advice': warning_message})
+@app.route('/api/db/pool-stats')
+def db_pool_stats():
+    """ 커넥션 풀 hit/miss/wait 카운터 조회 (/metrics 와 같은 접근 제한) """
+    if not metrics.allowed(request.remote_addr, request.headers):
+        return Response(status=404)
+    return jsonify(user_db.pool_stats() or {})
 
-    except Exception as e:
-        print(f"[API ADVICE ERROR] {type(e).__name__}: {e}")
+@app.route('/metrics')
+def prometheus_metrics():
+    """ Prometheus 수집용 (로그인 대신 metrics_token / metrics_allow_ips 로 접근 제한) """
+    if not metrics.ENABLED or not metrics.allowed(request.remote_addr, request.headers):
+        return Response(status=404)
+    body = metrics.render(metrics.pool_gauges(user_db.pool_stats()))
+    return Response(body, mimetype='text/plain; version=0.0.4')
 
-        return jsonify({'error': str(e)}), 500
+def start_background_workers():
+    """
+    백그라운드 스레드 시작 (서버로 띄울 때만 호출, import 만으로는 시작하지 않음)
+        - 내역이 바뀌거나 달이 바뀌면 지출 조언을 미리 다시 계산 (modules/advice.py)
+        - 날짜가 된 반복 내역 회차를 주기적으로 ledger 에 넣음 (modules/recurring.py)
+    """
+    advice.start(app.json.dumps)
+    recurring.start()
 
 # ====================== 서버 실행 ======================
 if __name__ == "__main__":
+    start_background_workers()
     app.run(debug=True, port=8080)
\ No newline at end of file
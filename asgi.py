@@ -0,0 +1,512 @@
+# --- 비동기(ASGI) 서버 진입점 ---
+# app.py(Flask, 동기)와 같은 화면/API 를 Quart + aiomysql 로 제공합니다.
+# DB 를 기다리는 동안 워커가 막히지 않아 적은 워커로도 많은 요청을 동시에 처리할 수 있습니다.
+#
+# 실행: pip install quart aiomysql
+#       hypercorn asgi:app --bind 0.0.0.0:8080
+#
+# 파일 가져오기(/api/import), 배치(/api/transactions/batch), 전체 내역 스트리밍(/transactions)
+# 같은 대량 처리 API 는 동기 앱(app.py)에서만 제공합니다.
+# 쿼리스트링 파싱/검사 등 DB 를 쓰지 않는 부분은 app.py 와 같은 modules/web.py 함수를 씁니다.
+from quart import Quart, render_template, request, jsonify, session, redirect, url_for, Response, current_app, g, send_from_directory
+from quart.wrappers.response import DataBody
+from datetime import timedelta, date
+import json
+import time
+
+import modules.aio_db as aio_db          # modules/aio_db.py
+import modules.aio_user as user_db       # modules/aio_user.py
+import modules.user as user              # modules/user.py (사용자 캐시는 동기 앱과 공유)
+import modules.aio_ledger as ledger_db   # modules/aio_ledger.py
+import modules.config as config          # modules/config.py
+import modules.cache as stats_cache      # modules/cache.py
+import modules.passwords as passwords    # modules/passwords.py
+import modules.ratelimit as ratelimit    # modules/ratelimit.py
+import modules.ledger as ledger          # modules/ledger.py (파라미터 검사 함수)
+import modules.metrics as metrics        # modules/metrics.py
+import modules.advice as advice          # modules/advice.py (캐시 키만 같이 씀)
+import modules.assets as assets          # modules/assets.py
+import modules.serializer as serializer  # modules/serializer.py
+import modules.web as web                # modules/web.py (app.py 와 같이 쓰는 파싱/검사 함수)
+
+
+async def _day_payload(user_id, day):
+    """ 쓰기 API(/add, /delete) 응답용 (app.py 와 같음) """
+    day = web.day_of(day)
+    return {
+        'date': day.isoformat(),
+        'transactions': serializer.rows(await ledger_db.select_transactions_by_date(user_id, day)),
+        'activeDates': await ledger_db.select_month_active_days(user_id, day.year, day.month),
+    }
+
+
+async def _cached_stats(name, months, params, compute):
+    """ app.py 의 _cached_stats 와 같음 (캐시/버전 번호도 동기 앱과 공유) """
+    etag, body = await stats_cache.get_or_compute_async(
+        name, session.get('id'), months, params, compute, current_app.json.dumps
+    )
+    return _etag_response(etag, body)
+
+
+def _etag_response(etag, body):
+    """ app.py 의 _etag_response 와 같음 """
+    if request.if_none_match.contains_weak(etag):
+        return Response('', status=304, headers=web.etag_headers(etag))
+    return Response(body, mimetype='application/json', headers=web.etag_headers(etag))
+
+
+async def _dashboard_cached(user_id, year, month, n, today):
+    """ 대시보드 [etag, 본문] (app.py 와 같음) """
+    async def compute():
+        upcoming = await ledger_db.select_upcoming(user_id, year, month, today)
+        return await ledger_db.select_month_dashboard(user_id, year, month, n, today, upcoming)
+
+    months, params = web.dashboard_key(year, month, n, today)
+    return await stats_cache.get_or_compute_async(
+        'dashboard', user_id, months, params, compute, current_app.json.dumps,
+    )
+
+
+async def _dashboard_part(name, params, year, month, n, today, pick):
+    """ 대시보드 결과의 일부만 보내는 통계 API (app.py 와 같음) """
+    async def compute():
+        _, body = await _dashboard_cached(session.get('id'), year, month, n, today)
+        return pick(json.loads(body))
+
+    months, _ = web.dashboard_key(year, month, n, today)
+    return await _cached_stats(name, months, {**params, 'today': today}, compute)
+
+
+def create_app():
+    app = Quart(__name__)
+    app.secret_key = config.secret
+    app.permanent_session_lifetime = timedelta(hours=6)
+    app.config.update(
+        SESSION_COOKIE_HTTPONLY=True,
+        SESSION_COOKIE_SAMESITE="Lax"
+    )
+
+    # JSON 직렬화 / gzip (app.py 와 같음, 파일 응답은 압축하지 않음)
+    app.json_provider_class = serializer.json_provider(app.json_provider_class)
+    app.json = app.json_provider_class(app)
+
+    @app.after_request
+    async def compress_response(resp):
+        if serializer.should_compress(resp, request.accept_encodings) and isinstance(resp.response, DataBody):
+            serializer.compress(resp, await resp.get_data())
+        return resp
+
+    # 계측: 로그인 확인보다 먼저 등록 (app.py 와 같음)
+    if metrics.ENABLED:
+        app.json = metrics.timed_json_provider(app.json_provider_class)(app)
+
+        @app.before_request
+        async def start_request_timer():
+            g.request_started = time.perf_counter()
+
+        @app.after_request
+        async def observe_request_time(resp):
+            started = g.get('request_started')
+            if started is not None:
+                metrics.observe_request(request.endpoint, request.method, resp.status_code,
+                                        time.perf_counter() - started)
+            return resp
+
+    @app.after_serving
+    async def close_db_pool():
+        await aio_db.close_pool()
+
+    @app.context_processor
+    async def inject_user():
+        return {
+            'username': session.get('username'),
+            'id': session.get('id')
+        }
+
+    @app.template_global()
+    def asset_url(filename):
+        """ 정적 파일 주소 (app.py 와 같음) """
+        built = assets.built_path(filename)
+        if built:
+            return url_for('static_dist', filename=built)
+        return url_for('static', filename=filename)
+
+    @app.route('/static/dist/<path:filename>')
+    async def static_dist(filename):
+        """ 빌드된 정적 파일 (app.py 와 같음) """
+        served, encoding = assets.negotiate(filename, request.accept_encodings)
+        resp = await send_from_directory(assets.DIST_DIR, served, mimetype=assets.mimetype(filename))
+        if encoding:
+            resp.headers['Content-Encoding'] = encoding
+        resp.headers['Vary'] = 'Accept-Encoding'
+        resp.headers['Cache-Control'] = assets.CACHE_CONTROL
+        return resp
+
+    @app.before_request
+    async def require_login_for_all_except_public():
+        """ 로그인 안 한 사용자는 로그인 페이지로 (app.py 와 같은 화이트리스트) """
+        if web.is_public(request.endpoint):
+            return
+
+        # 세션의 사용자가 아직 있는지 확인 (사용자 캐시 덕분에 대부분 DB 조회 없이 끝남)
+        user_id = session.get('id')
+        try:
+            if user_id and await user_db.get_user(user_id) is None:
+                session.clear()
+        except Exception as e:
+            print(f"[SESSION CHECK ERROR] {type(e).__name__}: {e}")
+
+        if not session.get('id'):
+            if web.wants_401(request.is_json, request.path):
+                return jsonify(success=False, message='Login required'), 401
+            return redirect(url_for('login_view', next=request.path))
+
+    # ====================== 페이지 ======================
+    @app.route('/')
+    async def index():
+        if session.get('id'):
+            return redirect(url_for('ledger_view'))
+        return await render_template('login.html')
+
+    @app.route('/login')
+    async def login_view():
+        if session.get('id'):
+            return redirect(url_for('ledger_view'))
+        return await render_template('login.html')
+
+    @app.route('/register')
+    async def register_view():
+        if session.get('id'):
+            return redirect(url_for('ledger_view'))
+        return await render_template('register.html')
+
+    @app.route('/ledger')
+    async def ledger_view():
+        initial_data = None
+        if web.INLINE_INITIAL_DATA:
+            try:
+                initial = await ledger_db.select_ledger_initial(session.get('id'), date.today())
+                initial_data = web.inline_json(current_app.json.dumps(initial))
+            except Exception as e:
+                print(f"[PAGE DATA ERROR] {type(e).__name__}: {e}")
+        return await render_template('ledger.html', initial_data=initial_data)
+
+    @app.route('/statistics')
+    async def statistics_view():
+        initial = None
+        if web.INLINE_INITIAL_DATA:
+            today = date.today()
+            try:
+                _, body = await _dashboard_cached(session.get('id'), today.year, today.month, web.DASHBOARD_WEEKS, today)
+                initial = {'year': today.year, 'month': today.month, 'dashboard': web.inline_json(body)}
+            except Exception as e:
+                print(f"[PAGE DATA ERROR] {type(e).__name__}: {e}")
+        return await render_template('statistics.html', initial=initial)
+
+    # ====================== 회원가입 & 로그인 ======================
+    @app.route('/api/register', methods=['POST'])
+    async def register():
+        data = await request.get_json(silent=True)
+        if not data:
+            return jsonify({"ok": False, "error": "잘못된 요청입니다."}), 400
+
+        username = data.get('username')
+        user_id = data.get('id')
+        password = data.get('password')
+        if not all([username, user_id, password]):
+            return jsonify({"ok": False, "error": "모든 항목을 입력해주세요."}), 400
+        if not all(isinstance(v, str) for v in (username, user_id, password)):
+            return jsonify({"ok": False, "error": "잘못된 요청입니다."}), 400
+
+        allowed, wait = ratelimit.login_by_ip.allow(request.remote_addr)
+        if not allowed:
+            return web.too_many_requests(wait, 'error', ok=False)
+
+        try:
+            success, reason = await user_db.create_user(username, user_id, password)
+            if success:
+                return jsonify({"ok": True, "username": user_id}), 201
+            if reason == "duplicate_id":
+                return jsonify({"ok": False, "error": "이미 사용 중인 아이디입니다."}), 400
+            return jsonify({"ok": False, "error": "서버 내부 오류가 발생했습니다."}), 500
+        except passwords.PasswordBusyError as e:
+            return jsonify({"ok": False, "error": str(e)}), 503
+        except Exception as e:
+            print(f"API Error: {e}")
+            return jsonify({"ok": False, "error": "알 수 없는 오류가 발생했습니다."}), 500
+
+    @app.route('/login_check', methods=['POST'])
+    async def login():
+        data = await request.get_json(silent=True) or {}
+        id = data.get('id')
+        password = data.get('password')
+        if not isinstance(id, str) or not isinstance(password, str):
+            return jsonify(success=False, message='아이디와 비밀번호를 입력해주세요.'), 400
+
+        allowed, wait = ratelimit.check_login(request.remote_addr, id)
+        if not allowed:
+            return web.too_many_requests(wait, success=False)
+
+        try:
+            result = await user_db.select_user_info(id, password)
+        except passwords.PasswordBusyError as e:
+            return jsonify(success=False, message=str(e)), 503
+        if result is None:
+            return jsonify(success=False)
+
+        ratelimit.login_by_id.reset(str(id))
+
+        session['id'] = result['id']
+        session['username'] = result['user_name']
+        session.permanent = True
+
+        nxt = web.next_url(request.args.get('next') or data.get('next'), url_for('index'))
+        return jsonify(success=True, next=nxt)
+
+    @app.route('/logout', methods=['GET', 'POST'])
+    async def logout():
+        user.invalidate_user(session.get('id'))
+        session.clear()
+        return redirect(url_for('login_view'))
+
+    # ====================== 가계부(Ledger) API ======================
+    @app.route('/transactions-by-date')
+    async def get_transactions_by_date():
+        user_id = session.get('id')
+        selected_date = request.args.get('date')
+        if not selected_date:
+            return jsonify({"error": "Date parameter is required"}), 400
+
+        rows = await ledger_db.select_transactions_by_date(user_id, selected_date)
+        return jsonify({'transactions': serializer.rows(rows, web.compact(request.args))})
+
+    @app.route('/api/transactions/search')
+    async def search_transactions():
+        """ 내역 검색 (app.py 와 같은 파라미터) """
+        user_id = session.get('id')
+        try:
+            kwargs = web.search_args(request.args)
+        except ValueError:
+            return jsonify({"error": "min_amount / max_amount / limit=정수, after=YYYY-MM-DD,id 형식이어야 합니다."}), 400
+
+        try:
+            rows, next_cursor = await ledger_db.search_transactions(user_id, **kwargs)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            print(f"[API SEARCH ERROR] {type(e).__name__}: {e}")
+            return jsonify({'error': str(e)}), 500
+
+        return jsonify({'transactions': serializer.rows(rows, web.compact(request.args)),
+                        'next': web.format_after(next_cursor)})
+
+    @app.route('/month-active-dates')
+    async def get_month_active_dates():
+        user_id = session.get('id')
+
+        months_param = request.args.get('months')
+        if months_param:
+            try:
+                months = web.parse_months(months_param)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            result = await ledger_db.select_active_days_for_months(user_id, months)
+            return jsonify({web.month_key(y, m): days for (y, m), days in result.items()})
+
+        year = request.args.get('year', type=int)
+        month = request.args.get('month', type=int)
+        if not user_id or year is None or month is None:
+            return jsonify([])
+        try:
+            ledger.check_month(year, month)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        return jsonify(await ledger_db.select_month_active_days(user_id, year, month))
+
+    @app.route('/add', methods=['POST'])
+    async def add_transaction():
+        user_id = session.get('id')
+        data = await request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({"error": "Request must be JSON"}), 400
+        try:
+            fields = web.add_fields(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        try:
+            new_id = await ledger_db.insert_transaction(
+                user_id,
+                fields['date'],
+                fields['type'],
+                fields['description'],
+                fields['amount'],
+                fields['category'],
+                fields['pay']
+            )
+            return jsonify({'id': new_id, **await _day_payload(user_id, fields['date'])})
+        except Exception as e:
+            print(f"[API ADD ERROR] {type(e).__name__}: {e}")
+            return jsonify({'error': '서버 내부 오류가 발생했습니다.'}), 500
+
+    @app.route('/delete', methods=['POST'])
+    async def delete_transaction():
+        user_id = session.get('id')
+        data = await request.get_json(silent=True)
+        if data is None:
+            return jsonify({"error": "Request must be JSON"}), 400
+        transaction_id = data.get('id')
+        try:
+            deleted_date = await ledger_db.delete_transaction_by_id(transaction_id, user_id)
+            if deleted_date is None:
+                return jsonify({'error': '내역을 찾을 수 없습니다.'}), 404
+            return jsonify({'id': transaction_id, **await _day_payload(user_id, deleted_date)})
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    @app.route('/edit', methods=['POST'])
+    async def edit_transaction():
+        user_id = session.get('id')
+        data = await request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({"error": "Request must be JSON"}), 400
+        try:
+            fields = web.edit_fields(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        try:
+            updated = await ledger_db.update_transaction(data['id'], user_id, fields['date'], fields['type'],
+                                                         fields['description'], fields['amount'])
+            if not updated:
+                return jsonify({'error': '내역을 찾을 수 없습니다.'}), 404
+            return jsonify({'success': True})
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    # ====================== 통계(Stats) API ======================
+    @app.route('/api/stats/monthly-total')
+    async def stats_monthly_total():
+        try:
+            year, month = web.year_month(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        return await _dashboard_part('monthly-total', {'year': year, 'month': month},
+                                     year, month, web.DASHBOARD_WEEKS, date.today(), web.pick_monthly_total)
+
+    @app.route('/api/stats/monthly-spend')
+    async def stats_monthly_spend():
+        try:
+            year, month = web.year_month(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        projected = web.is_projected(request.args)
+        params = {'year': year, 'month': month}
+        if projected:
+            params['projected'] = True
+        return await _dashboard_part('monthly-spend', params, year, month, web.DASHBOARD_WEEKS, date.today(),
+                                     lambda dashboard: web.pick_monthly_spend(dashboard, projected))
+
+    @app.route('/api/stats/monthly-cats')
+    async def stats_monthly_cats():
+        try:
+            year, month = web.year_month(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        return await _dashboard_part('monthly-cats', {'year': year, 'month': month},
+                                     year, month, web.DASHBOARD_WEEKS, date.today(), web.pick_monthly_cats)
+
+    @app.route('/api/stats/weekly')
+    async def stats_weekly():
+        user_id = session.get('id')
+        try:
+            n, offset = web.weekly_args(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        today = date.today()
+        if offset == 0:
+            return await _dashboard_part('weekly', {'n': n, 'offset': 0},
+                                         today.year, today.month, n, today, web.pick_weekly)
+
+        return await _cached_stats(
+            'weekly', stats_cache.recent_weeks_months(today, n, offset), {'n': n, 'offset': offset, 'today': today},
+            lambda: ledger_db.select_recent_weeks(user_id, n, offset, today),
+        )
+
+    @app.route('/api/stats/range')
+    async def stats_range():
+        """ 기간 통계 (app.py 와 같은 파라미터) """
+        user_id = session.get('id')
+        try:
+            start, end, to, granularity = web.range_args(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        try:
+            return await _cached_stats(
+                'range', stats_cache.months_between(start, end),
+                {'from': start, 'to': to, 'granularity': granularity},
+                lambda: ledger_db.select_range_stats(user_id, start, end, granularity),
+            )
+        except Exception as e:
+            print(f"[API RANGE ERROR] {type(e).__name__}: {e}")
+            return jsonify({'error': str(e)}), 500
+
+    @app.route('/api/stats/spending-advice')
+    async def stats_spending_advice():
+        user_id = session.get('id')
+        today = date.today()
+
+        async def compute():
+            return {'advice': await ledger_db.select_spending_advice(user_id, today)}
+
+        try:
+            advice.touch(user_id)
+            return await _cached_stats(advice.NAME, stats_cache.advice_months(today), advice.cache_params(today), compute)
+        except Exception as e:
+            print(f"[API ADVICE ERROR] {type(e).__name__}: {e}")
+            return jsonify({'error': str(e)}), 500
+
+    @app.route('/api/stats/dashboard')
+    async def stats_dashboard():
+        """ 통계 페이지 묶음 API (각 통계 쿼리를 동시에 실행) """
+        user_id = session.get('id')
+        today = date.today()
+        try:
+            year, month = web.year_month(request.args)
+            n = int(request.args.get('n', web.DASHBOARD_WEEKS))
+            ledger.check_weekly(n, 0)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        try:
+            return _etag_response(*await _dashboard_cached(user_id, year, month, n, today))
+        except Exception as e:
+            print(f"[API DASHBOARD ERROR] {type(e).__name__}: {e}")
+            return jsonify({'error': str(e)}), 500
+
+    # ====================== 운영(Admin) API ======================
+    @app.route('/api/db/pool-stats')
+    async def db_pool_stats():
+        """ 비동기 커넥션 풀 상태 조회 (/metrics 와 같은 접근 제한) """
+        if not metrics.allowed(request.remote_addr, request.headers):
+            return Response('', status=404)
+        return jsonify(aio_db.pool_stats() or {})
+
+    @app.route('/metrics')
+    async def prometheus_metrics():
+        """ Prometheus 수집용 (app.py 와 같음) """
+        if not metrics.ENABLED or not metrics.allowed(request.remote_addr, request.headers):
+            return Response('', status=404)
+        body = metrics.render(metrics.pool_gauges(aio_db.pool_stats()))
+        return Response(body, mimetype='text/plain; version=0.0.4')
+
+    return app
+
+
+app = create_app()
+
+if __name__ == "__main__":
+    app.run(debug=True, port=8080)
@@ -0,0 +1,314 @@
+"""
+부하 테스트: 여러 클라이언트가 동시에 주요 API 를 호출하고 경로별 p50/p95/p99 지연과 처리량을 출력
+
+기본은 app.py 를 프로세스 안에서 Flask test client 로 호출합니다. (네트워크 없이 앱 + DB 만 측정)
+--url 을 주면 실행 중인 서버(app.py / asgi.py)에 HTTP 로 요청합니다.
+먼저 bench.seed 로 사용자/내역을 넣어 두세요.
+실행 중 POST /add 로 넣은 내역('bench-load')은 끝난 뒤 /delete 로 지워서 다음 실행의 데이터가 같게 유지됩니다.
+
+사용법 (프로젝트 루트에서):
+    python -m bench.load --user bench_100000 --clients 8 --duration 20
+    python -m bench.load --user bench_100000 --read-only --save base.json
+    python -m bench.load --user bench_100000 --compare base.json          # p95 가 20% 넘게 느려지면 종료 코드 1
+    python -m bench.load --user bench_100000 --url http://127.0.0.1:8080  # HTTP (login_rate_* 제한 주의)
+"""
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import threading
+import statistics
+import http.cookiejar
+import urllib.parse
+import urllib.request
+import urllib.error
+from datetime import date, timedelta
+
+from bench.seed import PASSWORD
+
+# (이름, 비중, 쓰기 여부) - 이름은 보고서의 행 이름이자 요청 생성 함수 키
+ROUTES = [
+    ('GET /transactions?limit', 10, False),
+    ('GET /transactions', 2, False),
+    ('GET /transactions-by-date', 20, False),
+    ('GET /month-active-dates', 10, False),
+    ('GET /api/transactions/search', 4, False),
+    ('GET /api/stats/monthly-total', 8, False),
+    ('GET /api/stats/monthly-spend', 8, False),
+    ('GET /api/stats/monthly-cats', 8, False),
+    ('GET /api/stats/weekly', 6, False),
+    ('GET /api/stats/range', 4, False),
+    ('GET /api/stats/spending-advice', 4, False),
+    ('GET /api/stats/dashboard', 6, False),
+    ('POST /add', 4, True),
+]
+
+
+def make_request(name, rng, days):
+    """ 경로 이름 -> (method, path, json body) (날짜/월은 내역이 있는 기간에서 무작위) """
+    d = rng.choice(days)
+    ym = f"year={d.year}&month={d.month}"
+    if name == 'GET /transactions?limit':
+        return 'GET', '/transactions?limit=100', None
+    if name == 'GET /transactions':
+        return 'GET', '/transactions', None
+    if name == 'GET /transactions-by-date':
+        return 'GET', f'/transactions-by-date?date={d.isoformat()}', None
+    if name == 'GET /api/transactions/search':
+        # seed 의 설명은 "bench <카테고리> <번호>"
+        q = rng.choice(('bench 식비', '교통', '생활/쇼핑', '문화'))
+        return 'GET', f'/api/transactions/search?q={urllib.parse.quote(q)}&limit=50', None
+    if name == 'GET /month-active-dates':
+        return 'GET', f'/month-active-dates?{ym}', None
+    if name.startswith('GET /api/stats/monthly-'):
+        return 'GET', f"{name[4:]}?{ym}", None
+    if name == 'GET /api/stats/weekly':
+        return 'GET', f'/api/stats/weekly?n={rng.choice((10, 26, 52))}&offset={rng.randrange(4)}', None
+    if name == 'GET /api/stats/range':
+        start = d - timedelta(days=rng.choice((30, 90, 365)))
+        gran = rng.choice(('day', 'week', 'month'))
+        return 'GET', f'/api/stats/range?from={start.isoformat()}&to={d.isoformat()}&granularity={gran}', None
+    if name == 'GET /api/stats/spending-advice':
+        return 'GET', '/api/stats/spending-advice', None
+    if name == 'GET /api/stats/dashboard':
+        return 'GET', f'/api/stats/dashboard?{ym}&n=10', None
+    if name == 'POST /add':
+        return 'POST', '/add', {
+            'date': d.isoformat(), 'type': '출금', 'desc': 'bench-load', 'amount': rng.randrange(1000, 50000),
+            'category': '식비', 'payment_method': '카드',
+        }
+    raise ValueError(name)
+
+
+# ---------------- 클라이언트 ----------------
+
+class InProcessClient:
+    """ Flask test client (세션에 바로 로그인 정보를 넣어 비밀번호 해시 비용을 빼고 측정) """
+
+    def __init__(self, app, user_id):
+        self.client = app.test_client()
+        with self.client.session_transaction() as sess:
+            sess['id'] = user_id
+            sess['username'] = user_id
+
+    def request(self, method, path, body):
+        resp = self.client.open(path, method=method, json=body)
+        return resp.status_code, resp.get_data()
+
+
+class HttpClient:
+    """ 실행 중인 서버에 HTTP 로 요청 (쿠키로 세션 유지) """
+
+    def __init__(self, base_url, user_id, password):
+        self.base_url = base_url.rstrip('/')
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+        status, _ = self.request('POST', '/login_check', {'id': user_id, 'password': password})
+        if status != 200:
+            raise RuntimeError(f"로그인 실패 (HTTP {status})")
+
+    def request(self, method, path, body):
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        req = urllib.request.Request(self.base_url + path, data=data, method=method)
+        if data is not None:
+            req.add_header('Content-Type', 'application/json')
+        try:
+            with self.opener.open(req, timeout=30) as resp:
+                return resp.status, resp.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+
+
+# ---------------- 실행 / 집계 ----------------
+
+def percentile(sorted_values, p):
+    """ nearest-rank 백분위수 """
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values), max(1, math.ceil(p / 100 * len(sorted_values)))) - 1
+    return sorted_values[k]
+
+
+def run(make_client, routes, clients, duration, warmup, days, seed, created):
+    """
+    clients 개 스레드가 duration 초 동안 요청. (warmup 초 동안의 결과는 버림)
+    POST /add 로 만든 내역 id 는 created 에 모음 (cleanup 으로 지움)
+    """
+    names = [r[0] for r in routes]
+    weights = [r[1] for r in routes]
+    samples = {name: [] for name in names}
+    errors = {name: 0 for name in names}
+    lock = threading.Lock()
+    started = time.perf_counter()
+    measure_from = started + warmup
+    stop_at = measure_from + duration
+    failures = []
+
+    def worker(idx):
+        rng = random.Random(seed + idx)
+        try:
+            client = make_client()
+        except Exception as e:
+            failures.append(e)
+            return
+        local = {name: [] for name in names}
+        local_err = {name: 0 for name in names}
+        while True:
+            now = time.perf_counter()
+            if now >= stop_at:
+                break
+            name = rng.choices(names, weights)[0]
+            method, path, body = make_request(name, rng, days)
+            t0 = time.perf_counter()
+            try:
+                status, data = client.request(method, path, body)
+            except Exception:
+                status, data = 0, None
+            elapsed = time.perf_counter() - t0
+            if name == 'POST /add' and status == 200:
+                created.append(json.loads(data)['id'])   # 중단돼도 지울 수 있게 바로 기록
+            if t0 < measure_from:
+                continue
+            local[name].append(elapsed)
+            if not 200 <= status < 400:
+                local_err[name] += 1
+        with lock:
+            for name in names:
+                samples[name].extend(local[name])
+                errors[name] += local_err[name]
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    if failures:
+        raise failures[0]
+
+    report = {}
+    for name in names:
+        values = sorted(samples[name])
+        if not values:
+            continue
+        report[name] = {
+            'count': len(values),
+            'errors': errors[name],
+            'rps': len(values) / duration,
+            'mean_ms': statistics.mean(values) * 1000,
+            'p50_ms': percentile(values, 50) * 1000,
+            'p95_ms': percentile(values, 95) * 1000,
+            'p99_ms': percentile(values, 99) * 1000,
+        }
+    total = sum(r['count'] for r in report.values())
+    report['TOTAL'] = {
+        'count': total,
+        'errors': sum(r['errors'] for r in report.values()),
+        'rps': total / duration,
+    }
+    return report
+
+
+def cleanup(make_client, created):
+    """ 부하 테스트 중 넣은 내역 삭제 (요약 테이블/캐시도 같이 맞도록 /delete API 로) """
+    if not created:
+        return
+    client = make_client()
+    failed = 0
+    for transaction_id in created:
+        status, _ = client.request('POST', '/delete', {'id': transaction_id})
+        if status != 200:
+            failed += 1
+    print(f"cleanup: bench-load 내역 {len(created) - failed}건 삭제" + (f" ({failed}건 실패)" if failed else ''))
+
+
+def print_report(report, baseline=None):
+    print(f"{'route':<32} {'count':>7} {'err':>5} {'rps':>8} {'p50':>9} {'p95':>9} {'p99':>9}" +
+          (f" {'p95 vs base':>12}" if baseline else ''))
+    for name, r in report.items():
+        if name == 'TOTAL':
+            continue
+        line = (f"{name:<32} {r['count']:>7} {r['errors']:>5} {r['rps']:>8.1f} "
+                f"{r['p50_ms']:>7.1f}ms {r['p95_ms']:>7.1f}ms {r['p99_ms']:>7.1f}ms")
+        base = (baseline or {}).get(name)
+        if base:
+            line += f" {(r['p95_ms'] / base['p95_ms'] - 1) * 100:>+11.1f}%"
+        print(line)
+    t = report['TOTAL']
+    print(f"{'TOTAL':<32} {t['count']:>7} {t['errors']:>5} {t['rps']:>8.1f}")
+
+
+def regressions(report, baseline, max_regression):
+    """ baseline 보다 p95 가 max_regression(비율) 넘게 느려진 경로 목록 """
+    out = []
+    for name, r in report.items():
+        base = baseline.get(name)
+        if name == 'TOTAL' or not base or not base.get('p95_ms'):
+            continue
+        if r['p95_ms'] > base['p95_ms'] * (1 + max_regression):
+            out.append(name)
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench.load", description="API 부하 테스트")
+    parser.add_argument("--user", required=True, help="요청할 사용자 ID (bench.seed 로 만든 bench_<내역 수>)")
+    parser.add_argument("--password", default=PASSWORD, help="--url 사용 시 로그인 비밀번호")
+    parser.add_argument("--url", help="실행 중인 서버 주소 (없으면 app.py 를 프로세스 안에서 호출)")
+    parser.add_argument("--clients", type=int, default=8, help="동시 클라이언트 수")
+    parser.add_argument("--duration", type=float, default=20, help="측정 시간(초)")
+    parser.add_argument("--warmup", type=float, default=3, help="측정 전 워밍업 시간(초)")
+    parser.add_argument("--routes", nargs="+", help="이 문자열이 들어간 경로만 (예: stats by-date)")
+    parser.add_argument("--read-only", action="store_true", help="쓰기 API(/add) 제외")
+    parser.add_argument("--end", type=date.fromisoformat, default=date.today(), help="seed 의 --end 와 같게")
+    parser.add_argument("--years", type=float, default=3, help="seed 의 --years 와 같게")
+    parser.add_argument("--seed", type=int, default=1, help="요청 순서 난수 seed")
+    parser.add_argument("--save", help="결과를 JSON 으로 저장")
+    parser.add_argument("--compare", help="이전 --save 결과와 비교")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="허용할 p95 증가 비율")
+    args = parser.parse_args(argv)
+
+    routes = [r for r in ROUTES if not (args.read_only and r[2])]
+    if args.routes:
+        routes = [r for r in routes if any(s in r[0] for s in args.routes)]
+    if not routes:
+        print("선택된 경로가 없습니다.")
+        return 2
+
+    days = [args.end - timedelta(days=i) for i in range(int(365 * args.years))]
+    if args.url:
+        make_client = lambda: HttpClient(args.url, args.user, args.password)
+    else:
+        from app import app
+        make_client = lambda: InProcessClient(app, args.user)
+
+    print(f"user={args.user} clients={args.clients} duration={args.duration}s "
+          f"target={args.url or 'in-process app.py'}")
+    created = []
+    try:
+        report = run(make_client, routes, args.clients, args.duration, args.warmup, days, args.seed, created)
+    finally:
+        cleanup(make_client, created)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)['routes']
+    print_report(report, baseline)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({'args': {k: str(v) for k, v in vars(args).items()}, 'routes': report},
+                      f, ensure_ascii=False, indent=2)
+
+    if baseline:
+        slower = regressions(report, baseline, args.max_regression)
+        if slower:
+            print(f"[REGRESSION] p95 가 {args.max_regression:.0%} 넘게 느려짐: {', '.join(slower)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""
+벤치마크용 합성 데이터 넣기
+
+내역 수별로 사용자(bench_<내역 수>)를 하나씩 만들고, 같은 seed 면 항상 같은 내역을 넣습니다.
+내역은 multi-row INSERT 로 넣은 뒤 summary.rebuild 로 요약 테이블을 한 번에 채웁니다.
+실수로 실제 DB 에 넣지 않도록 DB 이름(SQLite 는 파일 경로)에 'bench' 가 없으면 --force 없이는 거부합니다.
+
+사용법 (프로젝트 루트에서, config.py 가 벤치마크용 DB 를 가리키는 상태로):
+    python -m modules.migrate apply
+    python -m bench.seed --rows 1000 100000 1000000
+    python -m bench.seed --rows 10000 --reset        # 기존 bench 사용자 내역을 지우고 다시 넣기
+"""
+import sys
+import time
+import random
+import argparse
+from datetime import date, timedelta
+
+from modules.user import db_connector
+from modules import config, ledger, summary, passwords, storage
+
+PASSWORD = 'bench-pass'
+CHUNK_SIZE = 5000
+
+UPSERT_USER_SQL = storage.sql(
+    mysql="INSERT INTO user (id, user_name, password) VALUES (%s, %s, %s) "
+          "ON DUPLICATE KEY UPDATE password = VALUES(password)",
+    sqlite="INSERT INTO user (id, user_name, password) VALUES (%s, %s, %s) "
+           "ON CONFLICT(id) DO UPDATE SET password = excluded.password",
+)
+
+# 내역 종류별 (category, 금액 범위, 비중)
+_SPEND = [('식비', 3000, 40000, 40), ('주거/통신', 30000, 800000, 5), ('교통/차량', 1250, 60000, 20),
+          ('문화/여가', 5000, 120000, 10), ('생활/쇼핑', 5000, 300000, 15), ('건강/가족', 5000, 200000, 5),
+          ('금융/기타', 1000, 500000, 5)]
+_INCOME = [('급여', 2000000, 5000000, 10), ('금융소득', 100, 50000, 40), ('용돈/지원금', 10000, 300000, 30),
+           ('기타', 1000, 100000, 20)]
+
+
+def user_id_for(rows):
+    return f"bench_{rows}"
+
+
+def synthetic_rows(n, end, years, seed):
+    """ end 이전 years 년 동안 고르게 퍼진 내역 n 건 (지출 85% / 수입 15%) """
+    rng = random.Random(seed)
+    days = max(1, int(365 * years))
+    start = end - timedelta(days=days - 1)
+    spend_w = [w for *_, w in _SPEND]
+    income_w = [w for *_, w in _INCOME]
+    for i in range(n):
+        d = start + timedelta(days=rng.randrange(days))
+        if rng.random() < 0.85:
+            category, lo, hi, _ = rng.choices(_SPEND, spend_w)[0]
+            type_ = '출금'
+        else:
+            category, lo, hi, _ = rng.choices(_INCOME, income_w)[0]
+            type_ = '입금'
+        yield {
+            'date': d,
+            'type': type_,
+            'description': f"bench {category} {i}",
+            'amount': rng.randrange(lo, hi) // 10 * 10,
+            'category': category,
+            'pay': rng.choice(ledger.PAY_LIST),
+        }
+
+
+def seed_user(db, user_id, n, end, years, seed, reset):
+    cur = db.cursor()
+    try:
+        cur.execute(UPSERT_USER_SQL, (user_id, user_id, passwords.hash_password_sync(PASSWORD)))
+        cur.execute("SELECT COUNT(*) AS cnt FROM ledger WHERE user_id = %s", (user_id,))
+        existing = cur.fetchone()['cnt']
+        if existing and not reset:
+            print(f"  {user_id}: 이미 {existing}건 있음 (다시 넣으려면 --reset)")
+            db.commit()
+            return 0
+        cur.execute("DELETE FROM ledger WHERE user_id = %s", (user_id,))
+        db.commit()
+
+        chunk = []
+        inserted = 0
+        for row in synthetic_rows(n, end, years, seed):
+            chunk.append((user_id, row['date'], row['type'], row['description'],
+                          row['amount'], row['category'], row['pay']))
+            if len(chunk) >= CHUNK_SIZE:
+                cur.executemany(ledger.INSERT_SQL, chunk)
+                db.commit()
+                inserted += len(chunk)
+                chunk = []
+                print(f"  {user_id}: {inserted}/{n}", end='\r')
+        if chunk:
+            cur.executemany(ledger.INSERT_SQL, chunk)
+            db.commit()
+            inserted += len(chunk)
+    finally:
+        cur.close()
+
+    summary.rebuild(db, user_id)
+    return inserted
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench.seed", description="벤치마크용 합성 데이터 넣기")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 100000], help="사용자별 내역 수 목록")
+    parser.add_argument("--years", type=float, default=3, help="내역을 퍼뜨릴 기간(년)")
+    parser.add_argument("--end", type=date.fromisoformat, default=date.today(), help="마지막 날짜 YYYY-MM-DD")
+    parser.add_argument("--seed", type=int, default=42, help="난수 seed (같으면 같은 데이터)")
+    parser.add_argument("--reset", action="store_true", help="이미 있는 bench 사용자 내역을 지우고 다시 넣기")
+    parser.add_argument("--force", action="store_true", help="DB 이름에 bench 가 없어도 실행")
+    args = parser.parse_args(argv)
+
+    db_name = storage.sql(mysql=getattr(config, 'db', ''), sqlite=getattr(config, 'sqlite_path', ''))
+    if 'bench' not in str(db_name) and not args.force:
+        print(f"DB '{db_name}' 에 합성 데이터를 넣으려면 --force 를 붙이세요. (벤치마크 전용 DB 권장)")
+        return 2
+
+    db = db_connector()
+    try:
+        for n in args.rows:
+            user_id = user_id_for(n)
+            started = time.perf_counter()
+            inserted = seed_user(db, user_id, n, args.end, args.years, args.seed + n, args.reset)
+            if inserted:
+                print(f"  {user_id}: {inserted}건 ({time.perf_counter() - started:.1f}s)")
+        print(f"로그인: 아이디 bench_<내역 수> / 비밀번호 {PASSWORD}")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
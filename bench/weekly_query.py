@@ -0,0 +1,128 @@
+"""
+주간 통계 쿼리 벤치마크: 예전 WITH RECURSIVE + 주별 LEFT JOIN 방식(ledger) vs 주 시작일 GROUP BY 한 번(ledger_summary)
+
+실제 DB(config.py)에 붙어서 같은 사용자/기간으로 두 쿼리를 번갈아 실행하고
+결과가 같은지 확인한 뒤 평균/중앙값 시간을 출력합니다.
+
+사용법 (프로젝트 루트에서):
+    python -m bench.weekly_query --user test --n 10 52 260 --repeat 20
+    python -m bench.weekly_query --user test --n 52 --explain   # 실행 계획도 출력
+"""
+import sys
+import time
+import argparse
+import statistics
+
+import pymysql
+
+from modules.user import db_connector
+from modules import ledger
+
+# 예전 select_recent_weeks 쿼리 (비교용으로 원본 ledger 테이블 대상 그대로 보관, 기준일은 DB 의 CURDATE())
+LEGACY_SQL = """
+        WITH RECURSIVE seq(i) AS (
+            SELECT 0 UNION ALL SELECT i + 1 FROM seq WHERE i + 1 < %s
+        ),
+        base AS (
+            SELECT DATE_SUB(CURDATE(), INTERVAL WEEKDAY(CURDATE()) DAY) AS monday_this_week
+        ),
+        weeks AS (
+            SELECT DATE_SUB(b.monday_this_week, INTERVAL s.i WEEK) AS week_start
+            FROM base b JOIN seq s
+        ),
+        agg AS (
+            SELECT
+                w.week_start,
+                COALESCE(SUM(CASE WHEN l.type='입금' THEN l.amount ELSE 0 END), 0) AS income,
+                COALESCE(SUM(CASE WHEN l.type='출금' THEN l.amount ELSE 0 END), 0) AS spend
+            FROM weeks w
+            LEFT JOIN ledger l
+              ON l.user_id = %s
+             AND l.date >= w.week_start
+             AND l.date <  DATE_ADD(w.week_start, INTERVAL 7 DAY)
+            GROUP BY w.week_start
+        )
+        SELECT
+            DATE_FORMAT(week_start, '%%m.%%d') AS start_label,
+            DATE_FORMAT(DATE_ADD(week_start, INTERVAL 6 DAY), '%%m.%%d') AS end_label,
+            (income - spend) AS net
+        FROM agg
+        ORDER BY week_start
+        """
+
+
+def run_legacy(cur, user_id, n):
+    cur.execute(LEGACY_SQL, (n, user_id))
+    rows = cur.fetchall()
+    return {"labels": [f"{r['start_label']}~{r['end_label']}" for r in rows],
+            "net": [int(r['net'] or 0) for r in rows]}
+
+
+def db_today(cur):
+    """ 예전 쿼리와 같은 기준일 (DB 서버의 CURDATE()) """
+    cur.execute("SELECT CURDATE() AS today")
+    return cur.fetchone()['today']
+
+
+def run_single_scan(cur, user_id, n, today):
+    monday, start, end = ledger.weekly_window(today, n)
+    cur.execute(ledger.RANGE_TOTALS_SQL['week'], (user_id, start, end))
+    by_week = {r['bucket']: r for r in cur.fetchall()}
+    return ledger._weekly_net(by_week, monday, n)
+
+
+def timed(fn, repeat):
+    samples = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return result, samples
+
+
+def explain(cur, sql, params):
+    cur.execute("EXPLAIN " + sql, params)
+    for row in cur.fetchall():
+        print("    ", {k: row[k] for k in ('table', 'type', 'key', 'rows', 'Extra') if k in row})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench.weekly_query", description="주간 통계 쿼리 비교")
+    parser.add_argument("--user", required=True, help="측정할 사용자 ID (내역이 많은 계정 추천)")
+    parser.add_argument("--n", type=int, nargs="+", default=[10, 52], help="주 수 목록")
+    parser.add_argument("--repeat", type=int, default=10, help="쿼리별 반복 횟수")
+    parser.add_argument("--explain", action="store_true", help="EXPLAIN 결과 출력")
+    args = parser.parse_args(argv)
+
+    db = db_connector()
+    cur = db.cursor(pymysql.cursors.DictCursor)
+    try:
+        today = db_today(cur)
+        print(f"user={args.user} today={today} repeat={args.repeat}")
+        print(f"{'n':>5} {'legacy avg':>12} {'legacy p50':>12} {'single avg':>12} {'single p50':>12} {'speedup':>8}")
+        for n in args.n:
+            legacy, legacy_ms = timed(lambda: run_legacy(cur, args.user, n), args.repeat)
+            single, single_ms = timed(lambda: run_single_scan(cur, args.user, n, today), args.repeat)
+            if legacy != single:
+                print(f"[MISMATCH] n={n}: legacy={legacy} single={single}")
+                return 1
+
+            l_avg, s_avg = statistics.mean(legacy_ms), statistics.mean(single_ms)
+            print(f"{n:>5} {l_avg:>10.2f}ms {statistics.median(legacy_ms):>10.2f}ms "
+                  f"{s_avg:>10.2f}ms {statistics.median(single_ms):>10.2f}ms {l_avg / s_avg:>7.1f}x")
+
+            if args.explain:
+                print("  legacy:")
+                explain(cur, LEGACY_SQL, (n, args.user))
+                _, start, end = ledger.weekly_window(today, n)
+                print("  single scan:")
+                explain(cur, ledger.RANGE_TOTALS_SQL['week'], (args.user, start, end))
+        return 0
+    finally:
+        cur.close()
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
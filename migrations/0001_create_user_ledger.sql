@@ -0,0 +1,26 @@
+-- 기본 테이블 (user, ledger)
+-- 백업을 복원해서 이미 테이블이 있는 DB 에서도 그대로 통과하도록 IF NOT EXISTS 사용
+
+-- +migrate Up
+CREATE TABLE IF NOT EXISTS user (
+    id        VARCHAR(50)  NOT NULL,
+    user_name VARCHAR(50)  NOT NULL,
+    password  VARCHAR(255) NOT NULL,
+    PRIMARY KEY (id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS ledger (
+    id          INT          NOT NULL AUTO_INCREMENT,
+    user_id     VARCHAR(50)  NOT NULL,
+    date        DATE         NOT NULL,
+    type        VARCHAR(10)  NOT NULL,
+    description VARCHAR(255) NULL,
+    amount      VARCHAR(20)  NOT NULL,
+    category    VARCHAR(50)  NULL,
+    pay         VARCHAR(20)  NULL,
+    PRIMARY KEY (id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- +migrate Down
+DROP TABLE IF EXISTS ledger;
+DROP TABLE IF EXISTS user;
@@ -0,0 +1,13 @@
+-- ledger 조회 패턴별 복합 인덱스
+--  * idx_ledger_user_date_id : user_id + 날짜 범위 / 정확한 날짜 + ORDER BY id,
+--                              목록 keyset 페이지(date DESC, id DESC), 달력 DISTINCT date
+--  * idx_ledger_user_date_cover : user_id + 날짜 범위로 type/pay/category/amount 를 집계하는
+--                              쿼리(요약 테이블 rebuild/check)를 테이블 접근 없이 인덱스만으로 처리
+
+-- +migrate Up
+CREATE INDEX idx_ledger_user_date_id ON ledger (user_id, date, id);
+CREATE INDEX idx_ledger_user_date_cover ON ledger (user_id, date, type, pay, category, amount);
+
+-- +migrate Down
+DROP INDEX idx_ledger_user_date_cover ON ledger;
+DROP INDEX idx_ledger_user_date_id ON ledger;
@@ -0,0 +1,40 @@
+-- amount 를 정수 컬럼으로, type/pay/category 를 ENUM(1바이트)으로 변환
+-- (카테고리 목록은 static/js/ledger.js 의 categoryList 와 같아야 합니다)
+-- Up 의 UPDATE 는 DDL 과 달리 되돌릴 수 없으므로, 변환할 수 없는 행이 있으면 Check 에서 먼저 멈춥니다.
+-- (python -m modules.migrate check 로 미리 확인, 출력된 행을 고친 뒤 apply)
+
+-- +migrate Check
+-- 정수(BIGINT)로 바꿀 수 없는 금액 (쉼표/앞뒤 공백은 Up 에서 지움)
+SELECT id, user_id, date, amount FROM ledger
+WHERE REPLACE(TRIM(amount), ',', '') NOT REGEXP '^-?[0-9]{1,18}$';
+-- ENUM 에 없는 값 (빈 문자열은 NULL 로 바뀌므로 제외)
+SELECT id, user_id, date, type FROM ledger
+WHERE TRIM(type) NOT IN ('입금', '출금');
+SELECT id, user_id, date, pay FROM ledger
+WHERE NULLIF(TRIM(pay), '') NOT IN ('카드', '현금', '계좌이체');
+SELECT id, user_id, date, category FROM ledger
+WHERE NULLIF(TRIM(category), '') NOT IN ('급여', '금융소득', '용돈/지원금', '기타',
+                                         '식비', '주거/통신', '교통/차량', '문화/여가',
+                                         '생활/쇼핑', '건강/가족', '금융/기타');
+
+-- +migrate Up
+UPDATE ledger SET amount = REPLACE(TRIM(amount), ',', '');
+UPDATE ledger SET type = TRIM(type);
+UPDATE ledger SET pay = NULL WHERE TRIM(pay) = '';
+UPDATE ledger SET category = NULL WHERE TRIM(category) = '';
+UPDATE ledger SET category = TRIM(category) WHERE category IS NOT NULL;
+
+ALTER TABLE ledger
+    MODIFY amount   BIGINT NOT NULL,
+    MODIFY type     ENUM('입금', '출금') NOT NULL,
+    MODIFY pay      ENUM('카드', '현금', '계좌이체') NULL,
+    MODIFY category ENUM('급여', '금융소득', '용돈/지원금', '기타',
+                         '식비', '주거/통신', '교통/차량', '문화/여가',
+                         '생활/쇼핑', '건강/가족', '금융/기타') NULL;
+
+-- +migrate Down
+ALTER TABLE ledger
+    MODIFY amount   VARCHAR(20) NOT NULL,
+    MODIFY type     VARCHAR(10) NOT NULL,
+    MODIFY pay      VARCHAR(20) NULL,
+    MODIFY category VARCHAR(50) NULL;
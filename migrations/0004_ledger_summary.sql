@@ -0,0 +1,24 @@
+-- 통계용 일별 요약 테이블 (modules/summary.py) + 기존 내역으로 채우기
+-- PK (user_id, d, type, category, pay) 가 통계 쿼리의 user_id + 날짜 범위 + 그룹 기준을 모두 덮음
+
+-- +migrate Up
+CREATE TABLE IF NOT EXISTS ledger_summary (
+    user_id  VARCHAR(50) NOT NULL,
+    d        DATE        NOT NULL,
+    type     VARCHAR(10) NOT NULL,
+    category VARCHAR(50) NOT NULL DEFAULT '',
+    pay      VARCHAR(20) NOT NULL DEFAULT '',
+    amount   BIGINT      NOT NULL DEFAULT 0,
+    cnt      INT         NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, d, type, category, pay)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+DELETE FROM ledger_summary;
+
+INSERT INTO ledger_summary (user_id, d, type, category, pay, amount, cnt)
+SELECT user_id, date, type, COALESCE(category, ''), COALESCE(pay, ''), SUM(amount), COUNT(*)
+FROM ledger
+GROUP BY user_id, date, type, COALESCE(category, ''), COALESCE(pay, '');
+
+-- +migrate Down
+DROP TABLE IF EXISTS ledger_summary;
@@ -0,0 +1,10 @@
+-- 내역 설명(description) 전문 검색 인덱스 (/api/transactions/search, ledger.search_transactions)
+-- ngram 파서는 글자 2개(ngram_token_size 기본값) 단위로 색인하므로 띄어쓰기 없는 한글도 부분 일치로 찾음
+-- 검색은 MATCH 로 찾은 행에서 user_id 가 같은 것만 남김 (1글자 검색어는 그 사용자의 내역을 LIKE 로 확인)
+-- 기존 내역이 많으면 인덱스 생성에 시간이 걸릴 수 있습니다.
+
+-- +migrate Up
+ALTER TABLE ledger ADD FULLTEXT INDEX ft_ledger_description (description) WITH PARSER ngram;
+
+-- +migrate Down
+DROP INDEX ft_ledger_description ON ledger;
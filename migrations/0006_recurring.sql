@@ -0,0 +1,33 @@
+-- 반복 내역 규칙 + 이미 넣은 회차 기록 (modules/recurring.py)
+-- recurring_rule.next_date: 아직 ledger 에 넣지 않은 첫 회차 (NULL 이면 종료일이 지나 끝난 규칙)
+-- recurring_occurrence 의 PK (rule_id, period) 가 같은 회차를 두 번 넣지 않게 막음
+
+-- +migrate Up
+CREATE TABLE IF NOT EXISTS recurring_rule (
+    id          BIGINT AUTO_INCREMENT PRIMARY KEY,
+    user_id     VARCHAR(50) NOT NULL,
+    type        ENUM('입금', '출금') NOT NULL,
+    description VARCHAR(255) NULL,
+    amount      BIGINT NOT NULL,
+    category    ENUM('급여', '금융소득', '용돈/지원금', '기타',
+                     '식비', '주거/통신', '교통/차량', '문화/여가',
+                     '생활/쇼핑', '건강/가족', '금융/기타') NULL,
+    pay         ENUM('카드', '현금', '계좌이체') NULL,
+    freq        ENUM('daily', 'weekly', 'monthly') NOT NULL,
+    every       INT  NOT NULL DEFAULT 1,
+    start_date  DATE NOT NULL,
+    end_date    DATE NULL,
+    next_date   DATE NULL,
+    KEY idx_recurring_user (user_id, id),
+    KEY idx_recurring_due (next_date)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS recurring_occurrence (
+    rule_id BIGINT NOT NULL,
+    period  DATE   NOT NULL,
+    PRIMARY KEY (rule_id, period)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- +migrate Down
+DROP TABLE IF EXISTS recurring_occurrence;
+DROP TABLE IF EXISTS recurring_rule;
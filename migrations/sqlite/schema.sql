@@ -0,0 +1,90 @@
+-- SQLite 백엔드 스키마 (modules/sqlite_db.py 가 처음 연결할 때 실행)
+-- MySQL 마이그레이션 0001 ~ 0006 을 합친 최종 상태와 같은 테이블/인덱스입니다.
+-- ENUM 대신 CHECK 제약을 쓰며, 목록은 migrations/0003 과 같아야 합니다.
+-- 모든 문장은 IF NOT EXISTS 라서 매번 실행해도 됩니다.
+
+CREATE TABLE IF NOT EXISTS user (
+    id        TEXT NOT NULL PRIMARY KEY,
+    user_name TEXT NOT NULL,
+    password  TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS ledger (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id     TEXT    NOT NULL,
+    date        DATE    NOT NULL,
+    type        TEXT    NOT NULL CHECK (type IN ('입금', '출금')),
+    description TEXT    NULL,
+    amount      INTEGER NOT NULL,
+    category    TEXT    NULL CHECK (category IN ('급여', '금융소득', '용돈/지원금', '기타',
+                                                 '식비', '주거/통신', '교통/차량', '문화/여가',
+                                                 '생활/쇼핑', '건강/가족', '금융/기타')),
+    pay         TEXT    NULL CHECK (pay IN ('카드', '현금', '계좌이체'))
+);
+
+CREATE INDEX IF NOT EXISTS idx_ledger_user_date_id ON ledger (user_id, date, id);
+CREATE INDEX IF NOT EXISTS idx_ledger_user_date_cover ON ledger (user_id, date, type, pay, category, amount);
+
+CREATE TABLE IF NOT EXISTS ledger_summary (
+    user_id  TEXT    NOT NULL,
+    d        DATE    NOT NULL,
+    type     TEXT    NOT NULL,
+    category TEXT    NOT NULL DEFAULT '',
+    pay      TEXT    NOT NULL DEFAULT '',
+    amount   INTEGER NOT NULL DEFAULT 0,
+    cnt      INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, d, type, category, pay)
+) WITHOUT ROWID;
+
+-- 내역 설명 전문 검색 (ledger.search_transactions, SQLite 에서만 사용)
+-- trigram 토크나이저는 3글자 단위로 색인하므로 띄어쓰기 없는 한글도 부분 일치로 찾음
+-- 더 짧은 검색어는 그 사용자의 내역만 LIKE 로 확인
+-- ledger 를 원본으로 쓰는 external content 테이블이며 아래 트리거가 쓰기와 함께 갱신
+CREATE VIRTUAL TABLE IF NOT EXISTS ledger_fts USING fts5(
+    description, content='ledger', content_rowid='id', tokenize='trigram'
+);
+
+CREATE TRIGGER IF NOT EXISTS ledger_fts_insert AFTER INSERT ON ledger BEGIN
+    INSERT INTO ledger_fts (rowid, description) VALUES (new.id, new.description);
+END;
+
+CREATE TRIGGER IF NOT EXISTS ledger_fts_delete AFTER DELETE ON ledger BEGIN
+    INSERT INTO ledger_fts (ledger_fts, rowid, description) VALUES ('delete', old.id, old.description);
+END;
+
+CREATE TRIGGER IF NOT EXISTS ledger_fts_update AFTER UPDATE OF description ON ledger BEGIN
+    INSERT INTO ledger_fts (ledger_fts, rowid, description) VALUES ('delete', old.id, old.description);
+    INSERT INTO ledger_fts (rowid, description) VALUES (new.id, new.description);
+END;
+
+-- 검색 색인 없이 만들어진 DB 는 처음 한 번 기존 내역으로 색인을 채움
+INSERT INTO ledger_fts (ledger_fts)
+SELECT 'rebuild'
+WHERE EXISTS (SELECT 1 FROM ledger) AND NOT EXISTS (SELECT 1 FROM ledger_fts_docsize);
+
+-- 반복 내역 규칙 + 이미 넣은 회차 기록 (modules/recurring.py, migrations/0006)
+CREATE TABLE IF NOT EXISTS recurring_rule (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id     TEXT    NOT NULL,
+    type        TEXT    NOT NULL CHECK (type IN ('입금', '출금')),
+    description TEXT    NULL,
+    amount      INTEGER NOT NULL,
+    category    TEXT    NULL CHECK (category IN ('급여', '금융소득', '용돈/지원금', '기타',
+                                                 '식비', '주거/통신', '교통/차량', '문화/여가',
+                                                 '생활/쇼핑', '건강/가족', '금융/기타')),
+    pay         TEXT    NULL CHECK (pay IN ('카드', '현금', '계좌이체')),
+    freq        TEXT    NOT NULL CHECK (freq IN ('daily', 'weekly', 'monthly')),
+    every       INTEGER NOT NULL DEFAULT 1,
+    start_date  DATE    NOT NULL,
+    end_date    DATE    NULL,
+    next_date   DATE    NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_recurring_user ON recurring_rule (user_id, id);
+CREATE INDEX IF NOT EXISTS idx_recurring_due ON recurring_rule (next_date);
+
+CREATE TABLE IF NOT EXISTS recurring_occurrence (
+    rule_id INTEGER NOT NULL,
+    period  DATE    NOT NULL,
+    PRIMARY KEY (rule_id, period)
+) WITHOUT ROWID;
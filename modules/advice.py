@@ -0,0 +1,113 @@
+"""
+지출 조언 미리 계산 (/api/stats/spending-advice)
+
+조언은 이번달/지난달의 수입·지출 합계 네 개만 있으면 됩니다. (ledger.ADVICE_TOTALS_SQL, 요약 테이블 두 달치)
+그 결과를 통계 응답 캐시(modules/cache.py)에 "이번 달" 기준으로 넣어 두고, 엔드포인트는 캐시만 읽습니다.
+
+    - 내역을 쓰면 ledger.invalidate_caches 가 그 달 버전을 올리고, 여기서 그 사용자를 다시 계산하도록 예약
+    - 달이 바뀌면 최근에 조언을 본 사용자들을 모두 다시 계산
+    - 백그라운드 스레드 하나가 예약된 사용자를 차례로 계산 (같은 사용자는 한 번만)
+
+다시 계산이 끝나기 전에 요청이 오면 기존처럼 그 자리에서 계산하므로 오래된 조언을 돌려주지는 않습니다.
+"""
+import queue
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+
+from . import config, cache, ledger
+
+NAME = 'spending-advice'
+REFRESH_ENABLED = getattr(config, 'advice_refresh_enabled', True)
+RECENT_USERS = getattr(config, 'advice_recent_users', 1024)   # 달이 바뀔 때 다시 계산할 최근 사용자 수
+
+
+def cache_params(today):
+    """ 캐시 키 파라미터: 조언은 날짜가 아니라 "이번 달"에만 달라짐 """
+    return {'month': f"{today:%Y-%m}"}
+
+def compute(user_id, today):
+    return {'advice': ledger.select_spending_advice(user_id, today)}
+
+# ---------------- 백그라운드 다시 계산 ----------------
+
+_recent = OrderedDict()        # 최근 조언을 본 사용자 (LRU)
+_recent_lock = threading.Lock()
+_queue = queue.Queue()
+_pending = set()               # 예약되어 아직 계산하지 않은 사용자
+_pending_lock = threading.Lock()
+_worker = None
+_dumps = None
+
+def touch(user_id):
+    """ 조언을 본 사용자로 기록 (달이 바뀌면 이 사용자들 것부터 다시 계산) """
+    with _recent_lock:
+        _recent[user_id] = True
+        _recent.move_to_end(user_id)
+        while len(_recent) > RECENT_USERS:
+            _recent.popitem(last=False)
+
+def refresh(user_id):
+    """ 해당 사용자의 조언을 백그라운드에서 다시 계산하도록 예약 (이미 예약되어 있으면 무시) """
+    if _worker is None:
+        return
+    with _pending_lock:
+        if user_id in _pending:
+            return
+        _pending.add(user_id)
+    _queue.put(user_id)
+
+def _on_write(user_id, *dates):
+    """ ledger.invalidate_caches 에서 호출: 지난달/이번달 내역이 바뀐 경우만 다시 계산 """
+    months = set(cache.advice_months(date.today()))
+    for d in filter(None, dates):
+        if isinstance(d, str):
+            d = date.fromisoformat(d[:10])
+        if (d.year, d.month) in months:
+            refresh(user_id)
+            return
+
+def _next_month_start(now):
+    return datetime(now.year + (now.month == 12), now.month % 12 + 1, 1)
+
+def _run():
+    rollover = _next_month_start(datetime.now())
+    while True:
+        try:
+            user_id = _queue.get(timeout=max(0.0, (rollover - datetime.now()).total_seconds()))
+        except queue.Empty:
+            user_id = None
+
+        if datetime.now() >= rollover:
+            # 달이 바뀜: 최근 사용자 모두 예약 (새 달 키로 미리 계산)
+            rollover = _next_month_start(datetime.now())
+            with _recent_lock:
+                users = list(_recent)
+            for u in users:
+                refresh(u)
+        if user_id is None:
+            continue
+
+        with _pending_lock:
+            _pending.discard(user_id)
+        today = date.today()
+        try:
+            cache.get_or_compute(NAME, user_id, cache.advice_months(today), cache_params(today),
+                                 lambda: compute(user_id, today), _dumps)
+        except Exception as e:
+            print(f"[ADVICE REFRESH ERROR] {type(e).__name__}: {e}")
+
+def start(dumps):
+    """
+    백그라운드 계산 스레드 시작 (앱 생성 시 한 번 호출)
+
+    Args:
+        dumps (callable): 응답과 같은 형식으로 직렬화할 함수 (app.json.dumps)
+    """
+    global _worker, _dumps
+    if _worker is not None or not REFRESH_ENABLED:
+        return
+    _dumps = dumps
+    ledger.WRITE_LISTENERS.append(_on_write)
+    _worker = threading.Thread(target=_run, name='advice-refresh', daemon=True)
+    _worker.start()
@@ -0,0 +1,207 @@
+"""
+일별 합계 -> 누적/구간 합계 계산
+
+DB 에서 날짜별 합계(by_day: {date: {'income', 'spend', ...}})를 한 번 받아 온 뒤,
+필드별 일별 배열을 만들고 누적합(prefix sum)을 한 번에 계산합니다.
+누적합이 있으면 어떤 구간의 합계든 빼기 한 번으로 구할 수 있어서
+한 달 / 분기 / 1년 / 임의 기간을 같은 코드로 처리합니다.
+
+numpy 가 설치되어 있으면 numpy.cumsum 을, 없으면 itertools.accumulate 를 사용합니다.
+"""
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+try:
+    import numpy as np
+except ImportError:  # numpy 는 선택 사항
+    np = None
+
+# 일별/구간별 합계 SQL(ledger._DAILY_COLUMNS)이 돌려주는 합계 필드
+FIELDS = ('income', 'spend', 'card', 'transfer', 'other')
+
+
+def day_count(start, end):
+    """ [start, end) 일수 """
+    return (end - start).days
+
+
+def daily_arrays(by_day, start, end, fields=FIELDS):
+    """
+    by_day 를 필드별 일별 배열로 변환 ([start, end) 밖의 날짜는 무시)
+
+    Returns:
+        dict: {field: 길이 (end - start).days 인 list}
+    """
+    n = day_count(start, end)
+    out = {f: [0] * n for f in fields}
+    for d, row in by_day.items():
+        i = (d - start).days
+        if 0 <= i < n:
+            for f in fields:
+                out[f][i] = int(row[f] or 0)
+    return out
+
+
+def prefix_sums(by_day, start, end, fields=FIELDS):
+    """
+    필드별 누적합. 결과[f][i] = start 부터 start+i 일까지의 합계 (i 포함)
+
+    Returns:
+        dict: {field: list[int]}
+    """
+    arrays = daily_arrays(by_day, start, end, fields)
+    if np is not None and arrays:
+        matrix = np.array([arrays[f] for f in fields], dtype=np.int64)
+        cums = np.cumsum(matrix, axis=1).tolist()
+        return dict(zip(fields, cums))
+    return {f: list(accumulate(arrays[f])) for f in fields}
+
+
+def window_sums(prefix, start, edges):
+    """
+    누적합으로 [edges[k], edges[k+1]) 구간 합계 목록을 계산
+
+    Args:
+        prefix (list): prefix_sums 결과의 한 필드 (start 기준)
+        edges (list): 오름차순 날짜 경계 목록
+    """
+    def upto(d):
+        # d 전날까지의 합계
+        i = min((d - start).days, len(prefix))
+        return prefix[i - 1] if i > 0 else 0
+    return [upto(b) - upto(a) for a, b in zip(edges, edges[1:])]
+
+
+def cumulative_series(by_day, start, end, labels=None):
+    """
+    [start, end) 구간 누적 시리즈 (/api/stats/monthly-spend 응답 형식)
+
+    Args:
+        labels (list|None): x 축 이름 (없으면 '1일', '2일' ... 날짜의 일)
+    """
+    cums = prefix_sums(by_day, start, end)
+    if labels is None:
+        labels = [f"{(start + timedelta(days=i)).day}일" for i in range(day_count(start, end))]
+
+    def total(f):
+        return cums[f][-1] if cums[f] else 0
+
+    return {
+        'labels': labels,
+        'cumIncome':   cums['income'],
+        'cumSpend':    cums['spend'],
+        'cumCard':     cums['card'],
+        'cumTransfer': cums['transfer'],
+        'cumOther':    cums['other'],
+        'totalIncome': total('income'),
+        'totalSpend':  total('spend'),
+        'totalCard': total('card'),
+        'totalTransfer': total('transfer'),
+        'totalOther':  total('other'),
+    }
+
+
+def merge_days(*by_days, fields=FIELDS):
+    """ 여러 by_day 를 날짜별로 더한 새 by_day (예: 실제 내역 + 반복 내역 예정 금액) """
+    out = {}
+    for by_day in by_days:
+        for d, row in by_day.items():
+            acc = out.setdefault(d, dict.fromkeys(fields, 0))
+            for f in fields:
+                acc[f] += int(row[f] or 0)
+    return out
+
+
+def month_series(by_day, year, month, days):
+    """ 한 달치 누적 시리즈 """
+    start = date(year, month, 1)
+    return cumulative_series(by_day, start, start + timedelta(days=days))
+
+
+def weekly_net(by_day, monday_this_week, n_weeks):
+    """ 최근 n주(이번 주 포함)의 주별 순변화(수입 - 지출) """
+    start = monday_this_week - timedelta(weeks=n_weeks - 1)
+    end = monday_this_week + timedelta(days=7)
+    cums = prefix_sums(by_day, start, end, ('income', 'spend'))
+    edges = [start + timedelta(weeks=i) for i in range(n_weeks + 1)]
+    income = window_sums(cums['income'], start, edges)
+    spend = window_sums(cums['spend'], start, edges)
+
+    labels = [f"{a:%m.%d}~{a + timedelta(days=6):%m.%d}" for a in edges[:-1]]
+    return {"labels": labels, "net": [i - s for i, s in zip(income, spend)]}
+
+
+# --- 기간 통계 (/api/stats/range) ---
+
+GRANULARITIES = ('day', 'week', 'month')
+
+def local_today(tz_name):
+    """
+    해당 시간대의 오늘 날짜 (서버 시간대와 사용자 시간대가 다를 때 기본 기간 계산용)
+    내역 날짜는 사용자가 입력한 달력 날짜(DATE)라서 구간 나누기 자체는 시간대와 무관합니다.
+
+    Raises:
+        ValueError: 알 수 없는 시간대 이름
+    """
+    try:
+        return datetime.now(ZoneInfo(tz_name)).date()
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"알 수 없는 시간대입니다: {tz_name!r}")
+
+def bucket_start(d, granularity):
+    """ 날짜가 속한 구간의 시작일 (week: 월요일, month: 1일) """
+    if granularity == 'week':
+        return d - timedelta(days=d.weekday())
+    if granularity == 'month':
+        return d.replace(day=1)
+    return d
+
+def bucket_starts(start, end, granularity):
+    """ [start, end) 를 덮는 구간 시작일 목록 (첫 구간은 start 이전에서 시작할 수 있음) """
+    out = []
+    d = bucket_start(start, granularity)
+    while d < end:
+        out.append(d)
+        if granularity == 'day':
+            d += timedelta(days=1)
+        elif granularity == 'week':
+            d += timedelta(weeks=1)
+        else:
+            d = date(d.year + (d.month == 12), 1 if d.month == 12 else d.month + 1, 1)
+    return out
+
+def bucket_count(start, end, granularity):
+    """ 응답 크기 검사용 구간 수 (목록을 만들지 않고 계산) """
+    first = bucket_start(start, granularity)
+    last = bucket_start(end - timedelta(days=1), granularity)
+    if granularity == 'day':
+        return (last - first).days + 1
+    if granularity == 'week':
+        return (last - first).days // 7 + 1
+    return (last.year - first.year) * 12 + last.month - first.month + 1
+
+def bucket_series(by_bucket, start, end, granularity):
+    """
+    구간별 합계(by_bucket: {구간 시작일: {'income', 'spend', ...}}) -> 빈 구간은 0 으로 채운 시리즈
+
+    Returns:
+        dict: labels, income/spend/card/transfer/other/net 목록, cumIncome/cumSpend, totals
+    """
+    starts = bucket_starts(start, end, granularity)
+    zero = dict.fromkeys(FIELDS, 0)
+    series = {f: [int(by_bucket.get(b, zero)[f] or 0) for b in starts] for f in FIELDS}
+
+    if granularity == 'month':
+        labels = [f"{b:%Y-%m}" for b in starts]
+    else:
+        labels = [b.isoformat() for b in starts]
+
+    return {
+        'labels': labels,
+        **series,
+        'net': [i - s for i, s in zip(series['income'], series['spend'])],
+        'cumIncome': list(accumulate(series['income'])),
+        'cumSpend': list(accumulate(series['spend'])),
+        'totals': {f: sum(series[f]) for f in FIELDS},
+    }
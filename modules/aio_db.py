@@ -0,0 +1,113 @@
+"""
+비동기(ASGI) 서버용 DB 연결 (aiomysql)
+
+동기 앱의 modules/user.py 커넥션 풀과 같은 config.py 값(host, pool_* ...)을 쓰지만
+비동기 서버 전용 aiomysql 풀을 따로 만듭니다. (asgi.py 에서만 사용)
+"""
+import time
+import asyncio
+from contextlib import asynccontextmanager
+
+import aiomysql
+
+from . import config
+from . import metrics
+from . import storage
+
+_pool = None
+_pool_lock = None
+
+
+class TimedDictCursor(aiomysql.DictCursor):
+    """ 쿼리 시간/행 수를 metrics 에 기록하는 커서 (executemany 도 내부에서 execute 를 거침) """
+
+    async def execute(self, query, args=None):
+        started = time.perf_counter()
+        try:
+            return await super().execute(query, args)
+        finally:
+            metrics.record_query(query, time.perf_counter() - started, self.rowcount)
+
+
+async def get_pool():
+    """ 프로세스 전역 aiomysql 풀 (처음 호출할 때 현재 이벤트 루프에서 생성) """
+    global _pool, _pool_lock
+    if _pool is None:
+        if storage.is_sqlite():
+            raise RuntimeError("비동기 서버(asgi.py)는 storage_backend = 'mysql' 에서만 쓸 수 있습니다.")
+        if _pool_lock is None:
+            _pool_lock = asyncio.Lock()
+        async with _pool_lock:
+            if _pool is None:
+                try:
+                    _pool = await aiomysql.create_pool(
+                        host=config.host,
+                        port=config.port,
+                        user=config.user,
+                        password=config.passwd,
+                        db=config.db,
+                        charset='utf8mb4',
+                        cursorclass=TimedDictCursor if metrics.ENABLED else aiomysql.DictCursor,
+                        minsize=getattr(config, 'pool_min_size', 1),
+                        maxsize=getattr(config, 'pool_max_size', 10),
+                        # 이 시간(초) 이상 된 연결은 꺼낼 때 새로 만듦 (동기 풀의 idle_timeout 대응)
+                        pool_recycle=getattr(config, 'pool_idle_timeout', 300),
+                    )
+                except Exception as e:
+                    print(f"[AIO DB CONNECT ERROR] {type(e).__name__}: {e}")
+                    raise
+    return _pool
+
+
+async def close_pool():
+    """ 서버 종료 시 풀의 연결을 모두 닫음 """
+    global _pool
+    pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
+        await pool.wait_closed()
+
+
+@asynccontextmanager
+async def connection():
+    """
+    async with connection() as db: 형태로 풀에서 연결을 빌려 씀
+    반납 전에 rollback 해서 열린 트랜잭션을 다음 사용자에게 넘기지 않음 (동기 풀과 같음)
+    wait_timeout 안에 연결을 못 받으면 asyncio.TimeoutError
+    """
+    pool = await get_pool()
+    started = time.perf_counter()
+    conn = await asyncio.wait_for(pool.acquire(), getattr(config, 'pool_wait_timeout', 5))
+    if metrics.ENABLED:
+        metrics.observe('gagyabu_db_acquire_duration_seconds', time.perf_counter() - started)
+    try:
+        yield conn
+    finally:
+        try:
+            await conn.rollback()
+        except Exception as e:
+            # 끊어진 연결은 반납하지 않고 풀에서 뺌 (다음 acquire 때 새 연결을 만듦)
+            print(f"[AIO DB ROLLBACK ERROR] {type(e).__name__}: {e}")
+            await _discard(pool, conn)
+        else:
+            pool.release(conn)
+
+
+async def _discard(pool, conn):
+    """ 닫은 연결을 풀의 사용 중 목록에서 빼고, 연결을 기다리는 쪽을 깨움 (aiomysql 에 공개 API 가 없음) """
+    conn.close()
+    pool._used.discard(conn)
+    await pool._wakeup()
+
+
+def pool_stats():
+    """ 비동기 풀 상태 (아직 만들지 않았으면 None) """
+    if _pool is None:
+        return None
+    return {
+        'size': _pool.size,
+        'idle': _pool.freesize,
+        'in_use': _pool.size - _pool.freesize,
+        'min_size': _pool.minsize,
+        'max_size': _pool.maxsize,
+    }
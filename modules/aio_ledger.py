@@ -0,0 +1,255 @@
+"""
+modules/ledger.py 의 비동기 버전 (ASGI 서버 asgi.py 용)
+
+SQL 과 결과 가공 함수는 ledger.py 것을 그대로 쓰고, DB 접근만 aiomysql 로 바꿨습니다.
+"내역 있는 날짜" 캐시도 동기 앱과 같은 것을 공유합니다.
+통계 대시보드는 필요한 쿼리를 각자 다른 연결에서 asyncio.gather 로 동시에 실행합니다.
+"""
+import asyncio
+from datetime import date, timedelta
+
+from .aio_db import connection
+from . import ledger
+from . import summary
+from . import aggregate
+from . import metrics
+from . import recurring
+
+
+async def _fetchall(sql, params):
+    """ 풀에서 연결 하나를 빌려 SELECT 결과(dict 목록) 반환 """
+    async with connection() as db:
+        async with db.cursor() as cur:
+            await cur.execute(sql, params)
+            return await cur.fetchall()
+
+
+async def _apply_deltas(cursor, deltas):
+    """ summary.apply_deltas 의 비동기 버전 (호출자 트랜잭션 안에서 실행) """
+    rows, emptied = summary.delta_rows(deltas)
+    if rows:
+        await cursor.executemany(summary.UPSERT_SQL, rows)
+    if emptied:
+        await cursor.executemany(summary.DELETE_EMPTY_SQL, emptied)
+
+
+# --- 조회 ---
+
+@metrics.tracked
+async def select_transactions_by_date(user_id, date):
+    try:
+        return list(await _fetchall(ledger.SELECT_BY_DATE_SQL, (user_id, date)))
+    except Exception as e:
+        print(f"[SELECT BY DATE ERROR] {e}")
+        return []
+
+@metrics.tracked
+async def search_transactions(user_id, q=None, category=None, pay=None, min_amount=None, max_amount=None,
+                              after=None, limit=50):
+    """ (내역 검색) ledger.search_transactions 와 같음 """
+    ledger.check_search(q, min_amount, max_amount)
+    sql, params = ledger.search_query(user_id, q, category, pay, min_amount, max_amount, after, limit)
+    return ledger.split_page(await _fetchall(sql, params), limit)
+
+@metrics.tracked
+async def select_active_days_for_months(user_id, months):
+    """ ledger.select_active_days_for_months 와 같음 (캐시 공유) """
+    months = list(dict.fromkeys(months))[:ledger.ACTIVE_DAYS_MAX_MONTHS]
+    masks, missing, range_, token = ledger.active_days_cached(user_id, months)
+
+    if missing:
+        try:
+            rows = await _fetchall(ledger.ACTIVE_DAYS_SQL, (user_id,) + range_)
+            ledger.active_days_store(user_id, masks, missing, rows, token)
+        except Exception as e:
+            print(f"[ACTIVE DAYS ERROR] {e}")
+
+    return {ym: ledger._mask_to_dates(ym[0], ym[1], masks[ym]) if ym in masks else [] for ym in months}
+
+@metrics.tracked
+async def select_month_active_days(user_id, year, month):
+    return (await select_active_days_for_months(user_id, [(year, month)]))[(year, month)]
+
+@metrics.tracked
+async def select_ledger_initial(user_id, today):
+    """ (가계부 첫 화면) ledger.select_ledger_initial 과 같음 """
+    active, transactions = await asyncio.gather(
+        select_active_days_for_months(user_id, ledger.calendar_months(today)),
+        select_transactions_by_date(user_id, today),
+    )
+    return ledger.ledger_initial_payload(today, active, transactions)
+
+
+# --- 통계 ---
+# 동기 버전은 대시보드를 한 쿼리로 묶으므로, 쿼리를 나눠 동시에 실행할 때 쓰는 SQL 은 여기에 둠
+
+# (user_id, start, end) -> 날짜별 합계
+DAILY_TOTALS_SQL = """
+            SELECT d,""" + ledger._DAILY_COLUMNS + """
+            FROM ledger_summary
+            WHERE user_id = %s AND d >= %s AND d < %s
+            GROUP BY d
+            ORDER BY d
+        """
+
+# (user_id, start, end) -> 카테고리별 지출
+CATEGORY_SPEND_SQL = """
+            SELECT
+              COALESCE(NULLIF(category, ''), '기타') AS cat,
+              SUM(CASE WHEN type <> '입금' THEN amount ELSE 0 END) AS spend
+            FROM ledger_summary
+            WHERE user_id = %s
+              AND d >= %s AND d < %s
+            GROUP BY cat
+            HAVING spend > 0
+            ORDER BY spend DESC
+        """
+
+async def _daily_totals(user_id, start, end):
+    """ [start, end) 일별 합계 -> {date: row} """
+    rows = await _fetchall(DAILY_TOTALS_SQL, (user_id, start, end))
+    return {r['d']: r for r in rows}
+
+@metrics.tracked
+async def select_upcoming(user_id, year, month, today=None):
+    """ (반복 내역 예정 금액) recurring.select_upcoming 과 같음 """
+    bounds = recurring.upcoming_bounds(year, month, today or date.today())
+    if bounds is None:
+        return None
+    rules = await _fetchall(recurring.UPCOMING_RULES_SQL, (user_id, bounds[1]))
+    return recurring.upcoming_by_day(rules, *bounds)
+
+@metrics.tracked
+async def select_month_category_spend(user_id, start, end):
+    """ (카테고리 통계) """
+    rows = await _fetchall(CATEGORY_SPEND_SQL, (user_id, start, end))
+    return ledger._category_breakdown((r['cat'], r['spend']) for r in rows)
+
+@metrics.tracked
+async def select_recent_weeks(user_id, n_weeks, offset=0, today=None):
+    """ (주간 통계) ledger.select_recent_weeks 와 같음 """
+    monday, start, end = ledger.weekly_window(today or date.today(), n_weeks, offset)
+    try:
+        rows = await _fetchall(ledger.RANGE_TOTALS_SQL['week'], (user_id, start, end))
+    except Exception as e:
+        print(f"[STATS WEEKLY ERROR] {e}")
+        return {"labels": [], "net": []}
+    return ledger._weekly_net({r['bucket']: r for r in rows}, monday, n_weeks)
+
+@metrics.tracked
+async def select_range_stats(user_id, start, end, granularity='day'):
+    """ (기간 통계) ledger.select_range_stats 와 같음 """
+    ledger.check_range(start, end, granularity)
+    rows = await _fetchall(ledger.RANGE_TOTALS_SQL[granularity], (user_id, start, end))
+    return {
+        'from': start.isoformat(),
+        'to': (end - timedelta(days=1)).isoformat(),
+        'granularity': granularity,
+        **aggregate.bucket_series({r['bucket']: r for r in rows}, start, end, granularity),
+    }
+
+@metrics.tracked
+async def select_spending_advice(user_id, today=None):
+    """ (지출 조언) """
+    rows = await _fetchall(ledger.ADVICE_TOTALS_SQL, ledger.advice_params(user_id, today or date.today()))
+    return ledger.advice_from_totals(rows)
+
+@metrics.tracked
+async def select_month_dashboard(user_id, year, month, n_weeks=10, today=None, upcoming=None):
+    """
+    ledger.select_month_dashboard 와 같은 응답
+    동기 버전은 한 쿼리로 묶지만, 여기서는 월간/카테고리/주간/조언 쿼리를 동시에 실행합니다.
+    """
+    today = today or date.today()
+    start, end, days = ledger._month_bounds(year, month)
+    py, pm = ledger._prev_month(year, month)
+    prev_start, _, prev_days = ledger._month_bounds(py, pm)
+
+    by_day, categories, weekly, advice = await asyncio.gather(
+        _daily_totals(user_id, prev_start, end),
+        select_month_category_spend(user_id, start, end),
+        select_recent_weeks(user_id, n_weeks, today=today),
+        select_spending_advice(user_id, today),
+    )
+
+    return {
+        'year': year,
+        'month': month,
+        'monthly': ledger._daily_series(by_day, year, month, days, upcoming),
+        'prevMonthly': ledger._daily_series(by_day, py, pm, prev_days),
+        'categories': categories,
+        'weekly': weekly,
+        'advice': advice,
+    }
+
+
+# --- CRUD ---
+
+@metrics.tracked
+async def insert_transaction(user_id, date, transaction_type, desc, amount, category, pay):
+    """ 내역 추가 후 새 행의 id 반환 """
+    amount = summary.to_amount(amount)
+    category = category or None
+    pay = ledger.pay_for(transaction_type, pay)
+    async with connection() as db:
+        try:
+            async with db.cursor() as cursor:
+                await cursor.execute(ledger.INSERT_SQL,
+                                     (user_id, date, transaction_type, desc, amount, category, pay))
+                await _apply_deltas(cursor, [
+                    (user_id, date, transaction_type, category, pay, amount, 1),
+                ])
+                new_id = cursor.lastrowid
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+    ledger.invalidate_caches(user_id, date)
+    return new_id
+
+@metrics.tracked
+async def delete_transaction_by_id(transaction_id, user_id):
+    """ 내역 삭제 후 삭제된 행의 날짜 반환 (없는 id면 None) """
+    async with connection() as db:
+        try:
+            async with db.cursor() as cursor:
+                await cursor.execute(ledger.LOCK_ROW_SQL, (transaction_id, user_id))
+                old = await cursor.fetchone()
+                if old is None:
+                    return None
+                await cursor.execute(ledger.DELETE_SQL, (transaction_id, user_id))
+                await _apply_deltas(cursor, [
+                    (user_id, old['date'], old['type'], old['category'], old['pay'],
+                     -summary.to_amount(old['amount']), -1),
+                ])
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+    ledger.invalidate_caches(user_id, old['date'])
+    return old['date']
+
+@metrics.tracked
+async def update_transaction(trans_id, user_id, date, type, desc, amount):
+    """ 내역 수정, 수정했으면 True (없는 id면 False) """
+    amount = summary.to_amount(amount)
+    async with connection() as db:
+        try:
+            async with db.cursor() as cursor:
+                await cursor.execute(ledger.LOCK_ROW_SQL, (trans_id, user_id))
+                old = await cursor.fetchone()
+                if old is None:
+                    return False
+                pay = ledger.pay_for(type, old['pay'])
+                await cursor.execute(ledger.UPDATE_SQL, (date, type, desc, amount, pay, trans_id, user_id))
+                await _apply_deltas(cursor, [
+                    (user_id, old['date'], old['type'], old['category'], old['pay'],
+                     -summary.to_amount(old['amount']), -1),
+                    (user_id, date, type, old['category'], pay, amount, 1),
+                ])
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+    ledger.invalidate_caches(user_id, old['date'], date)
+    return True
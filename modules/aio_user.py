@@ -0,0 +1,75 @@
+"""
+modules/user.py 의 비동기 버전 (ASGI 서버 asgi.py 용)
+"""
+import pymysql
+
+from .aio_db import connection
+from . import passwords
+from . import user
+
+
+async def select_user_info(id, pw):
+    """ user.select_user_info 와 같음 (해시 비교/갱신은 작업 풀에서, 이벤트 루프는 막지 않음) """
+    async with connection() as db:
+        async with db.cursor() as cur:
+            await cur.execute("SELECT * FROM user WHERE id=%s", (id,))
+            row = await cur.fetchone()
+    ok, rehash = await passwords.verify_password_async(pw, row.pop('password') if row else None)
+    if not ok:
+        return None
+    if rehash:
+        hashed = await passwords.hash_password_async(pw)
+        try:
+            async with connection() as db:
+                async with db.cursor() as cur:
+                    await cur.execute("UPDATE user SET password=%s WHERE id=%s", (hashed, id))
+                await db.commit()
+        except Exception as e:
+            print(f"[DB REHASH ERROR] {type(e).__name__}: {e}")
+    return user.cache_user(row)
+
+async def get_user(id):
+    """ user.get_user 와 같음 (캐시 공유) """
+    if not id:
+        return None
+    row = user.cached_user(id)
+    if row is not None:
+        return row
+
+    async with connection() as db:
+        async with db.cursor() as cur:
+            await cur.execute("SELECT id, user_name FROM user WHERE id=%s", (id,))
+            row = await cur.fetchone()
+    return user.cache_user(row) if row else None
+
+async def check_user_exists(id):
+    """ ID 중복 여부를 확인합니다. """
+    return await get_user(id) is not None
+
+async def create_user(user_name, id, password):
+    """
+    새로운 사용자를 DB에 등록합니다. (user.create_user 와 같이 INSERT 한 번, 중복은 1062 로 판단)
+
+    Returns:
+        tuple: (성공 여부 bool, 이유 str)
+    """
+    hashed = await passwords.hash_password_async(password)
+
+    async with connection() as db:
+        try:
+            async with db.cursor() as cur:
+                await cur.execute("INSERT INTO user (user_name, id, password) VALUES (%s, %s, %s)",
+                                  (user_name, id, hashed))
+            await db.commit()
+            user.invalidate_user(id)
+            return True, ""
+        except pymysql.err.IntegrityError as e:
+            await db.rollback()
+            if e.args and e.args[0] == user.DUP_ENTRY:
+                return False, "duplicate_id"
+            print(f"[DB INSERT ERROR] {type(e).__name__}: {e}")
+            return False, "db_error"
+        except Exception as e:
+            print(f"[DB INSERT ERROR] {type(e).__name__}: {e}")
+            await db.rollback()
+            return False, "db_error"
@@ -0,0 +1,351 @@
+"""
+정적 파일(static/) 빌드: 축소 + 내용 해시 파일명 + 미리 압축
+
+    python -m modules.assets build    # static/dist/ 에 새 빌드 추가 + manifest 교체 (배포할 때마다 실행)
+    python -m modules.assets prune    # 현재 manifest 에 없는 옛 빌드 파일 삭제 (옛 서버를 모두 내린 뒤)
+    python -m modules.assets clean    # static/dist/ 삭제 (원본 파일을 그대로 서비스)
+
+static/js, static/css 의 파일을 축소해서 static/dist/js/ledger.<해시>.js 처럼 내용 해시가 붙은 이름으로 저장하고,
+같은 자리에 .gz (그리고 brotli 패키지가 있으면 .br) 를 미리 만들어 둡니다.
+원본 이름 -> 해시 이름 목록은 static/dist/manifest.json 에 기록합니다.
+
+템플릿은 url_for('static', ...) 대신 asset_url('js/ledger.js') 를 쓰며,
+manifest 에 있으면 /static/dist/... (1년 캐시 + immutable), 없으면 원본 /static/... 주소가 됩니다.
+내용이 바뀌면 파일 이름이 바뀌므로 브라우저가 재검증 없이 캐시를 계속 써도 됩니다.
+build 는 옛 해시 파일을 지우지 않으므로 아직 옛 manifest 를 쓰는 서버가 있어도 그 파일을 계속 줄 수 있습니다.
+
+축소는 주석/들여쓰기/빈 줄/연속 공백만 지우는 보수적인 방식입니다.
+(JS 는 줄바꿈을 남겨 세미콜론 자동 삽입에 영향을 주지 않고, CSS 의 따옴표 문자열과 url() 경로는 바꾸지 않음)
+"""
+import os
+import re
+import sys
+import gzip
+import json
+import shutil
+import hashlib
+import argparse
+import mimetypes
+
+from . import config
+
+try:
+    import brotli
+except ImportError:  # brotli 는 선택 사항 (없으면 .gz 만 만듦)
+    brotli = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATIC_DIR = os.path.join(ROOT, 'static')
+DIST_DIR = os.path.join(STATIC_DIR, 'dist')
+MANIFEST_PATH = os.path.join(DIST_DIR, 'manifest.json')
+
+USE_BUILD = getattr(config, 'assets_use_build', True)   # False 면 빌드가 있어도 원본을 서비스 (개발용)
+MAX_AGE = 365 * 24 * 3600
+CACHE_CONTROL = f'public, max-age={MAX_AGE}, immutable'
+
+BUILD_EXTENSIONS = ('.js', '.css')
+HASH_LENGTH = 10
+
+# (Content-Encoding, 파일 확장자) - 앞에 있는 것을 먼저 고름
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+# ---------------- 축소 ----------------
+
+_CSS_STRING = r'"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\''
+_CSS_COMMENT_RE = re.compile(r'(' + _CSS_STRING + r')|/\*.*?\*/', re.DOTALL)
+_CSS_STRING_RE = re.compile(r'(' + _CSS_STRING + r')')
+_CSS_SPACE_RE = re.compile(r'\s+')
+_CSS_PUNCT_RE = re.compile(r'\s*([{};,>])\s*')
+
+def _minify_css_code(text):
+    text = _CSS_SPACE_RE.sub(' ', text)
+    text = _CSS_PUNCT_RE.sub(r'\1', text)
+    return text.replace(';}', '}')
+
+def minify_css(text):
+    """ 주석/공백 정리 (따옴표 문자열 안은 content: " , " 처럼 그대로 둠) """
+    text = _CSS_COMMENT_RE.sub(lambda m: m.group(1) or '', text)
+    # split 의 홀수 번째 조각이 문자열
+    parts = _CSS_STRING_RE.split(text)
+    return ''.join(part if i % 2 else _minify_css_code(part) for i, part in enumerate(parts)).strip()
+
+
+# 이 문자나 단어 뒤의 '/' 는 나눗셈이 아니라 정규식의 시작
+_REGEX_AFTER = set('(,=:[!&|?{};+-*%<>~^')
+_REGEX_AFTER_WORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new',
+                      'delete', 'void', 'throw', 'yield', 'await'}
+_WORD_END_RE = re.compile(r'[\w$]+$')
+
+def _skip_string(text, i):
+    quote = text[i]
+    i += 1
+    while i < len(text) and text[i] not in (quote, '\n'):
+        i += 2 if text[i] == '\\' else 1
+    return i + 1
+
+def _skip_regex(text, i):
+    i += 1
+    in_class = False
+    while i < len(text) and text[i] != '\n':
+        c = text[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == '[':
+            in_class = True
+        elif c == ']':
+            in_class = False
+        elif c == '/' and not in_class:
+            i += 1
+            break
+        i += 1
+    while i < len(text) and text[i].isalpha():   # 플래그 (g, i, m ...)
+        i += 1
+    return i
+
+def _regex_allowed(out):
+    tail = ''.join(out[-8:]).rstrip()
+    if not tail or tail[-1] in _REGEX_AFTER:
+        return True
+    word = _WORD_END_RE.search(tail)
+    return bool(word) and word.group() in _REGEX_AFTER_WORDS
+
+def _emit_space(out, newline):
+    """ 공백/주석 자리: 줄바꿈이 있었으면 '\\n' 하나, 아니면 ' ' 하나 (줄 앞뒤 공백, 빈 줄은 버림) """
+    if newline:
+        if out and out[-1] == ' ':
+            out.pop()
+        if out and out[-1] != '\n':
+            out.append('\n')
+    elif out and out[-1] not in (' ', '\n'):
+        out.append(' ')
+
+def _js_code(text, i, out, in_template=False):
+    """ 코드 구간을 out 에 옮김. in_template 이면 ${ ... } 를 닫는 '}' 위치에서 멈춤 """
+    n = len(text)
+    depth = 0
+    while i < n:
+        c = text[i]
+        nxt = text[i + 1] if i + 1 < n else ''
+        if c in '\'"':
+            j = _skip_string(text, i)
+            out.append(text[i:j])
+            i = j
+        elif c == '`':
+            i = _js_template(text, i, out)
+        elif c == '/' and nxt == '/':
+            j = text.find('\n', i)
+            i = n if j < 0 else j
+        elif c == '/' and nxt == '*':
+            j = text.find('*/', i + 2)
+            j = n if j < 0 else j + 2
+            _emit_space(out, '\n' in text[i:j])
+            i = j
+        elif c == '/' and _regex_allowed(out):
+            j = _skip_regex(text, i)
+            out.append(text[i:j])
+            i = j
+        elif c.isspace():
+            j = i
+            while j < n and text[j].isspace():
+                j += 1
+            _emit_space(out, '\n' in text[i:j])
+            i = j
+        else:
+            if in_template:
+                if c == '{':
+                    depth += 1
+                elif c == '}':
+                    if depth == 0:
+                        return i
+                    depth -= 1
+            out.append(c)
+            i += 1
+    return i
+
+def _js_template(text, i, out):
+    """ 템플릿 리터럴은 글자 그대로 두고 ${ ... } 안만 코드로 처리 """
+    out.append('`')
+    i += 1
+    while i < len(text):
+        c = text[i]
+        if c == '\\':
+            out.append(text[i:i + 2])
+            i += 2
+        elif c == '`':
+            out.append('`')
+            return i + 1
+        elif text.startswith('${', i):
+            out.append('${')
+            i = _js_code(text, i + 2, out, in_template=True)
+            out.append('}')
+            i += 1
+        else:
+            out.append(c)
+            i += 1
+    return i
+
+def minify_js(text):
+    out = []
+    _js_code(text, 0, out)
+    return ''.join(out).strip() + '\n'
+
+MINIFIERS = {'.js': minify_js, '.css': minify_css}
+
+
+# ---------------- 빌드 ----------------
+
+def _source_files():
+    """ static/ 아래 빌드할 파일 (static/dist 제외), static 기준 상대 경로 """
+    for base, dirs, files in os.walk(STATIC_DIR):
+        dirs[:] = sorted(d for d in dirs if os.path.join(base, d) != DIST_DIR)
+        for name in sorted(files):
+            if name.endswith(BUILD_EXTENSIONS):
+                yield os.path.relpath(os.path.join(base, name), STATIC_DIR).replace(os.sep, '/')
+
+def hashed_name(path, data):
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:HASH_LENGTH]}{ext}"
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+def build():
+    """
+    static/dist 에 새 해시 파일을 쓰고 manifest 를 교체
+    옛 해시 파일은 그대로 두므로 실행 중인 서버가 읽어 둔 옛 manifest 도 계속 동작함 (prune 으로 정리)
+
+    Returns:
+        list: [(원본 경로, 해시 경로, 원본 크기, 축소 크기, gzip 크기, brotli 크기 또는 None)]
+    """
+    global _manifest
+    entries, report = {}, []
+    for path in _source_files():
+        with open(os.path.join(STATIC_DIR, path), encoding='utf-8') as f:
+            source = f.read()
+        data = MINIFIERS[os.path.splitext(path)[1]](source).encode('utf-8')
+        name = hashed_name(path, data)
+        target = os.path.join(DIST_DIR, name)
+        _write(target, data)
+
+        # mtime=0: 같은 내용이면 압축 결과도 매번 같음
+        gz = gzip.compress(data, compresslevel=9, mtime=0)
+        _write(target + '.gz', gz)
+        br = brotli.compress(data, quality=11) if brotli else None
+        if br is not None:
+            _write(target + '.br', br)
+
+        entries[path] = name
+        report.append((path, name, len(source.encode('utf-8')), len(data), len(gz), br and len(br)))
+
+    # 새 파일을 모두 쓴 뒤 manifest 를 한 번에 바꿈 (읽는 쪽이 반쯤 쓴 manifest 를 보지 않게)
+    tmp_path = MANIFEST_PATH + '.tmp'
+    _write(tmp_path, json.dumps(entries, ensure_ascii=False, indent=2, sort_keys=True).encode('utf-8'))
+    os.replace(tmp_path, MANIFEST_PATH)
+    _manifest = None
+    return report
+
+def prune():
+    """
+    현재 manifest 에 없는 빌드 파일(과 .gz/.br) 삭제
+    옛 manifest 를 읽은 서버가 남아 있으면 그 파일이 404 가 되므로 모든 서버를 다시 시작한 뒤 실행
+
+    Returns:
+        list: 지운 파일 (static/dist 기준 경로)
+    """
+    if not os.path.exists(MANIFEST_PATH):
+        return []
+    with open(MANIFEST_PATH, encoding='utf-8') as f:
+        keep = set(json.load(f).values())
+    removed = []
+    for base, dirs, files in os.walk(DIST_DIR):
+        for name in sorted(files):
+            path = os.path.relpath(os.path.join(base, name), DIST_DIR).replace(os.sep, '/')
+            if path == 'manifest.json':
+                continue
+            stem = path
+            for _, suffix in ENCODINGS:
+                if stem.endswith(suffix):
+                    stem = stem[:-len(suffix)]
+            if stem not in keep:
+                os.remove(os.path.join(base, name))
+                removed.append(path)
+    return removed
+
+def clean():
+    global _manifest
+    if os.path.isdir(DIST_DIR):
+        shutil.rmtree(DIST_DIR)
+    _manifest = None
+
+
+# ---------------- 서비스 (app.py / asgi.py) ----------------
+
+_manifest = None
+
+def manifest():
+    """ 원본 경로 -> 해시 경로 (처음 한 번 읽음, 빌드가 없으면 빈 dict) """
+    global _manifest
+    if _manifest is None:
+        loaded = {}
+        if USE_BUILD and os.path.exists(MANIFEST_PATH):
+            try:
+                with open(MANIFEST_PATH, encoding='utf-8') as f:
+                    loaded = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"[ASSET MANIFEST ERROR] {type(e).__name__}: {e}")
+        _manifest = loaded
+    return _manifest
+
+def built_path(filename):
+    """ 빌드된 파일이 있으면 static/dist 기준 해시 경로, 없으면 None """
+    return manifest().get(filename)
+
+def negotiate(filename, accept_encodings):
+    """
+    브라우저가 받을 수 있는 미리 압축된 파일 고르기
+
+    Args:
+        accept_encodings: request.accept_encodings (인코딩 이름 -> 품질값)
+
+    Returns:
+        tuple: (static/dist 기준 보낼 파일, Content-Encoding 또는 None)
+    """
+    for encoding, suffix in ENCODINGS:
+        if accept_encodings[encoding] and os.path.isfile(os.path.join(DIST_DIR, filename + suffix)):
+            return filename + suffix, encoding
+    return filename, None
+
+def mimetype(filename):
+    return mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m modules.assets", description="정적 파일 빌드")
+    parser.add_argument("command", choices=["build", "prune", "clean"])
+    args = parser.parse_args(argv)
+
+    if args.command == "clean":
+        clean()
+        print("static/dist 삭제 완료")
+        return 0
+    if args.command == "prune":
+        removed = prune()
+        for path in removed:
+            print(f"삭제: dist/{path}")
+        print(f"옛 빌드 파일 {len(removed)}개 삭제")
+        return 0
+
+    if brotli is None:
+        print("brotli 패키지가 없어 .br 파일은 만들지 않습니다. (pip install brotli)")
+    for path, name, size, minified, gz, br in build():
+        print(f"{path:<24} -> dist/{name:<36} {size:>7} -> {minified:>7} B  gzip {gz:>6} B"
+              + (f"  br {br:>6} B" if br is not None else ''))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,270 @@
+"""
+통계 API 응답 캐시
+
+응답 본문을 (사용자, 기간, 파라미터) 키로 저장합니다. 키에는 그 기간에 속한 달들의
+"버전 번호"가 들어가고, 내역을 추가/수정/삭제하면 해당 날짜가 속한 달의 버전만 올립니다.
+그래서 지난달 통계는 이번 달에 내역을 써도 그대로 캐시에서 나갑니다.
+
+ETag 는 응답 본문의 해시라서 서버를 재시작하거나 캐시가 비워져도 내용이 같으면 그대로 맞습니다.
+
+저장소:
+    - MemoryCache : 프로세스 안 LRU + TTL (기본, 워커 사이에 공유되지 않아 TTL 을 짧게 둠)
+    - RedisCache  : 여러 워커/서버가 공유 (config.stats_cache_redis_url 설정 시, redis 패키지 필요)
+                    get/set/incr/mget 만 쓰므로 같은 메서드를 가진 객체로 바꿔 끼울 수 있음
+"""
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import date, timedelta
+
+from . import config
+
+
+class MemoryCache:
+    """
+    스레드 안전한 LRU + TTL 캐시
+
+    버전 번호도 LRU 로 max_versions 개까지만 보관합니다. 번호는 모든 이름이 같이 쓰는 증가값에서
+    받으므로, 밀려난 이름은 다음에 한 번도 쓰지 않은 새 번호로 시작해 옛 캐시 항목과 섞이지 않습니다.
+
+    Args:
+        max_size (int): 최대 항목 수 (넘으면 가장 오래 안 쓴 것부터 버림)
+        ttl (float): 항목 유효 시간(초)
+        max_versions (int): 보관할 버전 번호 수 (기본 max_size 의 16배)
+    """
+
+    def __init__(self, max_size=1024, ttl=600, max_versions=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.max_versions = max_versions or max_size * 16
+        self._items = OrderedDict()   # key -> (value, 저장 시각)
+        self._versions = OrderedDict()  # 이름 -> 버전 번호 (LRU)
+        self._last_version = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None or time.monotonic() - entry[1] > self.ttl:
+                if entry is not None:
+                    del self._items[key]
+                self._misses += 1
+                return None
+            self._items.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def set(self, key, value):
+        with self._lock:
+            self._items[key] = (value, time.monotonic())
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def _new_version(self, name):
+        """ 한 번도 쓰지 않은 번호를 name 에 붙임 (lock 안에서 호출) """
+        self._last_version += 1
+        self._versions[name] = self._last_version
+        self._versions.move_to_end(name)
+        while len(self._versions) > self.max_versions:
+            self._versions.popitem(last=False)
+        return self._last_version
+
+    def versions(self, names):
+        with self._lock:
+            out = []
+            for n in names:
+                v = self._versions.get(n)
+                if v is None:
+                    v = self._new_version(n)  # 처음 보거나 밀려난 이름은 새 버전
+                else:
+                    self._versions.move_to_end(n)
+                out.append(v)
+            return out
+
+    def bump(self, names):
+        with self._lock:
+            for n in names:
+                self._new_version(n)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'backend': 'memory', 'size': len(self._items), 'max_size': self.max_size,
+                    'versions': len(self._versions), 'ttl': self.ttl, 'hits': self._hits, 'misses': self._misses}
+
+
+class RedisCache:
+    """
+    Redis(호환) 저장소. 버전 번호는 만료 없이 INCR, 응답은 ttl 초 뒤 만료
+
+    Args:
+        client: redis.Redis 처럼 get/set(ex=)/incr/mget 을 가진 객체
+    """
+
+    def __init__(self, client, ttl=600, prefix='gagyabu:stats:'):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key, value):
+        self.client.set(self.prefix + key, json.dumps(value, ensure_ascii=False), ex=int(self.ttl))
+
+    def versions(self, names):
+        if not names:
+            return []
+        raw = self.client.mget([self.prefix + 'v:' + n for n in names])
+        return [int(v or 0) for v in raw]
+
+    def bump(self, names):
+        for n in names:
+            self.client.incr(self.prefix + 'v:' + n)
+
+    def clear(self):
+        pass  # 버전 번호가 바뀌면 옛 항목은 더 이상 읽히지 않고 ttl 뒤 사라짐
+
+    def stats(self):
+        return {'backend': 'redis', 'ttl': self.ttl}
+
+
+# stats_cache_ttl 이 없을 때 기본값(초)
+# 프로세스 캐시는 버전 번호도 워커마다 따로라서, 다른 워커가 쓴 내역은 만료될 때까지 반영되지 않음
+MEMORY_TTL = 30
+REDIS_TTL = 600
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_cache():
+    """ 프로세스 전역 캐시 (config.py 의 stats_cache_* 값으로 생성) """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                ttl = getattr(config, 'stats_cache_ttl', None)
+                url = getattr(config, 'stats_cache_redis_url', None)
+                if url:
+                    import redis
+                    _cache = RedisCache(redis.Redis.from_url(url), ttl=ttl or REDIS_TTL)
+                else:
+                    _cache = MemoryCache(getattr(config, 'stats_cache_size', 1024), ttl or MEMORY_TTL)
+    return _cache
+
+def set_cache(cache):
+    """ 저장소 교체 (예: RedisCache(로컬 대체 클라이언트)) """
+    global _cache
+    _cache = cache
+
+
+# --- 버전 번호 ---
+
+def _to_date(d):
+    return date.fromisoformat(str(d)[:10]) if not isinstance(d, date) else d
+
+def months_between(start, end):
+    """ [start, end) 구간이 걸친 (year, month) 목록 """
+    start, end = _to_date(start), _to_date(end)
+    y, m = start.year, start.month
+    out = []
+    while date(y, m, 1) < end:
+        out.append((y, m))
+        y, m = (y + 1, 1) if m == 12 else (y, m + 1)
+    return out
+
+def recent_weeks_months(today, n, offset=0):
+    """ 오늘 기준 최근 n주(offset 페이지만큼 과거, 주간 통계)가 걸친 (year, month) 목록 """
+    monday = today - timedelta(days=today.weekday()) - timedelta(weeks=n * offset)
+    return months_between(monday - timedelta(weeks=n - 1), monday + timedelta(days=7))
+
+def advice_months(today):
+    """ 지출 조언이 읽는 지난달/이번달 """
+    last = date(today.year - (today.month == 1), 12 if today.month == 1 else today.month - 1, 1)
+    return [(last.year, last.month), (today.year, today.month)]
+
+def dashboard_months(year, month, today, n):
+    """ 통계 대시보드가 읽는 달: 선택한 달과 그 전달 + 최근 n주 + 지출 조언 """
+    prev = (year - 1, 12) if month == 1 else (year, month - 1)
+    return [prev, (year, month)] + recent_weeks_months(today, n) + advice_months(today)
+
+def _version_names(user_id, months):
+    return [f"{user_id}:{y:04d}-{m:02d}" for y, m in months]
+
+def bump_dates(user_id, *dates):
+    """ 쓰기 후 해당 날짜가 속한 달의 버전을 올려 그 달이 포함된 캐시 응답을 무효화 """
+    months = {(d.year, d.month) for d in map(_to_date, filter(None, dates))}
+    if months:
+        try:
+            get_cache().bump(_version_names(user_id, sorted(months)))
+        except Exception as e:
+            print(f"[STATS CACHE ERROR] {type(e).__name__}: {e}")
+
+
+# --- 응답 캐시 ---
+
+def make_key(name, user_id, months, params):
+    """ 기간에 걸친 달들의 현재 버전을 넣은 캐시 키 """
+    months = sorted(set(months))
+    versions = get_cache().versions(_version_names(user_id, months))
+    ver = ",".join(f"{y:04d}{m:02d}.{v}" for (y, m), v in zip(months, versions))
+    return f"{name}:{user_id}:{ver}:{json.dumps(params, sort_keys=True, default=str)}"
+
+def make_entry(body):
+    """ 응답 본문 -> [etag(따옴표 없이), body] """
+    return [hashlib.sha1(body.encode('utf-8')).hexdigest()[:20], body]
+
+def get_or_compute(name, user_id, months, params, compute, dumps):
+    """
+    캐시에 있으면 그대로, 없으면 compute() 결과를 dumps 로 직렬화해 저장
+
+    Returns:
+        list: [etag, body]
+    """
+    try:
+        key = make_key(name, user_id, months, params)
+        entry = get_cache().get(key)
+    except Exception as e:
+        # 캐시 저장소 장애 시에도 통계는 DB 에서 계산해서 응답
+        print(f"[STATS CACHE ERROR] {type(e).__name__}: {e}")
+        return make_entry(dumps(compute()))
+
+    if entry is None:
+        data = compute()
+        entry = make_entry(dumps(data))
+        if not data:
+            return entry  # 빈 결과(조회 오류 시 {})는 저장하지 않음
+        try:
+            get_cache().set(key, entry)
+        except Exception as e:
+            print(f"[STATS CACHE ERROR] {type(e).__name__}: {e}")
+    return entry
+
+async def get_or_compute_async(name, user_id, months, params, compute, dumps):
+    """ get_or_compute 의 비동기 버전 (compute 는 코루틴 함수, asgi.py 용) """
+    try:
+        key = make_key(name, user_id, months, params)
+        entry = get_cache().get(key)
+    except Exception as e:
+        print(f"[STATS CACHE ERROR] {type(e).__name__}: {e}")
+        return make_entry(dumps(await compute()))
+
+    if entry is None:
+        data = await compute()
+        entry = make_entry(dumps(data))
+        if not data:
+            return entry
+        try:
+            get_cache().set(key, entry)
+        except Exception as e:
+            print(f"[STATS CACHE ERROR] {type(e).__name__}: {e}")
+    return entry
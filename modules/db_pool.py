@@ -0,0 +1,236 @@
+import threading
+import time
+from collections import deque
+
+import pymysql
+
+
+class PoolTimeoutError(Exception):
+    """ 풀이 가득 차서 wait_timeout 안에 연결을 받지 못했을 때 발생 """
+
+
+class PooledConnection:
+    """
+    pymysql 연결을 감싸는 객체.
+    기존 코드처럼 db.close()를 호출하면 실제로 끊지 않고 풀에 반납합니다.
+    그 외 속성(cursor, commit, rollback ...)은 원래 연결로 그대로 넘깁니다.
+    """
+
+    def __init__(self, pool, conn):
+        self._pool = pool
+        self._conn = conn
+
+    def __getattr__(self, name):
+        conn = self.__dict__.get('_conn')
+        if conn is None:
+            raise pymysql.err.InterfaceError(0, "이미 풀에 반납된 연결입니다.")
+        return getattr(conn, name)
+
+    def cursor(self, *args, **kwargs):
+        """ 원래 연결의 cursor(), 풀에 cursor_wrapper 가 있으면 감싸서 반환 """
+        cur = self.__getattr__('cursor')(*args, **kwargs)
+        wrapper = self._pool.cursor_wrapper
+        return wrapper(cur) if wrapper is not None else cur
+
+    def close(self):
+        """ 연결을 풀에 반납 (여러 번 호출해도 안전) """
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            self._pool._release(conn)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ConnectionPool:
+    """
+    스레드 안전한 고정 상한(bounded) 커넥션 풀.
+
+    Args:
+        connect (callable): 새 pymysql 연결을 만드는 함수
+        min_size (int): 유휴 상태여도 닫지 않고 유지할 연결 수
+        max_size (int): 동시에 열 수 있는 최대 연결 수
+        idle_timeout (float): 이 시간(초) 이상 놀고 있는 연결은 닫음 (min_size 초과분만)
+        wait_timeout (float): 풀이 가득 찼을 때 반납을 기다리는 최대 시간(초)
+        ping_interval (float): 이 시간(초) 이상 쉬었던 연결은 꺼내기 전에 ping으로 점검
+        cursor_wrapper (callable|None): db.cursor() 결과를 감쌀 함수 (쿼리 계측용)
+    """
+
+    def __init__(self, connect, min_size=1, max_size=10, idle_timeout=300,
+                 wait_timeout=5, ping_interval=30, cursor_wrapper=None):
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError("0 <= min_size <= max_size, max_size >= 1 이어야 합니다.")
+
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.wait_timeout = wait_timeout
+        self.ping_interval = ping_interval
+        self.cursor_wrapper = cursor_wrapper
+
+        self._idle = deque()          # (conn, 마지막 반납 시각)
+        self._size = 0                # 현재 열려 있는 연결 수 (대여중 + 유휴)
+        self._cond = threading.Condition()
+        self._closed = False
+
+        # 런타임 카운터
+        self._hits = 0        # 유휴 연결 재사용
+        self._misses = 0      # 새 연결 생성
+        self._waits = 0       # 풀이 가득 차서 기다린 횟수
+        self._timeouts = 0    # 기다리다 실패한 횟수
+        self._discarded = 0   # ping 실패/유휴 만료로 버린 연결 수
+        self._wait_seconds = 0.0
+
+    # ---------------- 대여 / 반납 ----------------
+
+    def acquire(self):
+        """ 풀에서 연결을 하나 꺼냅니다. (PooledConnection 반환) """
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            conn, last_used = self._checkout(deadline)
+
+            if conn is None:
+                # 자리를 예약해 둔 상태이므로 락 밖에서 새 연결 생성
+                try:
+                    conn = self._connect()
+                except Exception:
+                    self._forget()
+                    raise
+                return PooledConnection(self, conn)
+
+            if time.monotonic() - last_used < self.ping_interval:
+                return PooledConnection(self, conn)
+
+            # 오래 쉬었던 연결은 살아있는지 확인 (끊겼으면 버리고 다시 시도)
+            try:
+                conn.ping(reconnect=False)
+                return PooledConnection(self, conn)
+            except Exception:
+                self._close_quietly(conn)
+                self._forget(discarded=True)
+
+    def _checkout(self, deadline):
+        """
+        유휴 연결이 있으면 (conn, last_used)를, 새로 만들 자리만 예약했으면 (None, 0)을 반환.
+        """
+        expired = []
+        try:
+            with self._cond:
+                waited = False
+                while True:
+                    if self._closed:
+                        raise pymysql.err.InterfaceError(0, "커넥션 풀이 닫혔습니다.")
+
+                    expired.extend(self._prune_idle())
+
+                    if self._idle:
+                        conn, last_used = self._idle.pop()  # LIFO: 가장 최근에 쓴 연결부터
+                        self._hits += 1
+                        return conn, last_used
+
+                    if self._size < self.max_size:
+                        self._size += 1
+                        self._misses += 1
+                        return None, 0
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeoutError(
+                            f"{self.wait_timeout}초 안에 DB 연결을 얻지 못했습니다. "
+                            f"(max_size={self.max_size})"
+                        )
+                    if not waited:
+                        self._waits += 1
+                        waited = True
+                    started = time.monotonic()
+                    self._cond.wait(remaining)
+                    self._wait_seconds += time.monotonic() - started
+        finally:
+            for conn in expired:
+                self._close_quietly(conn)
+
+    def _release(self, conn):
+        """ PooledConnection.close()에서 호출됨 """
+        try:
+            # 열린 트랜잭션(및 REPEATABLE READ 스냅샷)을 끝내서 다음 사용자가 최신 데이터를 보게 함
+            conn.rollback()
+        except Exception:
+            self._close_quietly(conn)
+            self._forget(discarded=True)
+            return
+
+        with self._cond:
+            if not self._closed:
+                self._idle.append((conn, time.monotonic()))
+                self._cond.notify()
+                return
+
+        self._close_quietly(conn)
+        self._forget()
+
+    def _prune_idle(self):
+        """ (락 안에서 호출) idle_timeout을 넘긴 유휴 연결을 골라냄. 실제 close는 호출자가 락 밖에서 """
+        if not self._idle or self.idle_timeout is None:
+            return []
+        now = time.monotonic()
+        expired = []
+        # 가장 오래된 것은 왼쪽에 쌓임
+        while self._idle and self._size > self.min_size:
+            conn, last_used = self._idle[0]
+            if now - last_used < self.idle_timeout:
+                break
+            self._idle.popleft()
+            self._size -= 1
+            self._discarded += 1
+            expired.append(conn)
+        return expired
+
+    def _forget(self, discarded=False):
+        """ 열린 연결 수에서 하나를 빼고 기다리는 스레드를 깨움 """
+        with self._cond:
+            self._size -= 1
+            if discarded:
+                self._discarded += 1
+            self._cond.notify()
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    # ---------------- 관리 ----------------
+
+    def stats(self):
+        """ 풀 상태 및 hit/miss/wait 카운터 """
+        with self._cond:
+            return {
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': self._size - len(self._idle),
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'hits': self._hits,
+                'misses': self._misses,
+                'waits': self._waits,
+                'timeouts': self._timeouts,
+                'discarded': self._discarded,
+                'wait_seconds': round(self._wait_seconds, 6),
+            }
+
+    def close(self):
+        """ 유휴 연결을 모두 닫고, 이후 반납되는 연결도 닫음 """
+        with self._cond:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._size -= len(idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for conn in idle:
+            self._close_quietly(conn)
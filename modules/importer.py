@@ -0,0 +1,311 @@
+"""
+은행 거래내역(CSV / XLSX) 일괄 가져오기
+
+파일을 한 줄씩 읽어(전체를 메모리에 올리지 않음) 열 이름을 date/type/description/amount/
+category/pay 로 맞추고, chunk_size 건씩 하나의 트랜잭션에서 executemany 로 넣습니다.
+이미 같은 (날짜, 유형, 내용, 금액) 내역이 있으면 그 건수만큼은 중복으로 보고 건너뜁니다.
+"""
+import io
+import csv
+import codecs
+import time
+from datetime import date, datetime
+
+import pymysql
+
+from .user import db_connector
+from . import ledger
+from . import summary
+
+CHUNK_SIZE = 500
+MAX_REPORTED_ERRORS = 100
+DECODE_ERROR = "파일 인코딩을 읽을 수 없어 이 줄부터 가져오지 못했습니다. encoding=cp949 로 다시 시도해 보세요."
+
+# 은행/카드사 내보내기 파일에서 자주 쓰는 열 이름 -> 필드
+COLUMN_ALIASES = {
+    'date': ('날짜', '일자', '거래일', '거래일자', '거래일시', '거래날짜', 'date'),
+    'type': ('유형', '구분', '입출금', '거래구분', 'type'),
+    'description': ('내용', '내역', '적요', '거래내용', '메모', '가맹점', '가맹점명', 'description', 'desc', 'memo'),
+    'amount': ('금액', '거래금액', '이용금액', 'amount'),
+    'income': ('입금액', '입금', '맡기신금액', 'deposit', 'income'),
+    'spend': ('출금액', '출금', '찾으신금액', 'withdrawal', 'spend'),
+    'category': ('카테고리', '분류', 'category'),
+    'pay': ('지불수단', '결제수단', 'pay', 'payment_method'),
+}
+
+_TYPE_ALIASES = {
+    '입금': '입금', '수입': '입금', 'income': '입금', 'deposit': '입금', '+': '입금',
+    '출금': '출금', '지출': '출금', 'expense': '출금', 'withdrawal': '출금', '-': '출금',
+}
+
+_DATE_FORMATS = ('%Y-%m-%d', '%Y.%m.%d', '%Y/%m/%d', '%Y%m%d')
+
+
+class ImportFormatError(ValueError):
+    """ 파일 형식/머리글 문제로 가져오기를 시작할 수 없을 때 """
+
+
+# ---------------- 파일 읽기 (한 줄씩) ----------------
+
+def iter_csv_rows(stream, encoding='utf-8-sig'):
+    """
+    업로드 스트림에서 CSV 행을 하나씩 꺼냄
+    한 줄씩 디코딩하므로 인코딩이 깨진 줄이 있으면 바로 그 행에서 UnicodeDecodeError
+    """
+    yield from csv.reader(_decoded_lines(stream, encoding))
+
+
+def _decoded_lines(stream, encoding):
+    """ 바이트 줄을 디코딩해서 줄 단위로 (UTF-16 처럼 줄바꿈이 여러 바이트여도 줄을 다시 맞춤) """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    pending = ''
+    for chunk in stream:
+        text = pending + decoder.decode(chunk)
+        # 마지막 '\n' 까지만 내보냄 ('\r' 뒤의 '\n' 이 아직 안 왔을 수 있음)
+        end = text.rfind('\n') + 1
+        pending = text[end:]
+        yield from io.StringIO(text[:end], newline='')
+    yield from io.StringIO(pending + decoder.decode(b'', final=True), newline='')
+
+
+def iter_xlsx_rows(stream):
+    """ 첫 번째 시트의 행을 하나씩 꺼냄 (openpyxl 필요, read_only 모드) """
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportFormatError("XLSX 가져오기에는 openpyxl 패키지가 필요합니다. (pip install openpyxl)")
+
+    wb = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        for row in wb.worksheets[0].iter_rows(values_only=True):
+            yield list(row)
+    finally:
+        wb.close()
+
+
+# ---------------- 열 매핑 / 행 검증 ----------------
+
+def map_header(header):
+    """
+    머리글 행 -> {필드: 열 번호}
+
+    Raises:
+        ImportFormatError: 날짜 열이나 금액 열(금액 또는 입금액/출금액)이 없을 때
+    """
+    lookup = {alias.lower(): field for field, aliases in COLUMN_ALIASES.items() for alias in aliases}
+    mapping = {}
+    for idx, name in enumerate(header):
+        field = lookup.get(str(name or '').strip().lower())
+        if field and field not in mapping:
+            mapping[field] = idx
+
+    if 'date' not in mapping:
+        raise ImportFormatError("날짜 열을 찾을 수 없습니다. (예: 날짜, 거래일자, date)")
+    if 'amount' not in mapping and not ({'income', 'spend'} & mapping.keys()):
+        raise ImportFormatError("금액 열을 찾을 수 없습니다. (예: 금액, 입금액/출금액, amount)")
+    return mapping
+
+
+def _parse_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value or '').strip()
+    head = text.split()[0] if text else ''
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(head, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"날짜 형식을 알 수 없습니다: {text!r}")
+
+
+def _parse_amount(value):
+    if value is None or str(value).strip() == '':
+        return 0
+    if isinstance(value, float):
+        return int(round(value))
+    return summary.to_amount(str(value).replace('원', '').replace(' ', ''))
+
+
+def parse_row(values, mapping):
+    """
+    파일의 한 행 -> ledger 행 dict
+
+    Raises:
+        ValueError: 값이 잘못되었을 때 (메시지는 그대로 오류 보고에 사용)
+    """
+    def get(field):
+        idx = mapping.get(field)
+        return values[idx] if idx is not None and idx < len(values) else None
+
+    d = _parse_date(get('date'))
+
+    tx_type = None
+    raw_type = get('type')
+    if raw_type not in (None, ''):
+        tx_type = _TYPE_ALIASES.get(str(raw_type).strip().lower())
+        if tx_type is None:
+            raise ValueError(f"입금/출금 구분을 알 수 없습니다: {raw_type!r}")
+
+    if 'amount' in mapping:
+        amount = _parse_amount(get('amount'))
+        if tx_type is None:
+            tx_type = '출금' if amount < 0 else '입금'
+    else:
+        income = _parse_amount(get('income'))
+        spend = _parse_amount(get('spend'))
+        if income and spend:
+            raise ValueError("입금액과 출금액이 모두 들어 있습니다.")
+        amount = income or spend
+        tx_type = tx_type or ('입금' if income else '출금')
+
+    amount = abs(amount)
+    if amount == 0:
+        raise ValueError("금액이 0 이거나 비어 있습니다.")
+
+    description = str(get('description') or '').strip()[:255]
+
+    # 목록에 없는 카테고리/지불수단은 비워 둠 (통계에서는 '기타'로 집계)
+    category = str(get('category') or '').strip()
+    if category not in ledger.CATEGORY_LIST[tx_type]:
+        category = None
+    pay = str(get('pay') or '').strip()
+    if tx_type == '입금' or pay not in ledger.PAY_LIST:
+        pay = None
+
+    return {
+        'date': d,
+        'type': tx_type,
+        'description': description,
+        'amount': amount,
+        'category': category,
+        'pay': pay,
+    }
+
+
+def _dedupe_key(row):
+    return (row['date'], row['type'], row['description'] or '', row['amount'])
+
+
+# ---------------- 가져오기 ----------------
+
+def import_rows(user_id, rows, chunk_size=CHUNK_SIZE, dry_run=False):
+    """
+    머리글 + 데이터 행 iterator 를 받아 ledger 에 넣습니다.
+
+    Args:
+        rows: 첫 행이 머리글인 행(list) iterator (iter_csv_rows / iter_xlsx_rows)
+        chunk_size (int): 트랜잭션 하나에 넣을 최대 행 수
+        dry_run (bool): True 면 검증/중복 검사만 하고 넣지 않음
+
+    Returns:
+        dict: rows, inserted(dry_run 이면 넣을 예정인 건수), duplicates, error_count,
+              errors(앞부분), seconds, rows_per_sec
+    """
+    started = time.monotonic()
+    rows = iter(rows)
+
+    # 빈 줄은 건너뛰고 첫 줄을 머리글로 사용
+    header = next((r for r in rows if any(str(v or '').strip() for v in r)), None)
+    if header is None:
+        raise ImportFormatError("빈 파일입니다.")
+    mapping = map_header(header)
+
+    report = {'dry_run': dry_run, 'rows': 0, 'inserted': 0, 'duplicates': 0, 'error_count': 0, 'errors': []}
+    inserted_keys = {}   # 이번 가져오기에서 이미 넣은 키별 건수 (다음 chunk 중복 검사 보정용)
+    matched_keys = {}    # 앞 chunk 에서 이미 중복으로 짝지은 기존 내역 건수 (같은 기존 행을 두 번 쓰지 않게)
+    touched_dates = set()
+
+    def add_error(line_no, message):
+        report['error_count'] += 1
+        if len(report['errors']) < MAX_REPORTED_ERRORS:
+            report['errors'].append({'row': line_no, 'error': message})
+
+    def read_rows():
+        # 중간에 인코딩이 깨진 줄이 나오면 거기서 멈추고, 앞에서 넣은 chunk 는 그대로 둔 채 보고서에 남김
+        # (같은 파일을 다른 encoding 으로 다시 올리면 이미 넣은 행은 중복으로 건너뜀)
+        try:
+            yield from rows
+        except UnicodeDecodeError:
+            add_error(line_no + 1, DECODE_ERROR)
+
+    db = db_connector()
+    cursor = db.cursor(pymysql.cursors.DictCursor)
+    try:
+        chunk = []
+        line_no = 1
+        for values in read_rows():
+            line_no += 1
+            if not any(str(v or '').strip() for v in values):
+                continue
+            report['rows'] += 1
+            try:
+                chunk.append((line_no, parse_row(values, mapping)))
+            except (ValueError, ArithmeticError) as e:
+                add_error(line_no, str(e))
+
+            if len(chunk) >= chunk_size:
+                _flush_chunk(db, cursor, user_id, chunk, report, inserted_keys, matched_keys, touched_dates, add_error, dry_run)
+                chunk = []
+
+        if chunk:
+            _flush_chunk(db, cursor, user_id, chunk, report, inserted_keys, matched_keys, touched_dates, add_error, dry_run)
+    finally:
+        cursor.close()
+        db.close()
+        if touched_dates:
+            ledger.invalidate_caches(user_id, *touched_dates)
+
+    seconds = time.monotonic() - started
+    report['seconds'] = round(seconds, 3)
+    report['rows_per_sec'] = round(report['rows'] / seconds, 1) if seconds > 0 else None
+    return report
+
+
+def _flush_chunk(db, cursor, user_id, chunk, report, inserted_keys, matched_keys, touched_dates, add_error, dry_run):
+    """
+    chunk 하나를 중복 검사 후 한 트랜잭션으로 넣음
+
+    기존 내역 건수에서 (앞 chunk 에서 넣은 건수 + 앞 chunk 에서 이미 중복으로 짝지은 건수)를 빼고 비교하므로,
+    같은 키의 행이 여러 chunk 에 나뉘어 있어도 한 번에 검사한 것과 결과가 같음
+    """
+    start = min(r['date'] for _, r in chunk)
+    end = max(r['date'] for _, r in chunk)
+    try:
+        existing = ledger.count_existing_keys(cursor, user_id, start, end)
+        for key in existing:
+            existing[key] -= inserted_keys.get(key, 0) + matched_keys.get(key, 0)
+
+        to_insert, matched = [], {}
+        for _, row in chunk:
+            key = _dedupe_key(row)
+            if existing.get(key, 0) > 0:
+                existing[key] -= 1
+                matched[key] = matched.get(key, 0) + 1
+            else:
+                to_insert.append(row)
+
+        if not dry_run and to_insert:
+            ledger.insert_transactions_many(cursor, user_id, to_insert)
+            db.commit()
+        else:
+            db.rollback()
+
+        report['inserted'] += len(to_insert)
+        report['duplicates'] += sum(matched.values())
+        for key, n in matched.items():
+            matched_keys[key] = matched_keys.get(key, 0) + n
+        if dry_run:
+            return
+        for row in to_insert:
+            key = _dedupe_key(row)
+            inserted_keys[key] = inserted_keys.get(key, 0) + 1
+            touched_dates.add(row['date'])
+
+    except Exception as e:
+        db.rollback()
+        print(f"[IMPORT CHUNK ERROR] {type(e).__name__}: {e}")
+        for line_no, _ in chunk:
+            add_error(line_no, f"DB 오류: {e}")
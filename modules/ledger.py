@@ -1,11 +1,203 @@
+import re
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
 import pymysql
 from .user import db_connector 
+from . import config
+from . import summary
+from . import cache
+from . import aggregate
+from . import metrics
+from . import storage
+from . import serializer
 from datetime import timedelta, date
 
 # ---------------------------------------------------------
 # [수정] 모든 함수에서 cursor() 대신 cursor(pymysql.cursors.DictCursor) 사용
 # ---------------------------------------------------------
 
+# --- 통계 공통 헬퍼 (DB 접근 없이 조회 결과만 가공) ---
+
+def _month_bounds(year, month):
+    """ (해당 월 1일, 다음 달 1일, 일수) """
+    start = date(year, month, 1)
+    end = date(year + (month == 12), 1 if month == 12 else month + 1, 1)
+    return start, end, (end - start).days
+
+def _prev_month(year, month):
+    return (year - 1, 12) if month == 1 else (year, month - 1)
+
+def _daily_series(by_day, year, month, days, upcoming=None):
+    """
+    일별 합계(by_day: {date: {'income','spend','card','transfer','other'}})를
+    월간 누적 시리즈로 변환합니다. (/api/stats/monthly-spend 응답 형식, modules/aggregate.py)
+
+    upcoming 이 있으면 (아직 넣지 않은 반복 내역, modules/recurring.py)
+    그 금액까지 더한 누적 지출/수입을 'projected' 에 같이 담습니다.
+    """
+    series = aggregate.month_series(by_day, year, month, days)
+    if upcoming:
+        merged = aggregate.month_series(aggregate.merge_days(by_day, upcoming), year, month, days)
+        series['projected'] = {k: merged[k] for k in ('cumIncome', 'cumSpend', 'totalIncome', 'totalSpend')}
+    return series
+
+def _category_breakdown(pairs):
+    """ (카테고리, 지출액) 목록 -> {'total', 'items': [{category, amount, pct}]} (지출 큰 순) """
+    spend_by_cat = {}
+    for cat, amt in pairs:
+        spend_by_cat[cat] = spend_by_cat.get(cat, 0) + int(amt or 0)
+
+    ranked = sorted(((c, a) for c, a in spend_by_cat.items() if a > 0),
+                    key=lambda x: x[1], reverse=True)
+    total = sum(a for _, a in ranked) or 0
+    items = []
+    for cat, amt in ranked:
+        pct = (amt / total * 100.0) if total > 0 else 0.0
+        items.append({
+            'category': cat,
+            'amount': amt,
+            'pct': round(pct, 1)
+        })
+
+    return { 'total': total, 'items': items }
+
+def _weekly_net(by_day, monday_this_week, n_weeks):
+    """ 최근 n주(이번 주 포함)의 주별 순변화(수입 - 지출) """
+    return aggregate.weekly_net(by_day, monday_this_week, n_weeks)
+
+def spending_advice(this_income, this_spend, last_income, last_spend):
+    """
+    지출 조언 메시지 계산
+    로직: (지난달 예산 + 이번달 수입) 대비 이번달 지출이 70% 넘으면 경고
+    """
+    last_month_budget = last_income - last_spend       # (지난달 수입 - 지난달 지출)
+    total_allowable = last_month_budget + this_income  # (지난달 예산 + 이번달 수입)
+
+    if total_allowable > 0:
+        spending_ratio = this_spend / total_allowable
+
+        if spending_ratio > 0.7: # 70% 초과 시
+            return f"지출이 총 예산의 {spending_ratio*100:.0f}%에 도달했습니다! 지출에 유의하세요."
+        elif this_spend > this_income: # (보너스) 이번달 수입보다 지출이 많을 때
+            return "이번 달 수입보다 지출이 더 많습니다! 지출 관리가 필요합니다."
+    return None
+
+def _sum_totals(by_day, start, end):
+    """ [start, end) 구간의 (수입 합계, 지출 합계) """
+    income = spend = 0
+    for d, r in by_day.items():
+        if start <= d < end:
+            income += int(r['income'] or 0)
+            spend  += int(r['spend']  or 0)
+    return income, spend
+
+def _merge_ranges(ranges):
+    """ 겹치거나 맞닿은 [start, end) 구간들을 합침 """
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [tuple(r) for r in merged]
+
+# --- SQL (동기 함수와 비동기 버전 modules/aio_ledger.py 공용) ---
+# 통계 함수는 ledger 원본 대신 일별 요약 테이블(ledger_summary, modules/summary.py)을 읽습니다.
+
+# 일별 수입/지출/결제수단 합계 (대시보드 공용)
+# 요약 테이블은 pay NULL 을 '' 로 저장하므로 other 에서 '' 도 뺌 (원본의 NULL NOT IN (...) 처럼 어디에도 안 셈)
+_DAILY_COLUMNS = """
+                   SUM(CASE WHEN type = '입금'  THEN amount ELSE 0 END) AS income,
+                   SUM(CASE WHEN type = '출금'  THEN amount ELSE 0 END) AS spend,
+                   SUM(CASE WHEN type='출금' AND pay='카드'        THEN amount ELSE 0 END) AS card,
+                   SUM(CASE WHEN type='출금' AND pay='계좌이체'  THEN amount ELSE 0 END) AS transfer,
+                   SUM(CASE WHEN type='출금' AND pay NOT IN ('카드','계좌이체','') THEN amount ELSE 0 END) AS other
+"""
+
+# (user_id, start, end) -> 구간(일/주/월)별 합계. 주는 월요일, 월은 1일로 묶음
+_RANGE_BUCKET_EXPR = storage.sql(
+    mysql={
+        'day': "d",
+        'week': "DATE_SUB(d, INTERVAL WEEKDAY(d) DAY)",
+        'month': "DATE_SUB(d, INTERVAL DAYOFMONTH(d) - 1 DAY)",
+    },
+    sqlite={
+        'day': "d",
+        'week': "date(d, '-' || ((CAST(strftime('%%w', d) AS INTEGER) + 6) %% 7) || ' days')",
+        'month': "date(d, 'start of month')",
+    },
+)
+# SQLite 는 계산한 날짜가 문자열로 오므로 "이름 [DATE]" 별칭으로 date 변환을 요청
+_BUCKET_ALIAS = storage.sql(mysql='bucket', sqlite='"bucket [DATE]"')
+RANGE_TOTALS_SQL = {
+    g: """
+            SELECT """ + expr + """ AS """ + _BUCKET_ALIAS + """,""" + _DAILY_COLUMNS + """
+            FROM ledger_summary
+            WHERE user_id = %s AND d >= %s AND d < %s
+            GROUP BY 1
+            ORDER BY 1
+        """
+    for g, expr in _RANGE_BUCKET_EXPR.items()
+}
+
+# (이번달 1일, user_id, 지난달 1일, 다음달 1일) -> 이번달/지난달 수입·지출 합계
+ADVICE_TOTALS_SQL = """
+            SELECT d >= %s AS is_this_month,
+                   SUM(CASE WHEN type = '입금' THEN amount ELSE 0 END) AS income,
+                   SUM(CASE WHEN type = '출금' THEN amount ELSE 0 END) AS spend
+            FROM ledger_summary
+            WHERE user_id = %s AND d >= %s AND d < %s
+            GROUP BY is_this_month
+        """
+
+# (user_id, start, end) -> 내역 있는 날짜
+ACTIVE_DAYS_SQL = """
+                SELECT DISTINCT date as d
+                FROM ledger
+                WHERE user_id = %s 
+                  AND date >= %s 
+                  AND date < %s
+            """
+
+SELECT_BY_DATE_SQL = "SELECT * FROM ledger WHERE user_id=%s AND date=%s ORDER BY id ASC"
+
+INSERT_SQL = """
+            INSERT INTO ledger (user_id, date, type, description, amount, category, pay)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+        """
+
+UPDATE_SQL = """
+            UPDATE ledger 
+            SET date=%s, type=%s, description=%s, amount=%s, pay=%s 
+            WHERE id=%s AND user_id=%s
+        """
+
+DELETE_SQL = "DELETE FROM ledger WHERE id = %s AND user_id = %s"
+
+# 수정/삭제 전에 기존 행을 잠그고 읽어옴 (요약 테이블 차감용)
+LOCK_ROW_SQL = (
+    "SELECT date, type, category, pay, amount FROM ledger "
+    "WHERE id = %s AND user_id = %s FOR UPDATE"
+)
+
+def advice_from_totals(rows):
+    """ ADVICE_TOTALS_SQL 결과 -> 조언 메시지 """
+    totals = {bool(r['is_this_month']): (int(r['income'] or 0), int(r['spend'] or 0)) for r in rows}
+    this_income, this_spend = totals.get(True, (0, 0))
+    last_income, last_spend = totals.get(False, (0, 0))
+    return spending_advice(this_income, this_spend, last_income, last_spend)
+
+def advice_params(user_id, today):
+    """ ADVICE_TOTALS_SQL 파라미터 (오늘 기준 이번달/지난달) """
+    this_start, this_end, _ = _month_bounds(today.year, today.month)
+    ly, lm = _prev_month(today.year, today.month)
+    last_start, _, _ = _month_bounds(ly, lm)
+    return (this_start, user_id, last_start, this_end)
+
+@metrics.tracked
 def select_ledger_by_user(user_id):
     """ 가계부 메인 목록 조회 """
     db = None
@@ -18,7 +210,7 @@ def select_ledger_by_user(user_id):
             SELECT id, user_id, date, type, description, amount, category, pay
             FROM ledger 
             WHERE user_id = %s 
-            ORDER BY date DESC
+            ORDER BY date DESC, id DESC
         """
         cursor.execute(sql, (user_id,))
         results = cursor.fetchall()
@@ -32,211 +224,308 @@ def select_ledger_by_user(user_id):
         if cursor: cursor.close()
         if db: db.close()
 
-# --- 통계 함수 ---
+# 페이지 단위 조회는 (user_id, date, id) 인덱스를 그대로 타도록 date DESC, id DESC 순서 고정
+LEDGER_PAGE_MAX = 1000
+
+@metrics.tracked
+def select_ledger_page(user_id, after=None, limit=100):
+    """
+    가계부 목록 커서 기반(keyset) 페이지 조회
+
+    Args:
+        after (tuple|None): 직전 페이지 마지막 행의 (date, id). None이면 처음부터
+        limit (int): 페이지 크기 (최대 LEDGER_PAGE_MAX)
 
-def select_month_ledger_by_user(user_id, year, month, days, start, end):
-    """ (월간 합계) 일별 누적 지출 """
+    Returns:
+        tuple: (행 목록, 다음 페이지 커서 (date, id) 또는 None)
+    """
+    limit = max(1, min(int(limit), LEDGER_PAGE_MAX))
     db = None
-    cur = None
+    cursor = None
     try:
         db = db_connector()
-        cur = db.cursor(pymysql.cursors.DictCursor)
+        cursor = db.cursor(pymysql.cursors.DictCursor)
 
-        sql = """
-            SELECT DATE(date) AS d,
-                   SUM(CASE WHEN type='출금' THEN amount ELSE 0 END) AS spend
-            FROM ledger
-            WHERE user_id = %s AND date >= %s AND date < %s
-            GROUP BY DATE(date)
-            ORDER BY d
-        """
-        cur.execute(sql, (user_id, start, end))
-        rows = cur.fetchall()
-        by_day = {r['d']: int(r['spend'] or 0) for r in rows}
+        if after is None:
+            sql = """
+                SELECT id, date, type, description, amount, category, pay
+                FROM ledger
+                WHERE user_id = %s
+                ORDER BY date DESC, id DESC
+                LIMIT %s
+            """
+            params = (user_id, limit + 1)
+        else:
+            after_date, after_id = after
+            sql = """
+                SELECT id, date, type, description, amount, category, pay
+                FROM ledger
+                WHERE user_id = %s
+                  AND (date < %s OR (date = %s AND id < %s))
+                ORDER BY date DESC, id DESC
+                LIMIT %s
+            """
+            params = (user_id, after_date, after_date, after_id, limit + 1)
+
+        cursor.execute(sql, params)
+        rows = list(cursor.fetchall())
 
-        labels = [f"{i}일" for i in range(1, days + 1)]
-        cumulative = []
-        running = 0
-        for day in range(1, days + 1):
-            d = date(year, month, day)
-            running += by_day.get(d, 0)
-            cumulative.append(running)
+        # limit + 1 개를 읽어서 다음 페이지가 있는지 판단
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = (rows[-1]['date'], rows[-1]['id'])
+        return rows, next_cursor
 
-        return {'labels': labels, 'thisMonth': cumulative}
     finally:
-        if cur: cur.close()
+        if cursor: cursor.close()
         if db: db.close()
 
+# --- 내역 검색 (/api/transactions/search) ---
+# 설명(description)은 전문 검색 인덱스로 찾고 user_id 로 그 사용자의 내역만 남김
+# 분류/결제수단/금액 조건과 keyset 페이지는 목록 조회와 같음
+#   MySQL : FULLTEXT ... WITH PARSER ngram (migrations/0005, 2글자 단위라 띄어쓰기 없는 한글도 부분 일치)
+#   SQLite: FTS5 trigram 가상 테이블 ledger_fts (migrations/sqlite/schema.sql, 트리거로 동기화)
+# 인덱스 최소 단위(ngram 2글자 / trigram 3글자)보다 짧은 검색어만 그 사용자의 내역에서 LIKE 로 찾음
+SEARCH_PAGE_MAX = 200
+SEARCH_MAX_TERMS = 8
+SEARCH_MAX_LENGTH = 100
+SEARCH_MIN_INDEXED = storage.sql(mysql=2, sqlite=3)
+
+_SEARCH_FTS_SQL = storage.sql(
+    mysql="MATCH(description) AGAINST (%s IN BOOLEAN MODE)",
+    sqlite="id IN (SELECT rowid FROM ledger_fts WHERE ledger_fts MATCH %s)",
+)
+_BOOLEAN_OPERATORS_RE = re.compile(r'[+\-<>()~*"@]')
+
+def _search_match_expr(terms):
+    """ 검색어 목록 -> MATCH 문자열 (모든 검색어를 포함하는 행) """
+    if storage.is_sqlite():
+        return ' '.join('"{}"'.format(t.replace('"', '""')) for t in terms)
+    # ngram 파서는 따옴표 안의 글자를 2글자씩 잘라 연속으로 나오는지 찾음
+    return ' '.join(f'+"{t}"' for t in terms)
 
-def select_month_daily_spend_income(user_id, start, end, year, month, days):
-    """ 
-    (통계 상세) 수입/지출 및 결제수단(pay)별 통계 
+def _like_pattern(term):
+    return '%' + term.replace('!', '!!').replace('%', '!%').replace('_', '!_') + '%'
+
+def check_search(q, min_amount, max_amount):
     """
-    db = None
-    cur = None
-    try:
-        db = db_connector()
-        cur = db.cursor(pymysql.cursors.DictCursor)
+    검색 파라미터 검사
 
-        sql = """
-            SELECT DATE(date) AS d,
-                   SUM(CASE WHEN type = '입금'  THEN amount ELSE 0 END) AS income,
-                   SUM(CASE WHEN type = '출금'  THEN amount ELSE 0 END) AS spend,
-                   SUM(CASE WHEN type='출금' AND pay='카드'        THEN amount ELSE 0 END) AS card,
-                   SUM(CASE WHEN type='출금' AND pay='계좌이체'  THEN amount ELSE 0 END) AS transfer,
-                   SUM(CASE WHEN type='출금' AND pay NOT IN ('카드','계좌이체') THEN amount ELSE 0 END) AS other
-            FROM ledger
-            WHERE user_id = %s AND date >= %s AND date < %s
-            GROUP BY DATE(date)
-            ORDER BY d
-        """
-        cur.execute(sql, (user_id, start, end))
-        rows = cur.fetchall()
+    Raises:
+        ValueError: 검색어가 너무 길거나 금액 범위가 잘못되었을 때
+    """
+    if q and len(q) > SEARCH_MAX_LENGTH:
+        raise ValueError(f"q 는 최대 {SEARCH_MAX_LENGTH}자까지 입력할 수 있습니다.")
+    for value in (min_amount, max_amount):
+        if value is not None and value < 0:
+            raise ValueError("금액은 0 이상이어야 합니다.")
+    if min_amount is not None and max_amount is not None and min_amount > max_amount:
+        raise ValueError("min_amount 는 max_amount 보다 클 수 없습니다.")
 
-        income_by_day   = {}
-        spend_by_day    = {}
-        card_by_day     = {}
-        transfer_by_day = {}
-        other_by_day    = {}
-        for r in rows:
-            d = r['d']
-            income_by_day[d]   = int(r['income']   or 0)
-            spend_by_day[d]    = int(r['spend']    or 0)
-            card_by_day[d]     = int(r['card']     or 0)
-            transfer_by_day[d] = int(r['transfer'] or 0)
-            other_by_day[d]    = int(r['other']    or 0)
-
-        labels       = [f"{i}일" for i in range(1, days+1)]
-        cumIncome    = []
-        cumSpend     = []
-        cumCard      = []
-        cumTransfer  = []
-        cumOther     = []
-
-        run_inc = run_spd = run_card = run_tr = run_oth = 0
-        for day in range(1, days+1):
-            d = date(year, month, day)
-            run_inc += income_by_day.get(d, 0)
-            run_spd += spend_by_day.get(d, 0)
-            run_card += card_by_day.get(d, 0)
-            run_tr   += transfer_by_day.get(d, 0)
-            run_oth  += other_by_day.get(d, 0)
-
-            cumIncome.append(run_inc)
-            cumSpend.append(run_spd)
-            cumCard.append(run_card)
-            cumTransfer.append(run_tr)
-            cumOther.append(run_oth)
-
-        return {
-            'labels': labels,
-            'cumIncome':   cumIncome,
-            'cumSpend':    cumSpend,
-            'cumCard':     cumCard,
-            'cumTransfer': cumTransfer,
-            'cumOther':    cumOther,
-            'totalIncome': run_inc,
-            'totalSpend':  run_spd,
-            'totalCard': run_card,
-            'totalTransfer': run_tr,
-            'totalOther':  run_oth,
-        }
-    except Exception as e:
-        print(f"[STATS DETAIL ERROR] {e}") # 에러 로그 확인용
-        return {}
-    finally:
-        if cur: cur.close()
-        if db: db.close()
+def search_query(user_id, q=None, category=None, pay=None, min_amount=None, max_amount=None,
+                 after=None, limit=50):
+    """
+    검색 조건 -> (SQL, 파라미터) (aio_ledger 와 같이 씀)
+    limit + 1 개를 읽도록 만들어 split_page 로 다음 페이지 여부를 판단합니다.
+    """
+    where, params = ["user_id = %s"], [user_id]
 
+    terms = [t for t in (_BOOLEAN_OPERATORS_RE.sub(' ', q or '')).split() if t][:SEARCH_MAX_TERMS]
+    indexed = [t for t in terms if len(t) >= SEARCH_MIN_INDEXED]
+    if indexed:
+        where.append(_SEARCH_FTS_SQL)
+        params.append(_search_match_expr(indexed))
+    for t in terms:
+        if len(t) < SEARCH_MIN_INDEXED:
+            where.append("description LIKE %s ESCAPE '!'")
+            params.append(_like_pattern(t))
 
-def select_month_category_spend(user_id, start, end):
-    """ (카테고리 통계) """
-    db = None
-    cur = None
+    if category:
+        where.append("category = %s")
+        params.append(category)
+    if pay:
+        where.append("pay = %s")
+        params.append(pay)
+    if min_amount is not None:
+        where.append("amount >= %s")
+        params.append(min_amount)
+    if max_amount is not None:
+        where.append("amount <= %s")
+        params.append(max_amount)
+    if after is not None:
+        after_date, after_id = after
+        where.append("(date < %s OR (date = %s AND id < %s))")
+        params += [after_date, after_date, after_id]
+
+    sql = f"""
+        SELECT id, date, type, description, amount, category, pay
+        FROM ledger
+        WHERE {' AND '.join(where)}
+        ORDER BY date DESC, id DESC
+        LIMIT %s
+    """
+    params.append(max(1, min(int(limit), SEARCH_PAGE_MAX)) + 1)
+    return sql, tuple(params)
+
+def split_page(rows, limit):
+    """ limit + 1 개 읽은 결과 -> (행 목록, 다음 페이지 커서 (date, id) 또는 None) """
+    rows = list(rows)
+    limit = max(1, min(int(limit), SEARCH_PAGE_MAX))
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, (rows[-1]['date'], rows[-1]['id'])
+    return rows, None
+
+@metrics.tracked
+def search_transactions(user_id, q=None, category=None, pay=None, min_amount=None, max_amount=None,
+                        after=None, limit=50):
+    """
+    가계부 내역 검색 (설명 부분 일치 + 분류/결제수단/금액 조건, 최신순 keyset 페이지)
+
+    Args:
+        q (str|None): 설명에서 찾을 검색어 (공백으로 나눈 단어를 모두 포함하는 내역)
+        after (tuple|None): 직전 페이지 마지막 행의 (date, id)
+        limit (int): 페이지 크기 (최대 SEARCH_PAGE_MAX)
+
+    Returns:
+        tuple: (행 목록, 다음 페이지 커서 (date, id) 또는 None)
+
+    Raises:
+        ValueError: check_search 참고
+    """
+    check_search(q, min_amount, max_amount)
+    sql, params = search_query(user_id, q, category, pay, min_amount, max_amount, after, limit)
+    db = cur = None
     try:
         db = db_connector()
         cur = db.cursor(pymysql.cursors.DictCursor)
+        cur.execute(sql, params)
+        return split_page(cur.fetchall(), limit)
+    finally:
+        if cur: cur.close()
+        if db: db.close()
 
-        sql = """
-            SELECT
-              COALESCE(NULLIF(TRIM(category), ''), '기타') AS cat,
-              SUM(
-                CASE
-                  WHEN TRIM(LOWER(type)) <> '입금'
-                  THEN CAST(REPLACE(amount, ',', '') AS SIGNED)
-                  ELSE 0
-                END
-              ) AS spend
+def iter_ledger_by_user(user_id):
+    """
+    가계부 전체 내역을 한 행씩 흘려보내는 제너레이터 (스트리밍 응답용)
+    SSDictCursor(서버측 커서)를 써서 결과 전체를 메모리에 올리지 않습니다.
+    제너레이터가 끝나거나 닫힐 때 연결을 풀에 반납합니다.
+    """
+    db = db_connector()
+    cursor = None
+    try:
+        cursor = db.cursor(pymysql.cursors.SSDictCursor)
+        cursor.execute("""
+            SELECT id, date, type, description, amount, category, pay
             FROM ledger
             WHERE user_id = %s
-              AND date >= %s AND date < %s
-            GROUP BY cat
-            HAVING spend > 0
-            ORDER BY spend DESC
-        """
-        cur.execute(sql, (user_id, start, end))
-        rows = cur.fetchall()
+            ORDER BY date DESC, id DESC
+        """, (user_id,))
+        for row in cursor:
+            yield row
+    finally:
+        if cursor: cursor.close()
+        db.close()
+
+# --- 통계 함수 ---
+
+# 기간 통계 응답 크기 상한 (구간 수)
+RANGE_MAX_BUCKETS = {'day': 400, 'week': 260, 'month': 120}
+
+def check_range(start, end, granularity):
+    """
+    기간 통계 파라미터 검사
+
+    Raises:
+        ValueError: granularity 가 잘못되었거나 구간 수가 상한을 넘을 때
+    """
+    if granularity not in aggregate.GRANULARITIES:
+        raise ValueError("granularity 는 day, week, month 중 하나여야 합니다.")
+    if end <= start:
+        raise ValueError("to 는 from 보다 같거나 뒤의 날짜여야 합니다.")
+    count = aggregate.bucket_count(start, end, granularity)
+    if count > RANGE_MAX_BUCKETS[granularity]:
+        raise ValueError(
+            f"{granularity} 단위는 최대 {RANGE_MAX_BUCKETS[granularity]}개 구간까지 조회할 수 있습니다. "
+            f"(요청: {count}개)"
+        )
 
-        total = sum(int(r['spend'] or 0) for r in rows) or 0
-        items = []
-        for r in rows:
-            amt = int(r['spend'] or 0)
-            pct = (amt / total * 100.0) if total > 0 else 0.0
-            items.append({
-                'category': r['cat'],
-                'amount': amt,
-                'pct': round(pct, 1)
-            })
-
-        return { 'total': total, 'items': items }
+@metrics.tracked
+def select_range_stats(user_id, start, end, granularity='day'):
+    """
+    (기간 통계) [start, end) 를 일/주/월 단위로 묶은 수입/지출 합계 (한 번의 GROUP BY)
+
+    Raises:
+        ValueError: check_range 참고
+    """
+    check_range(start, end, granularity)
+    db = cur = None
+    try:
+        db = db_connector()
+        cur = db.cursor(pymysql.cursors.DictCursor)
+        cur.execute(RANGE_TOTALS_SQL[granularity], (user_id, start, end))
+        by_bucket = {r['bucket']: r for r in cur.fetchall()}
     finally:
         if cur: cur.close()
         if db: db.close()
 
+    return {
+        'from': start.isoformat(),
+        'to': (end - timedelta(days=1)).isoformat(),
+        'granularity': granularity,
+        **aggregate.bucket_series(by_bucket, start, end, granularity),
+    }
+
+# 주간 통계 한 번에 조회할 수 있는 최대 주 수 / 과거로 넘길 수 있는 최대 페이지
+WEEKLY_MAX_WEEKS = 52
+WEEKLY_MAX_OFFSET = 520
 
-def select_recent_weeks(user_id, n_weeks):
-    """ (주간 통계) """
+def check_weekly(n_weeks, offset):
+    """
+    주간 통계 파라미터 검사
+
+    Raises:
+        ValueError: n 이 1~WEEKLY_MAX_WEEKS, offset 이 0~WEEKLY_MAX_OFFSET 범위를 벗어날 때
+    """
+    if not 1 <= n_weeks <= WEEKLY_MAX_WEEKS:
+        raise ValueError(f"n 은 1 ~ {WEEKLY_MAX_WEEKS} 사이여야 합니다.")
+    if not 0 <= offset <= WEEKLY_MAX_OFFSET:
+        raise ValueError(f"offset 은 0 ~ {WEEKLY_MAX_OFFSET} 사이여야 합니다.")
+
+def check_month(year, month):
+    """
+    연/월 파라미터 검사 (전달/다음 달 1일도 계산하므로 date 범위의 양 끝 해는 제외)
+
+    Raises:
+        ValueError: year 가 2~9998, month 가 1~12 범위를 벗어날 때
+    """
+    if not (date.min.year < year < date.max.year and 1 <= month <= 12):
+        raise ValueError(f"year 는 {date.min.year + 1} ~ {date.max.year - 1}, month 는 1 ~ 12 사이여야 합니다.")
+
+def weekly_window(today, n_weeks, offset=0):
+    """
+    (마지막 주 월요일, 시작일, 끝날 다음 날)
+    offset 페이지만큼(한 페이지 = n주) 과거로 옮긴 n주 구간
+    """
+    monday = today - timedelta(days=today.weekday()) - timedelta(weeks=n_weeks * offset)
+    return monday, monday - timedelta(weeks=n_weeks - 1), monday + timedelta(days=7)
+
+@metrics.tracked
+def select_recent_weeks(user_id, n_weeks, offset=0, today=None):
+    """
+    (주간 통계) 최근 n주 순변화, offset 페이지만큼 과거로
+    주 시작일(월요일)로 묶는 GROUP BY 한 번으로 (user_id, d) 구간만 스캔합니다.
+    """
+    monday, start, end = weekly_window(today or date.today(), n_weeks, offset)
     db = cur = None
     try:
         db = db_connector()
         cur = db.cursor(pymysql.cursors.DictCursor)
-
-        sql = """
-        WITH RECURSIVE seq(i) AS (
-            SELECT 0 UNION ALL SELECT i + 1 FROM seq WHERE i + 1 < %s
-        ),
-        base AS (
-            SELECT DATE_SUB(CURDATE(), INTERVAL WEEKDAY(CURDATE()) DAY) AS monday_this_week
-        ),
-        weeks AS (
-            SELECT DATE_SUB(b.monday_this_week, INTERVAL s.i WEEK) AS week_start
-            FROM base b JOIN seq s
-        ),
-        agg AS (
-            SELECT
-                w.week_start,
-                COALESCE(SUM(CASE WHEN l.type='입금' THEN l.amount ELSE 0 END), 0) AS income,
-                COALESCE(SUM(CASE WHEN l.type='출금' THEN l.amount ELSE 0 END), 0) AS spend
-            FROM weeks w
-            LEFT JOIN ledger l
-              ON l.user_id = %s
-             AND l.date >= w.week_start
-             AND l.date <  DATE_ADD(w.week_start, INTERVAL 7 DAY)
-            GROUP BY w.week_start
-        )
-        SELECT
-            DATE_FORMAT(week_start, '%%m.%%d') AS start_label,
-            DATE_FORMAT(DATE_ADD(week_start, INTERVAL 6 DAY), '%%m.%%d') AS end_label,
-            (income - spend) AS net
-        FROM agg
-        ORDER BY week_start
-        """
-        cur.execute(sql, (n_weeks, user_id))
-        rows = cur.fetchall()
-
-        labels = [f"{r['start_label']}~{r['end_label']}" for r in rows]
-        net    = [int(r['net'] or 0) for r in rows]
-        return {"labels": labels, "net": net}
+        cur.execute(RANGE_TOTALS_SQL['week'], (user_id, start, end))
+        # 주 시작일에 그 주 합계가 모여 있으므로 일별 합계처럼 그대로 넘김
+        by_week = {r['bucket']: r for r in cur.fetchall()}
+        return _weekly_net(by_week, monday, n_weeks)
 
     except Exception as e:
         print(f"[STATS WEEKLY ERROR] {e}")
@@ -245,53 +534,329 @@ def select_recent_weeks(user_id, n_weeks):
         if cur: cur.close()
         if db: db.close()
 
-def select_month_active_days(user_id, year, month):
-    """ 해당 연/월에 내역이 존재하는 날짜 리스트 조회 """
-    db = None
-    cur = None
+@metrics.tracked
+def select_month_dashboard(user_id, year, month, n_weeks=10, today=None, upcoming=None):
+    """
+    (통계 대시보드) 통계 페이지에 필요한 데이터를 한 번의 집계 쿼리로 묶어서 반환
+
+    - monthly / prevMonthly : 선택한 달과 그 전달의 일별 누적 시리즈 (monthly-spend 형식)
+                              upcoming(반복 내역 예정 금액)이 있으면 monthly 에 'projected' 추가
+    - categories            : 선택한 달의 카테고리별 지출 (monthly-cats 형식)
+    - weekly                : 오늘 기준 최근 n주 순변화 (weekly 형식)
+    - advice                : 오늘 기준 지출 조언 (spending-advice 형식)
+
+    선택한 달 주변과 오늘 주변의 두 날짜 구간만 (user_id, date) 범위로 한 번 스캔하고,
+    (날짜, 카테고리) 단위 합계를 파이썬에서 나눠 담습니다. (ledger_summary 기준)
+    """
+    today = today or date.today()
+
+    start, end, days = _month_bounds(year, month)
+    py, pm = _prev_month(year, month)
+    prev_start, _, prev_days = _month_bounds(py, pm)
+
+    this_start, this_end, _ = _month_bounds(today.year, today.month)
+    ly, lm = _prev_month(today.year, today.month)
+    last_start, _, _ = _month_bounds(ly, lm)
+
+    monday = today - timedelta(days=today.weekday())
+    weeks_start = monday - timedelta(weeks=n_weeks - 1)
+    weeks_end = monday + timedelta(days=7)
+
+    ranges = _merge_ranges([
+        (prev_start, end),
+        (min(last_start, weeks_start), max(this_end, weeks_end)),
+    ])
+
+    db = cur = None
     try:
         db = db_connector()
         cur = db.cursor(pymysql.cursors.DictCursor)
 
+        where = " OR ".join("(d >= %s AND d < %s)" for _ in ranges)
+        params = [user_id]
+        for r_start, r_end in ranges:
+            params += [r_start, r_end]
+
         sql = """
-            SELECT DISTINCT DATE(date) as d
-            FROM ledger
-            WHERE user_id = %s 
-              AND YEAR(date) = %s 
-              AND MONTH(date) = %s
+            SELECT d,
+                   COALESCE(NULLIF(category, ''), '기타') AS cat,""" + _DAILY_COLUMNS + """,
+                   SUM(CASE WHEN type <> '입금' THEN amount ELSE 0 END) AS cat_spend
+            FROM ledger_summary
+            WHERE user_id = %s AND (""" + where + """)
+            GROUP BY d, cat
         """
-        cur.execute(sql, (user_id, year, month))
+        cur.execute(sql, params)
         rows = cur.fetchall()
-        
-        return [str(r['d']) for r in rows]
+    finally:
+        if cur: cur.close()
+        if db: db.close()
 
-    except Exception as e:
-        print(f"[ACTIVE DAYS ERROR] {e}")
-        return []
+    by_day = {}
+    cat_pairs = []
+    for r in rows:
+        d = r['d']
+        acc = by_day.setdefault(d, {'income': 0, 'spend': 0, 'card': 0, 'transfer': 0, 'other': 0})
+        for k in acc:
+            acc[k] += int(r[k] or 0)
+        if start <= d < end:
+            cat_pairs.append((r['cat'], r['cat_spend']))
+
+    this_income, this_spend = _sum_totals(by_day, this_start, this_end)
+    last_income, last_spend = _sum_totals(by_day, last_start, this_start)
+
+    return {
+        'year': year,
+        'month': month,
+        'monthly': _daily_series(by_day, year, month, days, upcoming),
+        'prevMonthly': _daily_series(by_day, py, pm, prev_days),
+        'categories': _category_breakdown(cat_pairs),
+        'weekly': _weekly_net(by_day, monday, n_weeks),
+        'advice': spending_advice(this_income, this_spend, last_income, last_spend),
+    }
+
+@metrics.tracked
+def select_spending_advice(user_id, today=None):
+    """ (지출 조언) 지난달 1일 ~ 이번달 말까지 한 번만 집계해서 조언 메시지 계산 """
+    db = cur = None
+    try:
+        db = db_connector()
+        cur = db.cursor(pymysql.cursors.DictCursor)
+        cur.execute(ADVICE_TOTALS_SQL, advice_params(user_id, today or date.today()))
+        return advice_from_totals(cur.fetchall())
     finally:
         if cur: cur.close()
         if db: db.close()
 
+# --- 달력용 "내역 있는 날짜" 캐시 ---
+# (user_id, year, month) -> 비트마스크 (1일 = bit 0). 쓰기 함수가 해당 달을 무효화합니다.
+# 프로세스 단위 캐시이므로 여러 워커를 띄우면 TTL 만큼 늦게 반영될 수 있습니다.
+ACTIVE_DAYS_CACHE_SIZE = getattr(config, 'active_days_cache_size', 4096)
+ACTIVE_DAYS_CACHE_TTL = getattr(config, 'active_days_cache_ttl', 300)
+ACTIVE_DAYS_MAX_MONTHS = 12
+
+_active_days_cache = OrderedDict()
+_active_days_lock = threading.Lock()
+
+# 달별 세대 번호: 무효화할 때마다 그 달의 세대를 새 번호로 올림
+# 조회를 시작할 때의 번호(token)보다 세대가 크면, 읽는 도중 쓰기가 있었던 것이라 캐시에 넣지 않음
+# (오래된 세대 기록은 잘라내고, 잘라낸 것 중 가장 큰 번호를 모든 달의 세대로 간주)
+_active_days_seq = 0
+_active_days_gen = OrderedDict()
+_active_days_gen_floor = 0
+
+def _active_days_get(key):
+    with _active_days_lock:
+        entry = _active_days_cache.get(key)
+        if entry is None:
+            return None
+        mask, stored_at = entry
+        if time.monotonic() - stored_at > ACTIVE_DAYS_CACHE_TTL:
+            del _active_days_cache[key]
+            return None
+        _active_days_cache.move_to_end(key)
+        return mask
+
+def _active_days_token():
+    """ DB 조회 전에 받아 두는 현재 세대 번호 (_active_days_put 에 넘김) """
+    with _active_days_lock:
+        return _active_days_seq
+
+def _active_days_put(key, mask, token):
+    with _active_days_lock:
+        if _active_days_gen.get(key, _active_days_gen_floor) > token:
+            return  # 조회 중에 무효화됨: 오래된 결과일 수 있으니 넣지 않음
+        _active_days_cache[key] = (mask, time.monotonic())
+        _active_days_cache.move_to_end(key)
+        while len(_active_days_cache) > ACTIVE_DAYS_CACHE_SIZE:
+            _active_days_cache.popitem(last=False)
+
+def invalidate_active_days(user_id, *dates):
+    """ 쓰기 후 해당 날짜가 속한 달의 캐시 삭제 + 세대 번호 올림 """
+    global _active_days_seq, _active_days_gen_floor
+    with _active_days_lock:
+        for d in dates:
+            if d is None:
+                continue
+            if isinstance(d, str):
+                d = date.fromisoformat(d[:10])
+            key = (user_id, d.year, d.month)
+            _active_days_cache.pop(key, None)
+            _active_days_seq += 1
+            _active_days_gen[key] = _active_days_seq
+            _active_days_gen.move_to_end(key)
+        while len(_active_days_gen) > ACTIVE_DAYS_CACHE_SIZE:
+            _active_days_gen_floor = _active_days_gen.popitem(last=False)[1]
+
+# 쓰기 후 알림을 받을 함수 목록 fn(user_id, *dates) (예: modules/advice.py 의 조언 다시 계산)
+WRITE_LISTENERS = []
+
+def invalidate_caches(user_id, *dates):
+    """ 쓰기(commit) 후 호출: 달력 캐시 삭제 + 해당 달 통계 응답 캐시 버전 올림 (modules/cache.py) """
+    invalidate_active_days(user_id, *dates)
+    cache.bump_dates(user_id, *dates)
+    for listener in WRITE_LISTENERS:
+        try:
+            listener(user_id, *dates)
+        except Exception as e:
+            print(f"[WRITE LISTENER ERROR] {type(e).__name__}: {e}")
+
+def _mask_to_dates(year, month, mask):
+    out = []
+    day = 1
+    while mask:
+        if mask & 1:
+            out.append(date(year, month, day).isoformat())
+        mask >>= 1
+        day += 1
+    return out
+
+def active_days_cached(user_id, months):
+    """
+    캐시에서 찾은 달의 비트마스크와 DB 에서 다시 읽어야 할 달 목록을 나눔
+
+    Returns:
+        tuple: (masks {(y, m): mask}, missing [(y, m)], 조회 범위 (start, end) 또는 None,
+                세대 번호 token (active_days_store 에 넘김))
+    """
+    token = _active_days_token()
+    masks = {}
+    missing = []
+    for ym in months:
+        mask = _active_days_get((user_id,) + ym)
+        if mask is None:
+            missing.append(ym)
+        else:
+            masks[ym] = mask
+    if not missing:
+        return masks, missing, None, token
+    # 빠진 달들을 감싸는 [첫 달 1일, 마지막 달 다음 달 1일) 범위를 한 번에 조회
+    return masks, missing, (_month_bounds(*min(missing))[0], _month_bounds(*max(missing))[1]), token
+
+def active_days_store(user_id, masks, missing, rows, token):
+    """ ACTIVE_DAYS_SQL 결과를 달별 비트마스크로 바꿔 캐시에 넣고 masks 에 채움 """
+    found = {ym: 0 for ym in missing}
+    for r in rows:
+        d = r['d']
+        ym = (d.year, d.month)
+        if ym in found:
+            found[ym] |= 1 << (d.day - 1)
+    for ym, mask in found.items():
+        _active_days_put((user_id,) + ym, mask, token)
+        masks[ym] = mask
+
+@metrics.tracked
+def select_active_days_for_months(user_id, months):
+    """
+    여러 달의 "내역 있는 날짜"를 한 번에 조회 (달력 이전/다음 달 미리 받기용)
+
+    Args:
+        months (list): [(year, month), ...] 최대 ACTIVE_DAYS_MAX_MONTHS 개
+
+    Returns:
+        dict: {(year, month): ['YYYY-MM-DD', ...]}
+    """
+    months = list(dict.fromkeys(months))[:ACTIVE_DAYS_MAX_MONTHS]
+    masks, missing, range_, token = active_days_cached(user_id, months)
+
+    if missing:
+        db = None
+        cur = None
+        try:
+            db = db_connector()
+            cur = db.cursor(pymysql.cursors.DictCursor)
+
+            cur.execute(ACTIVE_DAYS_SQL, (user_id,) + range_)
+            rows = cur.fetchall()
+        except Exception as e:
+            print(f"[ACTIVE DAYS ERROR] {e}")
+            rows = None
+        finally:
+            if cur: cur.close()
+            if db: db.close()
+
+        if rows is not None:
+            active_days_store(user_id, masks, missing, rows, token)
+
+    return {ym: _mask_to_dates(ym[0], ym[1], masks[ym]) if ym in masks else [] for ym in months}
+
+@metrics.tracked
+def select_month_active_days(user_id, year, month):
+    """ 해당 연/월에 내역이 존재하는 날짜 리스트 조회 """
+    return select_active_days_for_months(user_id, [(year, month)])[(year, month)]
+
+# --- 가계부 첫 화면 데이터 (ledger.html 에 JSON 으로 함께 내려보냄) ---
+PAGE_DATA_WORKERS = getattr(config, 'page_data_workers', 4)
+
+_page_executor = None
+_page_executor_lock = threading.Lock()
+
+def _get_page_executor():
+    global _page_executor
+    if _page_executor is None:
+        with _page_executor_lock:
+            if _page_executor is None:
+                _page_executor = ThreadPoolExecutor(max_workers=PAGE_DATA_WORKERS, thread_name_prefix='pagedata')
+    return _page_executor
+
+def calendar_months(day):
+    """ 달력이 처음 받는 달: 그 달과 이전/다음 달 (ledger.js 의 markActiveDates 와 같음) """
+    nxt = (day.year + (day.month == 12), day.month % 12 + 1)
+    return [_prev_month(day.year, day.month), (day.year, day.month), nxt]
+
+def ledger_initial_payload(today, active, transactions):
+    """ 첫 화면 데이터 형식 (/month-active-dates?months=, /transactions-by-date 응답과 같은 모양) """
+    return {
+        'activeDates': {f"{y:04d}-{m:02d}": days for (y, m), days in active.items()},
+        'today': {'date': today.isoformat(), 'transactions': serializer.rows(transactions)},
+    }
+
+@metrics.tracked
+def select_ledger_initial(user_id, today):
+    """
+    가계부 첫 화면 데이터: 달력 세 달의 내역 있는 날짜 + 오늘 내역
+    두 조회를 서로 다른 연결에서 동시에 실행합니다.
+    """
+    months = calendar_months(today)
+    active = _get_page_executor().submit(select_active_days_for_months, user_id, months)
+    transactions = select_transactions_by_date(user_id, today)
+    return ledger_initial_payload(today, active.result(), transactions)
+
 
 # --- CRUD 함수 ---
 # INSERT, UPDATE, DELETE는 결과를 받아오는 게 아니라서 DictCursor가 필수는 아니지만,
 # 일관성을 위해 둬도 상관없고, 에러 발생 시 롤백 로직이 중요합니다.
+# 요약 테이블(ledger_summary)도 같은 트랜잭션 안에서 함께 갱신합니다.
 
+def pay_for(type, pay):
+    """ 저장할 지불수단 (입금은 지불수단 없이 NULL, 빈 값도 NULL) """
+    return None if type == '입금' else (pay or None)
+
+def _lock_row(cursor, transaction_id, user_id):
+    """ 수정/삭제 전에 기존 행을 잠그고 읽어옴 (요약 테이블 차감용) """
+    cursor.execute(LOCK_ROW_SQL, (transaction_id, user_id))
+    return cursor.fetchone()
+
+@metrics.tracked
 def insert_transaction(user_id, date, transaction_type, desc, amount, category, pay):
+    """ 내역 추가 후 새 행의 id 반환 """
     db = None
     cursor = None
     try:
         db = db_connector()
         cursor = db.cursor()
-        sql = """
-            INSERT INTO ledger (user_id, date, type, description, amount, category, pay)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-        """
         
-        cursor.execute(sql, (user_id, date, transaction_type, desc, amount, category, pay))
-
+        # amount 는 정수 컬럼, 빈 카테고리/지불수단은 NULL 로 저장 (migrations/0003)
+        amount = summary.to_amount(amount)
+        category = category or None
+        pay = pay_for(transaction_type, pay)
+        cursor.execute(INSERT_SQL, (user_id, date, transaction_type, desc, amount, category, pay))
+        summary.apply_deltas(cursor, [
+            (user_id, date, transaction_type, category, pay, amount, 1),
+        ])
 
         db.commit()
+        invalidate_caches(user_id, date)
+        return cursor.lastrowid
     except Exception as e:
         if db: db.rollback()
         raise e
@@ -299,15 +864,26 @@ def insert_transaction(user_id, date, transaction_type, desc, amount, category,
         if cursor: cursor.close()
         if db: db.close()
 
+@metrics.tracked
 def delete_transaction_by_id(transaction_id, user_id):
+    """ 내역 삭제 후 삭제된 행의 날짜 반환 (없는 id면 None) """
     db = None
     cursor = None
     try:
         db = db_connector()
-        cursor = db.cursor()
-        sql = "DELETE FROM ledger WHERE id = %s AND user_id = %s"
-        cursor.execute(sql, (transaction_id, user_id))
+        cursor = db.cursor(pymysql.cursors.DictCursor)
+        old = _lock_row(cursor, transaction_id, user_id)
+        if old is None:
+            db.rollback()
+            return None
+
+        cursor.execute(DELETE_SQL, (transaction_id, user_id))
+        summary.apply_deltas(cursor, [
+            (user_id, old['date'], old['type'], old['category'], old['pay'], -summary.to_amount(old['amount']), -1),
+        ])
         db.commit()
+        invalidate_caches(user_id, old['date'])
+        return old['date']
     except Exception as e:
         if db: db.rollback()
         raise e
@@ -315,18 +891,267 @@ def delete_transaction_by_id(transaction_id, user_id):
         if cursor: cursor.close()
         if db: db.close()
 
+@metrics.tracked
 def update_transaction(trans_id, user_id, date, type, desc, amount):
+    """ 내역 수정, 수정했으면 True (없는 id면 False) """
     db = None
     cursor = None
     try:
         db = db_connector()
-        cursor = db.cursor()
-        sql = """
-            UPDATE ledger 
-            SET date=%s, type=%s, description=%s, amount=%s 
-            WHERE id=%s AND user_id=%s
-        """
-        cursor.execute(sql, (date, type, desc, amount, trans_id, user_id))
+        cursor = db.cursor(pymysql.cursors.DictCursor)
+        old = _lock_row(cursor, trans_id, user_id)
+        if old is None:
+            db.rollback()
+            return False
+
+        amount = summary.to_amount(amount)
+        pay = pay_for(type, old['pay'])
+        cursor.execute(UPDATE_SQL, (date, type, desc, amount, pay, trans_id, user_id))
+        summary.apply_deltas(cursor, [
+            (user_id, old['date'], old['type'], old['category'], old['pay'], -summary.to_amount(old['amount']), -1),
+            (user_id, date, type, old['category'], pay, amount, 1),
+        ])
+        db.commit()
+        invalidate_caches(user_id, old['date'], date)
+        return True
+    except Exception as e:
+        if db: db.rollback()
+        raise e
+    finally:
+        if cursor: cursor.close()
+        if db: db.close()
+
+# --- 여러 건 한 번에 쓰기 (가져오기 / 배치 API 공용) ---
+# 입력값 검증용 목록 (static/js/ledger.js 의 categoryList, migrations/0003 ENUM 과 같아야 함)
+TYPE_LIST = ('입금', '출금')
+PAY_LIST = ('카드', '현금', '계좌이체')
+CATEGORY_LIST = {
+    '입금': ('급여', '금융소득', '용돈/지원금', '기타'),
+    '출금': ('식비', '주거/통신', '교통/차량', '문화/여가', '생활/쇼핑', '건강/가족', '금융/기타'),
+}
+
+def insert_transactions_many(cursor, user_id, rows):
+    """
+    여러 건을 executemany 한 번(multi-row INSERT)으로 추가하고 요약 테이블도 갱신합니다.
+    호출자의 트랜잭션 안에서 실행되며 commit 과 invalidate_caches 는 호출자가 합니다.
+
+    새 행 id 는 돌려주지 않습니다. (AUTO_INCREMENT 가 연속이라는 보장이 없음)
+    필요하면 넣기 전 max_ledger_id() 와 read_inserted_ids() 로 다시 읽으세요.
+
+    Args:
+        rows (list): [{'date', 'type', 'description', 'amount', 'category', 'pay'}, ...]
+    """
+    if not rows:
+        return
+
+    params = []
+    for r in rows:
+        params.append((user_id, r['date'], r['type'], r.get('description'),
+                       summary.to_amount(r['amount']), r.get('category') or None, pay_for(r['type'], r.get('pay'))))
+
+    cursor.executemany(INSERT_SQL, params)
+    summary.apply_deltas(cursor, [
+        (user_id, p[1], p[2], p[5], p[6], p[4], 1) for p in params
+    ])
+
+def max_ledger_id(cursor):
+    """ 지금까지 배정된 가장 큰 ledger id (이후 INSERT 의 id 는 모두 이보다 큼) """
+    cursor.execute("SELECT COALESCE(MAX(id), 0) AS max_id FROM ledger")
+    row = cursor.fetchone()
+    return int(row['max_id'] if isinstance(row, dict) else row[0])
+
+def _insert_key(r):
+    return (str(r['date'])[:10], r['type'], r.get('description') or '', int(summary.to_amount(r['amount'])),
+            r.get('category') or None, pay_for(r['type'], r.get('pay')))
+
+def read_inserted_ids(cursor, user_id, after_id, rows):
+    """
+    insert_transactions_many 로 넣은 행의 id 를 DB 에서 다시 읽음 (같은 트랜잭션 안에서)
+
+    AUTO_INCREMENT 는 동시 INSERT 가 있으면(innodb_autoinc_lock_mode=2) 연속으로 배정되지 않고,
+    executemany 가 여러 문장으로 나뉘면 lastrowid 는 마지막 문장 기준이라 id 를 계산할 수 없습니다.
+    그래서 넣기 전 max_ledger_id() 이후의 행을 id 순으로 읽어 rows 와 내용이 같은 행을 차례로 짝지음
+
+    Returns:
+        list: rows 순서대로의 새 행 id
+
+    Raises:
+        RuntimeError: 넣은 행을 모두 찾지 못했을 때
+    """
+    cursor.execute(
+        "SELECT id, date, type, description, amount, category, pay FROM ledger "
+        "WHERE user_id = %s AND id > %s ORDER BY id",
+        (user_id, after_id),
+    )
+    ids, i = [], 0
+    for r in cursor.fetchall():
+        if i < len(rows) and _insert_key(r) == _insert_key(rows[i]):
+            ids.append(r['id'])
+            i += 1
+    if i != len(rows):
+        raise RuntimeError(f"추가한 내역 {len(rows)}건 중 {i}건만 다시 찾았습니다.")
+    return ids
+
+def count_existing_keys(cursor, user_id, start, end):
+    """
+    [start, end] 기간 내역을 (날짜, 유형, 내용, 금액) 별 건수로 반환 (중복 가져오기 방지용)
+    """
+    cursor.execute("""
+        SELECT date, type, description, amount, COUNT(*) AS cnt
+        FROM ledger
+        WHERE user_id = %s AND date >= %s AND date <= %s
+        GROUP BY date, type, description, amount
+    """, (user_id, start, end))
+    out = {}
+    for r in cursor.fetchall():
+        key = (r['date'], r['type'], r['description'] or '', int(r['amount']))
+        out[key] = out.get(key, 0) + int(r['cnt'])
+    return out
+
+BATCH_MAX_OPERATIONS = 500
+
+def _normalize_fields(data, partial=False):
+    """
+    배치 API 입력값 검증/정규화 ('desc', 'payment_method' 는 /add, /edit 과 같은 이름)
+
+    Args:
+        partial (bool): True 면 없는 항목은 건너뜀 (update 용)
+
+    Raises:
+        ValueError: 값이 잘못되었을 때
+    """
+    out = {}
+    if 'date' in data or not partial:
+        try:
+            out['date'] = date.fromisoformat(str(data.get('date') or '')[:10])
+        except ValueError:
+            raise ValueError("date 는 YYYY-MM-DD 형식이어야 합니다.")
+    if 'type' in data or not partial:
+        if data.get('type') not in TYPE_LIST:
+            raise ValueError("type 은 '입금' 또는 '출금' 이어야 합니다.")
+        out['type'] = data['type']
+    if 'desc' in data or not partial:
+        out['description'] = str(data.get('desc') or '').strip()[:255]
+        if not out['description']:
+            raise ValueError("desc 가 비어 있습니다.")
+    if 'amount' in data or not partial:
+        try:
+            out['amount'] = summary.to_amount(data.get('amount'))
+        except (ValueError, ArithmeticError):
+            raise ValueError("amount 는 숫자여야 합니다.")
+    if 'category' in data:
+        out['category'] = data.get('category') or None
+        if out['category'] and not any(out['category'] in cats for cats in CATEGORY_LIST.values()):
+            raise ValueError(f"알 수 없는 category 입니다: {out['category']}")
+    if 'payment_method' in data:
+        out['pay'] = data.get('payment_method') or None
+        if out['pay'] and out['pay'] not in PAY_LIST:
+            raise ValueError(f"알 수 없는 payment_method 입니다: {out['pay']}")
+    return out
+
+@metrics.tracked
+def apply_transaction_batch(user_id, operations):
+    """
+    여러 건의 추가/수정/삭제를 연결 하나, 트랜잭션 하나로 적용합니다.
+
+    Args:
+        operations (list): [{'op': 'create', date, type, desc, amount, category, payment_method},
+                            {'op': 'update', 'id': .., (바꿀 항목만)},
+                            {'op': 'delete', 'id': ..}, ...]
+
+    Returns:
+        tuple: (적용 여부 bool, 작업별 결과 list)
+               입력값 오류가 하나라도 있으면 아무것도 적용하지 않고 (False, 오류 목록) 반환.
+               없는 id 에 대한 수정/삭제는 해당 작업만 not_found 로 표시하고 나머지는 적용.
+    """
+    if len(operations) > BATCH_MAX_OPERATIONS:
+        return False, [{'index': None, 'ok': False,
+                        'error': f"한 번에 최대 {BATCH_MAX_OPERATIONS}건까지 처리할 수 있습니다."}]
+
+    # 1. 입력값 검증 (DB 접근 전)
+    parsed, errors = [], []
+    for i, op in enumerate(operations):
+        try:
+            kind = op.get('op')
+            if kind == 'create':
+                parsed.append((kind, None, _normalize_fields(op)))
+            elif kind in ('update', 'delete'):
+                tid = int(op.get('id'))
+                parsed.append((kind, tid, _normalize_fields(op, partial=True) if kind == 'update' else None))
+            else:
+                raise ValueError("op 는 create / update / delete 중 하나여야 합니다.")
+        except (ValueError, TypeError, AttributeError) as e:
+            errors.append({'index': i, 'ok': False, 'error': str(e) or 'id 가 필요합니다.'})
+    if errors:
+        return False, errors
+
+    db = None
+    cursor = None
+    try:
+        db = db_connector()
+        cursor = db.cursor(pymysql.cursors.DictCursor)
+
+        # 2. 수정/삭제 대상 행을 한 번에 잠그고 읽어옴
+        target_ids = sorted({tid for kind, tid, _ in parsed if tid is not None})
+        original = {}
+        if target_ids:
+            placeholders = ", ".join(["%s"] * len(target_ids))
+            cursor.execute(
+                "SELECT id, date, type, description, amount, category, pay FROM ledger "
+                "WHERE user_id = %s AND id IN (" + placeholders + ") FOR UPDATE",
+                [user_id] + target_ids
+            )
+            original = {r['id']: r for r in cursor.fetchall()}
+
+        # 3. 요청 순서대로 최종 상태를 계산 (같은 id 를 여러 번 건드려도 순서대로 반영)
+        state = dict(original)
+        creates, results, create_slots = [], [], []
+        for i, (kind, tid, fields) in enumerate(parsed):
+            if kind == 'create':
+                fields['pay'] = pay_for(fields['type'], fields.get('pay'))
+                creates.append(fields)
+                create_slots.append(len(results))
+                results.append({'index': i, 'op': kind, 'ok': True})
+            elif tid not in state:
+                results.append({'index': i, 'op': kind, 'id': tid, 'ok': False, 'error': 'not_found'})
+            elif kind == 'delete':
+                del state[tid]
+                results.append({'index': i, 'op': kind, 'id': tid, 'ok': True})
+            else:
+                row = dict(state[tid], **fields)
+                row['pay'] = pay_for(row['type'], row['pay'])
+                state[tid] = row
+                results.append({'index': i, 'op': kind, 'id': tid, 'ok': True})
+
+        deleted = [tid for tid in original if tid not in state]
+        updated = [tid for tid in original if tid in state and state[tid] != original[tid]]
+
+        # 4. 종류별로 executemany 한 번씩 실행
+        if deleted:
+            cursor.executemany(DELETE_SQL, [(tid, user_id) for tid in deleted])
+        if updated:
+            cursor.executemany("""
+                UPDATE ledger
+                SET date=%s, type=%s, description=%s, amount=%s, category=%s, pay=%s
+                WHERE id=%s AND user_id=%s
+            """, [(state[tid]['date'], state[tid]['type'], state[tid]['description'],
+                   summary.to_amount(state[tid]['amount']), state[tid]['category'], state[tid]['pay'],
+                   tid, user_id) for tid in updated])
+
+        deltas = []
+        for tid in deleted + updated:
+            r = original[tid]
+            deltas.append((user_id, r['date'], r['type'], r['category'], r['pay'], -summary.to_amount(r['amount']), -1))
+        for tid in updated:
+            r = state[tid]
+            deltas.append((user_id, r['date'], r['type'], r['category'], r['pay'], r['amount'], 1))
+        summary.apply_deltas(cursor, deltas)
+
+        new_ids = []
+        if creates:
+            after_id = max_ledger_id(cursor)
+            insert_transactions_many(cursor, user_id, creates)
+            new_ids = read_inserted_ids(cursor, user_id, after_id, creates)
         db.commit()
     except Exception as e:
         if db: db.rollback()
@@ -335,6 +1160,18 @@ def update_transaction(trans_id, user_id, date, type, desc, amount):
         if cursor: cursor.close()
         if db: db.close()
 
+    for slot, new_id in zip(create_slots, new_ids):
+        results[slot]['id'] = new_id
+
+    invalidate_caches(
+        user_id,
+        *[original[tid]['date'] for tid in deleted + updated],
+        *[state[tid]['date'] for tid in updated],
+        *[c['date'] for c in creates],
+    )
+    return True, results
+
+@metrics.tracked
 def select_transactions_by_date(user_id, date):
     db = None
     cursor = None
@@ -343,8 +1180,7 @@ def select_transactions_by_date(user_id, date):
         cursor = db.cursor(pymysql.cursors.DictCursor) # [수정]
         
         # pay 컬럼도 같이 조회
-        sql = "SELECT * FROM ledger WHERE user_id=%s AND date=%s ORDER BY id ASC"
-        cursor.execute(sql, (user_id, date))
+        cursor.execute(SELECT_BY_DATE_SQL, (user_id, date))
         return cursor.fetchall()
     except Exception as e:
         print(f"[SELECT BY DATE ERROR] {e}")
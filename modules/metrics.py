@@ -0,0 +1,279 @@
+"""
+요청 / 쿼리 계측 (Prometheus 텍스트 형식으로 /metrics 에서 조회)
+
+수집 항목:
+    gagyabu_http_request_duration_seconds   엔드포인트별 응답 시간
+    gagyabu_ledger_call_duration_seconds    ledger 함수별 전체 실행 시간
+    gagyabu_db_query_duration_seconds       ledger 함수별 쿼리 시간 (횟수는 _count)
+    gagyabu_db_query_rows_total             ledger 함수별 쿼리가 돌려준/바꾼 행 수
+    gagyabu_db_connect_duration_seconds     새 DB 연결을 여는 데 걸린 시간
+    gagyabu_db_acquire_duration_seconds     풀에서 연결을 빌리는 데 걸린 시간
+    gagyabu_json_serialize_duration_seconds JSON 직렬화 시간
+    gagyabu_slow_queries_total              metrics_slow_query_ms 를 넘긴 쿼리 수
+
+config.metrics_enabled = False 이면 데코레이터/커서 래퍼/요청 훅을 아예 붙이지 않아서
+계측 비용이 0 이 됩니다. (값을 바꾸면 서버를 다시 시작해야 함)
+외부 라이브러리 없이 프로세스 메모리에만 모으므로 워커마다 따로 집계됩니다.
+"""
+import time
+import hmac
+import logging
+import threading
+import functools
+import inspect
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from . import config
+
+ENABLED = getattr(config, 'metrics_enabled', True)
+SLOW_QUERY_MS = getattr(config, 'metrics_slow_query_ms', 200)   # 0 이면 경고 안 함
+ALLOW_IPS = tuple(getattr(config, 'metrics_allow_ips', ('127.0.0.1', '::1')))
+TOKEN = getattr(config, 'metrics_token', None)                  # 있으면 Authorization: Bearer <token> 으로도 접근
+TRUST_PROXY = getattr(config, 'metrics_trust_proxy', False)     # 앞단 프록시가 붙인 X-Forwarded-For 를 믿을지
+
+PROXY_HEADERS = ('X-Forwarded-For', 'X-Real-IP', 'Forwarded')
+
+logger = logging.getLogger(__name__)
+
+# 초 단위 히스토그램 구간 (Prometheus 기본값과 같음)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_HELP = {
+    'gagyabu_http_request_duration_seconds': ('histogram', '엔드포인트별 요청 처리 시간'),
+    'gagyabu_ledger_call_duration_seconds': ('histogram', 'ledger 함수별 실행 시간'),
+    'gagyabu_db_query_duration_seconds': ('histogram', 'ledger 함수별 쿼리 실행 시간'),
+    'gagyabu_db_query_rows_total': ('counter', 'ledger 함수별 쿼리 결과/변경 행 수'),
+    'gagyabu_db_connect_duration_seconds': ('histogram', '새 DB 연결을 여는 시간'),
+    'gagyabu_db_acquire_duration_seconds': ('histogram', '풀에서 연결을 빌리는 시간'),
+    'gagyabu_json_serialize_duration_seconds': ('histogram', 'JSON 직렬화 시간'),
+    'gagyabu_slow_queries_total': ('counter', '느린 쿼리 수'),
+}
+
+
+class Histogram:
+    """ 누적하지 않은 구간별 개수 + 합계 (출력할 때 누적) """
+
+    __slots__ = ('counts', 'sum', 'count')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)   # 마지막 칸은 +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+_lock = threading.Lock()
+_histograms = {}   # (이름, 라벨 tuple) -> Histogram
+_counters = {}     # (이름, 라벨 tuple) -> 숫자
+
+
+def observe(name, seconds, **labels):
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = Histogram()
+        hist.observe(seconds)
+
+def inc(name, value=1, **labels):
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+def reset():
+    """ 모아 둔 값을 모두 지움 (벤치마크 구간 측정용) """
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+
+
+# ---------------- ledger 함수 / 쿼리 ----------------
+
+# 지금 실행 중인 ledger 함수 이름 (쿼리 계측에서 라벨로 사용)
+_current_function = ContextVar('metrics_function', default='other')
+
+def tracked(fn):
+    """
+    ledger 함수용 데코레이터: 실행 시간을 재고, 안에서 실행한 쿼리를 이 함수 이름으로 집계
+    (동기 / async 함수 모두 가능, 꺼져 있으면 함수를 그대로 돌려줌)
+    """
+    if not ENABLED:
+        return fn
+    name = fn.__name__
+
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            token = _current_function.set(name)
+            started = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                observe('gagyabu_ledger_call_duration_seconds', time.perf_counter() - started, function=name)
+                _current_function.reset(token)
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        token = _current_function.set(name)
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            observe('gagyabu_ledger_call_duration_seconds', time.perf_counter() - started, function=name)
+            _current_function.reset(token)
+    return wrapper
+
+def record_query(sql, seconds, rowcount):
+    """ 쿼리 한 번의 시간/행 수 기록, 느리면 경고 로그 """
+    name = _current_function.get()
+    # SSCursor 처럼 행 수를 미리 알 수 없는 경우 pymysql 은 -1 (또는 2**64-1) 을 줌
+    rows = rowcount if 0 <= rowcount < 2 ** 63 else 0
+    observe('gagyabu_db_query_duration_seconds', seconds, function=name)
+    if rows:
+        inc('gagyabu_db_query_rows_total', rows, function=name)
+
+    if SLOW_QUERY_MS and seconds * 1000 >= SLOW_QUERY_MS:
+        inc('gagyabu_slow_queries_total', function=name)
+        text = ' '.join(str(sql).split())
+        logger.warning("[SLOW QUERY] %s %.0fms rows=%s: %s", name, seconds * 1000, rows, text[:200])
+
+
+def allowed(remote_addr, headers):
+    """
+    /metrics 접근 허용 여부
+        - metrics_token 이 있으면 Authorization: Bearer <token> 이 맞을 때 허용
+        - 아니면 클라이언트 IP 가 metrics_allow_ips 안에 있을 때 허용
+          같은 서버의 리버스 프록시를 거치면 remote_addr 이 127.0.0.1 이 되므로
+          metrics_trust_proxy 가 아니면 프록시 헤더가 붙은 요청은 IP 로 허용하지 않음
+          (metrics_trust_proxy 면 X-Forwarded-For 의 마지막 주소 = 프록시가 본 클라이언트 주소로 판단)
+
+    Args:
+        remote_addr (str): 소켓 상대 주소
+        headers (Mapping): 요청 헤더
+    """
+    if TOKEN:
+        auth = headers.get('Authorization') or ''
+        if auth.startswith('Bearer ') and hmac.compare_digest(auth[7:].strip().encode(), str(TOKEN).encode()):
+            return True
+
+    forwarded = headers.get('X-Forwarded-For')
+    if TRUST_PROXY and forwarded:
+        remote_addr = forwarded.split(',')[-1].strip()
+    elif not TRUST_PROXY and any(headers.get(h) for h in PROXY_HEADERS):
+        return False
+    return remote_addr in ALLOW_IPS
+
+
+class TimedCursor:
+    """
+    pymysql 커서를 감싸서 execute / executemany 시간을 기록
+    그 외 속성(fetchall, lastrowid, 반복 ...)은 원래 커서로 그대로 넘깁니다.
+    """
+
+    __slots__ = ('_cursor',)
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._cursor.close()
+
+    def execute(self, query, args=None):
+        started = time.perf_counter()
+        try:
+            return self._cursor.execute(query, args)
+        finally:
+            record_query(query, time.perf_counter() - started, self._cursor.rowcount)
+
+    def executemany(self, query, args):
+        started = time.perf_counter()
+        try:
+            return self._cursor.executemany(query, args)
+        finally:
+            record_query(query, time.perf_counter() - started, self._cursor.rowcount)
+
+
+# ---------------- HTTP 요청 / JSON ----------------
+
+def observe_request(endpoint, method, status, seconds):
+    # 없는 경로(404)는 URL 마다 라벨이 늘어나지 않게 하나로 묶음
+    observe('gagyabu_http_request_duration_seconds', seconds,
+            endpoint=endpoint or 'unmatched', method=method, status=str(status))
+
+def timed_json_provider(base):
+    """ Flask/Quart JSON provider 클래스를 받아 dumps 시간을 재는 하위 클래스를 만듦 """
+    class TimedJSONProvider(base):
+        def dumps(self, obj, **kwargs):
+            started = time.perf_counter()
+            try:
+                return super().dumps(obj, **kwargs)
+            finally:
+                observe('gagyabu_json_serialize_duration_seconds', time.perf_counter() - started)
+    return TimedJSONProvider
+
+
+# ---------------- Prometheus 텍스트 출력 ----------------
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _labels(pairs):
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs) + '}'
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def render(gauges=None):
+    """
+    Prometheus 텍스트 형식(0.0.4) 문자열
+
+    Args:
+        gauges (dict|None): 그 시점 값을 그대로 내보낼 항목 {이름: 숫자} (예: 커넥션 풀 상태)
+    """
+    with _lock:
+        hists = [(k, list(h.counts), h.sum, h.count) for k, h in _histograms.items()]
+        counters = list(_counters.items())
+
+    by_name = {}
+    for (name, pairs), counts, total, count in sorted(hists, key=lambda x: x[0]):
+        lines = by_name.setdefault(name, [])
+        cumulative = 0
+        for le, n in zip(BUCKETS + ('+Inf',), counts):
+            cumulative += n
+            lines.append(f"{name}_bucket{_labels(pairs + (('le', le),))} {cumulative}")
+        lines.append(f"{name}_sum{_labels(pairs)} {_number(total)}")
+        lines.append(f"{name}_count{_labels(pairs)} {count}")
+    for (name, pairs), value in sorted(counters):
+        by_name.setdefault(name, []).append(f"{name}{_labels(pairs)} {_number(value)}")
+
+    out = []
+    for name, lines in by_name.items():
+        kind, help_text = _HELP.get(name, ('untyped', name))
+        out.append(f"# HELP {name} {help_text}")
+        out.append(f"# TYPE {name} {kind}")
+        out.extend(lines)
+    for name, value in (gauges or {}).items():
+        out.append(f"# TYPE {name} gauge")
+        out.append(f"{name} {_number(value)}")
+    return '\n'.join(out) + '\n'
+
+def pool_gauges(stats, prefix='gagyabu_db_pool'):
+    """ pool_stats() 결과 중 숫자 항목 -> render(gauges=...) 용 dict """
+    return {f"{prefix}_{k}": v for k, v in (stats or {}).items() if isinstance(v, (int, float))}
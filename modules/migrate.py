@@ -0,0 +1,290 @@
+"""
+DB 스키마 마이그레이션
+
+migrations/ 폴더의 NNNN_이름.sql 파일을 버전 순서대로 적용/되돌립니다.
+각 파일은 '-- +migrate Up' 아래에 적용 SQL, '-- +migrate Down' 아래에 되돌리기 SQL 을 둡니다.
+적용 이력은 schema_migrations 테이블에 기록됩니다.
+
+'-- +migrate Check' 구간(선택)에는 Up 전에 실행할 SELECT 를 둡니다. 한 행이라도 나오면
+변환할 수 없는 데이터가 있다는 뜻이므로 그 행들을 출력하고 Up 을 실행하지 않습니다.
+
+사용법 (프로젝트 루트에서):
+    python -m modules.migrate status                # 적용 현황
+    python -m modules.migrate check                 # 적용 안 된 것의 Check 구간만 실행 (데이터 점검)
+    python -m modules.migrate apply [--to N]        # 아직 적용 안 된 것(또는 N 버전까지) 적용
+    python -m modules.migrate rollback [--steps N]  # 최근 적용한 N개 되돌리기 (기본 1)
+
+주의: MySQL 의 DDL(CREATE/ALTER/DROP)은 자동 커밋되므로, 중간에 실패하면
+그 파일의 앞부분은 이미 반영된 상태로 남습니다. 오류를 고친 뒤 다시 apply 하면
+이미 있는 테이블/컬럼/인덱스 오류는 건너뜁니다.
+"""
+import os
+import re
+import sys
+import argparse
+from collections import namedtuple
+
+import pymysql
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+
+Migration = namedtuple('Migration', ['version', 'name', 'up', 'down', 'check'])
+
+_FILE_RE = re.compile(r'^(\d{4})_(\w+)\.sql$')
+_SECTION_RE = re.compile(r'^--\s*\+migrate\s+(Up|Down|Check)\s*$', re.IGNORECASE | re.MULTILINE)
+
+# 손으로 먼저 만들어 둔 DB 에서도 다시 실행할 수 있도록 "이미 있음/이미 없음" 오류는 건너뜀
+# 1050: 테이블 존재, 1060: 컬럼 중복, 1061: 인덱스 이름 중복, 1091: DROP 대상 없음
+_IGNORABLE_ERRORS = {1050, 1060, 1061, 1091}
+
+_HISTORY_DDL = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version    INT          NOT NULL,
+        name       VARCHAR(100) NOT NULL,
+        applied_at TIMESTAMP    NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (version)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+"""
+
+
+def split_statements(sql):
+    """ 줄 끝의 ';' 기준으로 SQL 문장을 나눔 (주석 줄은 제외) """
+    statements, buf = [], []
+    for line in sql.splitlines():
+        if line.strip().startswith('--') or not line.strip():
+            continue
+        buf.append(line)
+        if line.rstrip().endswith(';'):
+            statements.append('\n'.join(buf).rstrip().rstrip(';'))
+            buf = []
+    if buf:
+        statements.append('\n'.join(buf))
+    return statements
+
+
+def load_migrations(directory=MIGRATIONS_DIR):
+    """ 마이그레이션 파일 목록을 버전 순서로 읽어옴 """
+    migrations = []
+    for filename in sorted(os.listdir(directory)):
+        m = _FILE_RE.match(filename)
+        if not m:
+            continue
+        with open(os.path.join(directory, filename), encoding='utf-8') as f:
+            text = f.read()
+
+        parts = _SECTION_RE.split(text)
+        sections = {parts[i].lower(): parts[i + 1] for i in range(1, len(parts) - 1, 2)}
+        if 'up' not in sections:
+            raise ValueError(f"{filename}: '-- +migrate Up' 구간이 없습니다.")
+
+        migrations.append(Migration(
+            version=int(m.group(1)),
+            name=m.group(2),
+            up=split_statements(sections['up']),
+            down=split_statements(sections.get('down', '')),
+            check=split_statements(sections.get('check', '')),
+        ))
+
+    versions = [mig.version for mig in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError("마이그레이션 버전 번호가 중복되었습니다.")
+    return migrations
+
+
+def applied_versions(db):
+    """ 이미 적용된 버전 집합 """
+    cur = db.cursor()
+    try:
+        cur.execute(_HISTORY_DDL)
+        cur.execute("SELECT version FROM schema_migrations")
+        return {row['version'] if isinstance(row, dict) else row[0] for row in cur.fetchall()}
+    finally:
+        cur.close()
+
+
+def _run_statements(db, statements, label):
+    cur = db.cursor()
+    try:
+        for stmt in statements:
+            try:
+                cur.execute(stmt)
+            except (pymysql.err.OperationalError, pymysql.err.InternalError) as e:
+                if e.args and e.args[0] in _IGNORABLE_ERRORS:
+                    print(f"  [SKIP] {label}: {e.args[1]}")
+                    continue
+                raise
+    finally:
+        cur.close()
+
+
+# Check 에서 걸린 행을 쿼리마다 몇 개까지 보여줄지
+CHECK_SHOW_ROWS = 20
+
+
+class CheckFailed(Exception):
+    """ Check 구간의 SELECT 가 행을 돌려줌 (Up 을 실행하지 않음) """
+
+
+def run_checks(db, mig):
+    """
+    Check 구간의 SELECT 를 실행해 걸린 행을 출력합니다.
+
+    Returns:
+        int: 걸린 행 수 (0 이면 통과)
+    """
+    found = 0
+    cur = db.cursor()
+    try:
+        for stmt in mig.check:
+            cur.execute(stmt)
+            rows = cur.fetchall()
+            if not rows:
+                continue
+            found += len(rows)
+            print(f"  [CHECK] {mig.version:04d}: {len(rows)}행 - {' '.join(stmt.split())}")
+            for row in rows[:CHECK_SHOW_ROWS]:
+                print(f"    {row}")
+            if len(rows) > CHECK_SHOW_ROWS:
+                print(f"    ... 외 {len(rows) - CHECK_SHOW_ROWS}행")
+    finally:
+        cur.close()
+    return found
+
+
+def check(db, target=None, migrations=None):
+    """
+    아직 적용되지 않은 마이그레이션의 Check 구간을 실행합니다. (적용은 하지 않음)
+
+    Returns:
+        dict: {version: 걸린 행 수} (걸린 것만)
+    """
+    migrations = migrations if migrations is not None else load_migrations()
+    done = applied_versions(db)
+    failed = {}
+    for mig in migrations:
+        if mig.version in done or (target is not None and mig.version > target):
+            continue
+        found = run_checks(db, mig)
+        if found:
+            failed[mig.version] = found
+    return failed
+
+
+def apply(db, target=None, migrations=None):
+    """
+    아직 적용되지 않은 마이그레이션을 순서대로 적용합니다.
+
+    Args:
+        target (int|None): 이 버전까지만 적용 (None 이면 끝까지)
+
+    Returns:
+        list: 적용한 버전 목록
+
+    Raises:
+        CheckFailed: Check 구간에 걸린 행이 있을 때 (그 버전부터는 적용하지 않음)
+    """
+    migrations = migrations if migrations is not None else load_migrations()
+    done = applied_versions(db)
+    applied = []
+    for mig in migrations:
+        if mig.version in done or (target is not None and mig.version > target):
+            continue
+        print(f"[APPLY] {mig.version:04d}_{mig.name}")
+        found = run_checks(db, mig)
+        if found:
+            raise CheckFailed(f"{mig.version:04d}_{mig.name}: 변환할 수 없는 행 {found}개를 먼저 고쳐주세요.")
+        try:
+            _run_statements(db, mig.up, f"{mig.version:04d}")
+            cur = db.cursor()
+            cur.execute("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+                        (mig.version, mig.name))
+            cur.close()
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        applied.append(mig.version)
+    return applied
+
+
+def rollback(db, steps=1, migrations=None):
+    """
+    가장 최근에 적용한 마이그레이션부터 steps 개를 되돌립니다.
+
+    Returns:
+        list: 되돌린 버전 목록
+    """
+    migrations = migrations if migrations is not None else load_migrations()
+    by_version = {mig.version: mig for mig in migrations}
+    done = sorted(applied_versions(db), reverse=True)[:steps]
+    reverted = []
+    for version in done:
+        mig = by_version.get(version)
+        if mig is None:
+            raise ValueError(f"{version:04d} 버전 파일이 없어 되돌릴 수 없습니다.")
+        print(f"[ROLLBACK] {mig.version:04d}_{mig.name}")
+        try:
+            _run_statements(db, mig.down, f"{mig.version:04d}")
+            cur = db.cursor()
+            cur.execute("DELETE FROM schema_migrations WHERE version = %s", (version,))
+            cur.close()
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        reverted.append(version)
+    return reverted
+
+
+def status(db, migrations=None):
+    """ [(version, name, 적용 여부)] """
+    migrations = migrations if migrations is not None else load_migrations()
+    done = applied_versions(db)
+    return [(mig.version, mig.name, mig.version in done) for mig in migrations]
+
+
+def main(argv=None):
+    from .user import db_connector
+    from . import storage
+
+    parser = argparse.ArgumentParser(prog="python -m modules.migrate", description="DB 스키마 마이그레이션")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("status", help="적용 현황 보기")
+    p_check = sub.add_parser("check", help="적용 안 된 마이그레이션의 데이터 점검 (Check 구간)")
+    p_check.add_argument("--to", type=int, help="이 버전까지만 점검")
+    p_apply = sub.add_parser("apply", help="마이그레이션 적용")
+    p_apply.add_argument("--to", type=int, help="이 버전까지만 적용")
+    p_rollback = sub.add_parser("rollback", help="최근 마이그레이션 되돌리기")
+    p_rollback.add_argument("--steps", type=int, default=1, help="되돌릴 개수 (기본 1)")
+    args = parser.parse_args(argv)
+
+    if storage.is_sqlite():
+        print("SQLite 백엔드는 처음 연결할 때 migrations/sqlite/schema.sql 로 스키마를 만듭니다. (마이그레이션 불필요)")
+        return 0
+
+    db = db_connector()
+    try:
+        if args.command == "apply":
+            try:
+                applied = apply(db, args.to)
+            except CheckFailed as e:
+                print(f"[CHECK FAILED] {e}")
+                return 1
+            print(f"{len(applied)}개 적용 완료" if applied else "적용할 마이그레이션이 없습니다.")
+        elif args.command == "check":
+            failed = check(db, args.to)
+            print("점검 통과" if not failed else f"점검 실패: {', '.join(f'{v:04d}' for v in failed)}")
+            return 1 if failed else 0
+        elif args.command == "rollback":
+            reverted = rollback(db, args.steps)
+            print(f"{len(reverted)}개 되돌림" if reverted else "되돌릴 마이그레이션이 없습니다.")
+        else:
+            for version, name, is_applied in status(db):
+                print(f"{'[x]' if is_applied else '[ ]'} {version:04d}_{name}")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""
+비밀번호 해시
+
+저장 형식 (user.password 컬럼, VARCHAR(255)):
+    pbkdf2_sha256$<반복 횟수>$<salt>$<hash>
+    scrypt$<n>$<r>$<p>$<salt>$<hash>
+접두어가 없는 값은 예전 평문 비밀번호로 보고, 로그인에 성공하면 해시로 바꿔 저장합니다.
+설정(방식/비용)을 바꾸면 다음 로그인 때 새 설정으로 다시 해시합니다. (needs_rehash)
+
+해시 계산은 CPU 를 오래 쓰므로 크기가 정해진 작업 스레드 풀에서 실행합니다.
+(hashlib 의 pbkdf2_hmac / scrypt 는 계산 중 GIL 을 놓기 때문에 스레드로도 병렬 처리됨)
+대기 중인 작업이 password_hash_max_pending 을 넘으면 PasswordBusyError 로 바로 거절합니다.
+"""
+import os
+import hmac
+import base64
+import asyncio
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from . import config
+
+SCHEME = getattr(config, 'password_scheme', 'pbkdf2_sha256')   # 'pbkdf2_sha256' | 'scrypt'
+PBKDF2_ITERATIONS = getattr(config, 'password_pbkdf2_iterations', 600_000)
+SCRYPT_N = getattr(config, 'password_scrypt_n', 2 ** 14)
+SCRYPT_R = getattr(config, 'password_scrypt_r', 8)
+SCRYPT_P = getattr(config, 'password_scrypt_p', 1)
+
+HASH_WORKERS = getattr(config, 'password_hash_workers', min(4, os.cpu_count() or 1))
+HASH_MAX_PENDING = getattr(config, 'password_hash_max_pending', HASH_WORKERS * 8)
+
+_SALT_BYTES = 16
+
+
+class PasswordBusyError(Exception):
+    """ 해시 작업이 너무 많이 밀려 있어서 새 요청을 받지 않을 때 (HTTP 503 으로 응답) """
+
+
+def _b64(raw):
+    return base64.b64encode(raw).decode('ascii').rstrip('=')
+
+def _unb64(text):
+    return base64.b64decode(text + '=' * (-len(text) % 4))
+
+
+# ---------------- 해시 / 검증 (현재 스레드에서 바로 계산) ----------------
+
+def hash_password_sync(password, scheme=None):
+    """ 평문 -> 저장용 해시 문자열 """
+    scheme = scheme or SCHEME
+    salt = os.urandom(_SALT_BYTES)
+    pw = password.encode('utf-8')
+    if scheme == 'pbkdf2_sha256':
+        digest = hashlib.pbkdf2_hmac('sha256', pw, salt, PBKDF2_ITERATIONS)
+        return f"pbkdf2_sha256${PBKDF2_ITERATIONS}${_b64(salt)}${_b64(digest)}"
+    if scheme == 'scrypt':
+        digest = hashlib.scrypt(pw, salt=salt, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P,
+                                maxmem=128 * SCRYPT_N * SCRYPT_R * 2, dklen=32)
+        return f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${_b64(salt)}${_b64(digest)}"
+    raise ValueError(f"지원하지 않는 비밀번호 해시 방식입니다: {scheme}")
+
+def needs_rehash(stored):
+    """ 평문이거나 현재 설정(방식/비용)과 다르게 만든 해시면 True """
+    parts = (stored or '').split('$')
+    if parts[0] != SCHEME:
+        return True
+    try:
+        if SCHEME == 'pbkdf2_sha256':
+            return int(parts[1]) != PBKDF2_ITERATIONS
+        return (int(parts[1]), int(parts[2]), int(parts[3])) != (SCRYPT_N, SCRYPT_R, SCRYPT_P)
+    except (IndexError, ValueError):
+        return True
+
+_dummy_hash = None
+
+def _get_dummy_hash():
+    """ 없는 아이디를 검증할 때 쓰는 해시 (현재 설정으로 한 번 만들어 둠) """
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = hash_password_sync(os.urandom(_SALT_BYTES).hex())
+    return _dummy_hash
+
+def verify_password_sync(password, stored):
+    """
+    stored 가 None 이면(없는 아이디) 고정된 더미 해시와 비교해서 항상 실패
+    (있는 아이디와 같은 시간이 걸리므로 응답 시간으로 아이디가 있는지 알 수 없음)
+
+    Returns:
+        tuple: (일치 여부, 다시 해시해서 저장해야 하는지)
+    """
+    if stored is None:
+        verify_password_sync(password, _get_dummy_hash())
+        return False, False
+    stored = stored or ''
+    pw = password.encode('utf-8')
+    parts = stored.split('$')
+    try:
+        if parts[0] == 'pbkdf2_sha256' and len(parts) == 4:
+            iterations, salt, expected = int(parts[1]), _unb64(parts[2]), _unb64(parts[3])
+            digest = hashlib.pbkdf2_hmac('sha256', pw, salt, iterations)
+        elif parts[0] == 'scrypt' and len(parts) == 6:
+            n, r, p = int(parts[1]), int(parts[2]), int(parts[3])
+            salt, expected = _unb64(parts[4]), _unb64(parts[5])
+            digest = hashlib.scrypt(pw, salt=salt, n=n, r=r, p=p, maxmem=128 * n * r * 2, dklen=len(expected))
+        else:
+            # 예전 평문 비밀번호
+            ok = hmac.compare_digest(pw, stored.encode('utf-8'))
+            return ok, ok
+    except (ValueError, TypeError):
+        return False, False
+
+    ok = hmac.compare_digest(digest, expected)
+    return ok, ok and needs_rehash(stored)
+
+
+# ---------------- 작업 스레드 풀 ----------------
+
+_executor = None
+_executor_lock = threading.Lock()
+_pending = threading.BoundedSemaphore(HASH_MAX_PENDING)
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix='pwhash')
+    return _executor
+
+def _submit(fn, *args):
+    """ 작업 풀에 넣고 Future 반환 (대기 작업이 가득 차 있으면 PasswordBusyError) """
+    if not _pending.acquire(blocking=False):
+        raise PasswordBusyError("로그인 요청이 많아 잠시 후 다시 시도해주세요.")
+    try:
+        future = _get_executor().submit(fn, *args)
+    except Exception:
+        _pending.release()
+        raise
+    future.add_done_callback(lambda _: _pending.release())
+    return future
+
+def hash_password(password):
+    """ 작업 풀에서 해시 (동기 앱용, 끝날 때까지 기다림) """
+    return _submit(hash_password_sync, password).result()
+
+def verify_password(password, stored):
+    """ 작업 풀에서 검증 -> (일치 여부, 다시 해시 필요 여부) """
+    return _submit(verify_password_sync, password, stored).result()
+
+async def hash_password_async(password):
+    """ 비동기 앱(asgi.py)용: 이벤트 루프를 막지 않고 작업 풀 결과를 기다림 """
+    return await asyncio.wrap_future(_submit(hash_password_sync, password))
+
+async def verify_password_async(password, stored):
+    return await asyncio.wrap_future(_submit(verify_password_sync, password, stored))
@@ -0,0 +1,83 @@
+"""
+토큰 버킷 방식 요청 제한 (로그인/회원가입 폭주 방지)
+
+키(IP, 아이디 등)마다 버킷을 두고 초당 rate 개씩 토큰을 채웁니다. 요청 한 번에 토큰 하나를 쓰고,
+버킷이 비어 있으면 거절합니다. 버킷 수는 max_keys 로 제한해서(LRU) 메모리가 늘어나지 않게 합니다.
+프로세스 단위이므로 워커를 여러 개 띄우면 워커 수만큼 느슨해집니다.
+"""
+import time
+import threading
+from collections import OrderedDict
+
+from . import config
+
+
+class TokenBucketLimiter:
+    """
+    Args:
+        rate (float): 초당 채워지는 토큰 수
+        burst (int): 버킷 크기 (연속으로 허용하는 최대 요청 수)
+        max_keys (int): 기억하는 최대 키 수
+    """
+
+    def __init__(self, rate, burst, max_keys=10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()   # key -> [tokens, 마지막 갱신 시각]
+        self._lock = threading.Lock()
+
+    def allow(self, key, cost=1):
+        """
+        Returns:
+            tuple: (허용 여부, 다시 시도까지 남은 초)
+        """
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = [float(self.burst), now]
+                self._buckets[key] = bucket
+                while len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+            self._buckets.move_to_end(key)
+
+            if bucket[0] >= cost:
+                bucket[0] -= cost
+                return True, 0.0
+            return False, (cost - bucket[0]) / self.rate
+
+    def reset(self, key):
+        """ 로그인 성공 등으로 해당 키의 제한을 풀어줌 """
+        with self._lock:
+            self._buckets.pop(key, None)
+
+
+# IP 별: 분당 20회, 연속 10회 / 아이디 별: 분당 5회, 연속 5회 (config.py 에서 조절)
+login_by_ip = TokenBucketLimiter(
+    rate=getattr(config, 'login_rate_per_ip', 20) / 60,
+    burst=getattr(config, 'login_burst_per_ip', 10),
+)
+login_by_id = TokenBucketLimiter(
+    rate=getattr(config, 'login_rate_per_id', 5) / 60,
+    burst=getattr(config, 'login_burst_per_id', 5),
+)
+
+def check_login(ip, user_id):
+    """
+    로그인 시도 허용 여부 (IP, 아이디 버킷 모두 통과해야 함)
+
+    Returns:
+        tuple: (허용 여부, 다시 시도까지 남은 초)
+    """
+    ok, wait = login_by_ip.allow(ip)
+    if not ok:
+        return False, wait
+    if user_id:
+        ok, wait = login_by_id.allow(str(user_id))
+        if not ok:
+            return False, wait
+    return True, 0.0
@@ -0,0 +1,433 @@
+"""
+반복 내역 (월세, 월급, 구독료 등)
+
+규칙(recurring_rule)은 사용자별로 저장합니다. (migrations/0006_recurring.sql)
+    - freq: daily / weekly / monthly, every: 간격 (예: weekly + every 2 = 격주, monthly + every 3 = 분기)
+    - start_date 부터 end_date(포함, 없으면 계속)까지. monthly 는 시작일의 "일"을 따르고 짧은 달은 말일
+
+스케줄러가 날짜가 된 회차를 ledger 에 넣습니다. (materialize)
+    - 한 번 실행할 때 모든 규칙의 밀린 회차를 모아 executemany 한 번으로 INSERT (행마다 INSERT 하지 않음)
+    - 넣은 회차는 recurring_occurrence 에 (rule_id, period) 기본키로 기록해서 같은 회차는 두 번 들어가지 않음
+      (규칙 행은 FOR UPDATE 로 잠그고 next_date 를 같은 트랜잭션에서 옮김)
+    - 요약 테이블은 같은 트랜잭션에서, 통계 캐시는 commit 후 insert_transaction 과 같이 갱신
+    - 넣은 내역을 사용자가 지워도 그 회차는 다시 만들지 않음
+
+이번 달 통계는 아직 넣지 않은 회차(next_date 부터 말일까지)를 예정 금액으로 더한 누적 시리즈도 볼 수 있습니다.
+(select_upcoming -> ledger.select_month_dashboard 의 upcoming, /api/stats/monthly-spend?projected=1)
+
+사용법 (프로젝트 루트에서):
+    python -m modules.recurring run [--date YYYY-MM-DD]   # 밀린 회차 넣기 (cron 으로 하루 한 번 등)
+python app.py / wsgi.py 로 띄우면 recurring_scheduler_enabled 일 때 백그라운드 스레드가 recurring_interval 초마다 실행합니다.
+"""
+import sys
+import argparse
+import threading
+from calendar import monthrange
+from datetime import date, timedelta
+
+import pymysql
+
+from .user import db_connector
+from . import config, ledger, summary, metrics
+
+FREQUENCIES = ('daily', 'weekly', 'monthly')
+EVERY_MAX = 366
+RULES_MAX = 100                    # 사용자당 규칙 수
+
+SCHEDULER_ENABLED = getattr(config, 'recurring_scheduler_enabled', True)
+INTERVAL = getattr(config, 'recurring_interval', 3600)          # 스케줄러 실행 간격(초)
+BATCH_MAX_ROWS = getattr(config, 'recurring_batch_max', 1000)    # 한 번 실행에 넣는 최대 행 수 (넘으면 다음 실행에서 이어서)
+
+RULE_COLUMNS = "id, type, description, amount, category, pay, freq, every, start_date, end_date, next_date"
+
+SELECT_RULES_SQL = "SELECT " + RULE_COLUMNS + " FROM recurring_rule WHERE user_id = %s ORDER BY id"
+
+INSERT_RULE_SQL = """
+    INSERT INTO recurring_rule (user_id, type, description, amount, category, pay, freq, every,
+                                start_date, end_date, next_date)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+# 날짜가 된 규칙 (id 순서로 잠가서 동시에 실행해도 교착되지 않게 함)
+DUE_RULES_SQL = ("SELECT user_id, " + RULE_COLUMNS + " FROM recurring_rule "
+                 "WHERE next_date IS NOT NULL AND next_date <= %s ORDER BY id FOR UPDATE")
+
+# (user_id, 말일 다음날) -> 이번 달 안에 아직 넣지 않은 회차가 있는 규칙
+UPCOMING_RULES_SQL = ("SELECT " + RULE_COLUMNS + " FROM recurring_rule "
+                      "WHERE user_id = %s AND next_date IS NOT NULL AND next_date < %s")
+
+INSERT_OCCURRENCE_SQL = "INSERT INTO recurring_occurrence (rule_id, period) VALUES (%s, %s)"
+ADVANCE_RULE_SQL = "UPDATE recurring_rule SET next_date = %s WHERE id = %s"
+
+
+# ---------------- 회차 계산 (DB 접근 없음) ----------------
+
+def _add_months(d, months):
+    """ d 의 "일"을 유지한 채 months 달 뒤 (없는 날짜면 그 달 말일) """
+    y, m = divmod(d.month - 1 + months, 12)
+    y += d.year
+    return date(y, m + 1, min(d.day, monthrange(y, m + 1)[1]))
+
+def occurrence_dates(rule, since, until=None):
+    """
+    since 이후(포함) 회차 날짜를 차례로 (until, end_date 중 이른 날까지, 둘 다 없으면 끝없이)
+
+    Args:
+        rule (dict): freq, every, start_date, end_date 가 있는 규칙 행
+    """
+    start, every = rule['start_date'], int(rule['every'])
+    last = min(filter(None, (until, rule['end_date'])), default=None)
+    since = max(since, start)
+
+    if rule['freq'] == 'monthly':
+        # 시작일 기준 k*every 달 뒤 (직전 회차 기준으로 더하면 31일 -> 28일 -> 28일 처럼 밀림)
+        k = ((since.year - start.year) * 12 + since.month - start.month) // every
+        while True:
+            d = _add_months(start, k * every)
+            if last is not None and d > last:
+                return
+            if d >= since:
+                yield d
+            k += 1
+    else:
+        step = every * (7 if rule['freq'] == 'weekly' else 1)
+        d = start + timedelta(days=-(-(since - start).days // step) * step)
+        while last is None or d <= last:
+            yield d
+            d += timedelta(days=step)
+
+def first_date(rule, since):
+    """ since 이후 첫 회차 (없으면 None = 끝난 규칙) """
+    return next(occurrence_dates(rule, since), None)
+
+def _parse_date(value, name):
+    try:
+        return date.fromisoformat(str(value or '')[:10])
+    except ValueError:
+        raise ValueError(f"{name} 는 YYYY-MM-DD 형식이어야 합니다.")
+
+def check_rule(data):
+    """
+    규칙 입력값 검증/정규화 (내역 항목 이름은 /add, 배치 API 와 같음: desc, payment_method)
+
+    Raises:
+        ValueError: 값이 잘못되었을 때
+    """
+    start_date = _parse_date(data.get('start_date'), 'start_date')
+    fields = ledger._normalize_fields(dict(data, date=start_date.isoformat()))
+    if fields['type'] == '입금':
+        fields['pay'] = None
+
+    rule = {
+        'type': fields['type'],
+        'description': fields['description'],
+        'amount': fields['amount'],
+        'category': fields.get('category'),
+        'pay': fields.get('pay'),
+        'start_date': start_date,
+        'end_date': None,
+    }
+    rule['freq'] = data.get('freq')
+    if rule['freq'] not in FREQUENCIES:
+        raise ValueError(f"freq 는 {', '.join(FREQUENCIES)} 중 하나여야 합니다.")
+    try:
+        rule['every'] = int(data.get('every') or 1)
+    except (TypeError, ValueError):
+        raise ValueError("every 는 숫자여야 합니다.")
+    if not 1 <= rule['every'] <= EVERY_MAX:
+        raise ValueError(f"every 는 1 ~ {EVERY_MAX} 이어야 합니다.")
+    if data.get('end_date'):
+        rule['end_date'] = _parse_date(data['end_date'], 'end_date')
+        if rule['end_date'] < rule['start_date']:
+            raise ValueError("end_date 는 start_date 보다 빠를 수 없습니다.")
+    return rule
+
+def upcoming_by_day(rules, start, end):
+    """
+    아직 넣지 않은 회차(next_date 이후)를 [start, end) 일별 합계로 (aggregate.FIELDS 형식)
+
+    Returns:
+        dict: {date: {'income', 'spend', 'card', 'transfer', 'other'}}
+    """
+    by_day = {}
+    for rule in rules:
+        amount = summary.to_amount(rule['amount'])
+        for d in occurrence_dates(rule, max(rule['next_date'], start), end - timedelta(days=1)):
+            acc = by_day.setdefault(d, {'income': 0, 'spend': 0, 'card': 0, 'transfer': 0, 'other': 0})
+            if rule['type'] == '입금':
+                acc['income'] += amount
+                continue
+            acc['spend'] += amount
+            if rule['pay']:  # 결제수단이 없으면 통계의 card/transfer/other 어디에도 넣지 않음
+                acc[{'카드': 'card', '계좌이체': 'transfer'}.get(rule['pay'], 'other')] += amount
+    return by_day
+
+def upcoming_bounds(year, month, today):
+    """ 예정 금액을 더할 달이면 (1일, 다음 달 1일), 아니면 None (이번 달만 예정 금액을 더함) """
+    if (year, month) != (today.year, today.month):
+        return None
+    start, end, _ = ledger._month_bounds(year, month)
+    return start, end
+
+
+# ---------------- 규칙 관리 ----------------
+
+def select_rules(user_id):
+    db = cur = None
+    try:
+        db = db_connector()
+        cur = db.cursor(pymysql.cursors.DictCursor)
+        cur.execute(SELECT_RULES_SQL, (user_id,))
+        return cur.fetchall()
+    finally:
+        if cur: cur.close()
+        if db: db.close()
+
+def create_rule(user_id, data):
+    """
+    규칙 추가 (시작일이 지난 규칙은 다음 materialize 에서 밀린 회차를 모두 넣음)
+
+    Returns:
+        int: 새 규칙 id
+
+    Raises:
+        ValueError: 입력값이 잘못되었거나 규칙이 너무 많을 때
+    """
+    rule = check_rule(data)
+    rule['next_date'] = first_date(rule, rule['start_date'])
+    db = cur = None
+    try:
+        db = db_connector()
+        cur = db.cursor(pymysql.cursors.DictCursor)
+        cur.execute("SELECT COUNT(*) AS cnt FROM recurring_rule WHERE user_id = %s", (user_id,))
+        if cur.fetchone()['cnt'] >= RULES_MAX:
+            raise ValueError(f"반복 내역은 최대 {RULES_MAX}개까지 만들 수 있습니다.")
+
+        cur.execute(INSERT_RULE_SQL, (user_id, rule['type'], rule['description'], rule['amount'],
+                                      rule['category'], rule['pay'], rule['freq'], rule['every'],
+                                      rule['start_date'], rule['end_date'], rule['next_date']))
+        db.commit()
+        rule_id = cur.lastrowid
+    except Exception as e:
+        if db: db.rollback()
+        raise e
+    finally:
+        if cur: cur.close()
+        if db: db.close()
+
+    # 이번 달 예정 금액이 바뀜
+    ledger.invalidate_caches(user_id, date.today())
+    return rule_id
+
+def end_rule(user_id, rule_id, end_date):
+    """
+    규칙 종료일 변경 (YYYY-MM-DD, 비어 있으면 종료일 없음). 이미 넣은 회차는 그대로 둠
+
+    Returns:
+        bool: 규칙이 있었는지
+
+    Raises:
+        ValueError: 날짜가 잘못되었을 때
+    """
+    end_date = _parse_date(end_date, 'end_date') if end_date else None
+    db = cur = None
+    try:
+        db = db_connector()
+        cur = db.cursor(pymysql.cursors.DictCursor)
+        cur.execute("SELECT " + RULE_COLUMNS + " FROM recurring_rule WHERE id = %s AND user_id = %s FOR UPDATE",
+                    (rule_id, user_id))
+        rule = cur.fetchone()
+        if rule is None:
+            db.rollback()
+            return False
+        if end_date is not None and end_date < rule['start_date']:
+            raise ValueError("end_date 는 start_date 보다 빠를 수 없습니다.")
+
+        # 다음 회차: 이미 넣은 마지막 회차 다음부터 다시 계산 (종료일을 늘리면 끝난 규칙도 다시 이어짐)
+        cur.execute("SELECT period FROM recurring_occurrence WHERE rule_id = %s ORDER BY period DESC LIMIT 1",
+                    (rule_id,))
+        last = (cur.fetchone() or {}).get('period')
+        rule['end_date'] = end_date
+        next_date = first_date(rule, last + timedelta(days=1) if last else rule['start_date'])
+
+        cur.execute("UPDATE recurring_rule SET end_date = %s, next_date = %s WHERE id = %s",
+                    (end_date, next_date, rule_id))
+        db.commit()
+    except Exception as e:
+        if db: db.rollback()
+        raise e
+    finally:
+        if cur: cur.close()
+        if db: db.close()
+
+    ledger.invalidate_caches(user_id, date.today())
+    return True
+
+def delete_rule(user_id, rule_id):
+    """
+    규칙 삭제 (이미 넣은 내역은 일반 내역으로 남음)
+
+    Returns:
+        bool: 규칙이 있었는지
+    """
+    db = cur = None
+    try:
+        db = db_connector()
+        cur = db.cursor()
+        cur.execute("DELETE FROM recurring_rule WHERE id = %s AND user_id = %s", (rule_id, user_id))
+        if cur.rowcount == 0:
+            db.rollback()
+            return False
+        cur.execute("DELETE FROM recurring_occurrence WHERE rule_id = %s", (rule_id,))
+        db.commit()
+    except Exception as e:
+        if db: db.rollback()
+        raise e
+    finally:
+        if cur: cur.close()
+        if db: db.close()
+
+    ledger.invalidate_caches(user_id, date.today())
+    return True
+
+
+# ---------------- 회차 넣기 ----------------
+
+def _due_occurrences(rules, today, limit):
+    """
+    규칙별 밀린 회차 (today 까지, 전체 limit 건까지)
+
+    Returns:
+        tuple: ([(rule, 날짜)], {rule_id: 새 next_date})
+    """
+    due, advance = [], {}
+    for rule in rules:
+        next_date = None
+        for d in occurrence_dates(rule, rule['next_date']):
+            if d > today or len(due) >= limit:
+                next_date = d
+                break
+            due.append((rule, d))
+        advance[rule['id']] = next_date
+    return due, advance
+
+@metrics.tracked
+def materialize(today=None, limit=BATCH_MAX_ROWS):
+    """
+    모든 사용자의 밀린 회차를 ledger 에 넣음 (트랜잭션 하나, ledger INSERT 는 executemany 한 번)
+
+    Returns:
+        int: 넣은 행 수 (limit 과 같으면 남은 회차가 있을 수 있음)
+    """
+    today = today or date.today()
+    db = cur = None
+    try:
+        db = db_connector()
+        cur = db.cursor(pymysql.cursors.DictCursor)
+        cur.execute(DUE_RULES_SQL, (today,))
+        rules = cur.fetchall()
+        if not rules:
+            db.rollback()
+            return 0
+
+        due, advance = _due_occurrences(rules, today, limit)
+
+        # next_date 를 되돌리거나 종료일을 늘린 규칙에서 이미 넣은 회차는 건너뜀
+        if due:
+            placeholders = ", ".join(["%s"] * len(rules))
+            cur.execute("SELECT rule_id, period FROM recurring_occurrence "
+                        "WHERE rule_id IN (" + placeholders + ") AND period >= %s AND period <= %s",
+                        [r['id'] for r in rules] + [min(d for _, d in due), today])
+            done = {(r['rule_id'], r['period']) for r in cur.fetchall()}
+            due = [(rule, d) for rule, d in due if (rule['id'], d) not in done]
+
+        params = [(rule['user_id'], d, rule['type'], rule['description'], summary.to_amount(rule['amount']),
+                   rule['category'], rule['pay']) for rule, d in due]
+        if params:
+            cur.executemany(ledger.INSERT_SQL, params)
+            cur.executemany(INSERT_OCCURRENCE_SQL, [(rule['id'], d) for rule, d in due])
+            summary.apply_deltas(cur, [(p[0], p[1], p[2], p[5], p[6], p[4], 1) for p in params])
+        cur.executemany(ADVANCE_RULE_SQL, [(next_date, rule_id) for rule_id, next_date in advance.items()])
+        db.commit()
+    except Exception as e:
+        if db: db.rollback()
+        raise e
+    finally:
+        if cur: cur.close()
+        if db: db.close()
+
+    dates_by_user = {}
+    for p in params:
+        dates_by_user.setdefault(p[0], set()).add(p[1])
+    for user_id, dates in dates_by_user.items():
+        ledger.invalidate_caches(user_id, *sorted(dates))
+    return len(params)
+
+def run(today=None):
+    """ 밀린 회차가 없을 때까지 materialize 반복 (BATCH_MAX_ROWS 씩) """
+    total = 0
+    while True:
+        n = materialize(today)
+        total += n
+        if n < BATCH_MAX_ROWS:
+            return total
+
+
+# ---------------- 이번 달 예정 금액 ----------------
+
+@metrics.tracked
+def select_upcoming(user_id, year, month, today=None):
+    """
+    이번 달 남은 회차의 일별 합계 (통계 함수의 upcoming 인자, 이번 달이 아니면 None)
+    """
+    bounds = upcoming_bounds(year, month, today or date.today())
+    if bounds is None:
+        return None
+    db = cur = None
+    try:
+        db = db_connector()
+        cur = db.cursor(pymysql.cursors.DictCursor)
+        cur.execute(UPCOMING_RULES_SQL, (user_id, bounds[1]))
+        return upcoming_by_day(cur.fetchall(), *bounds)
+    finally:
+        if cur: cur.close()
+        if db: db.close()
+
+
+# ---------------- 백그라운드 스케줄러 ----------------
+
+_worker = None
+_stop = threading.Event()
+
+def _loop():
+    while True:
+        try:
+            n = run()
+            if n:
+                print(f"[RECURRING] {n}건 추가")
+        except Exception as e:
+            print(f"[RECURRING ERROR] {type(e).__name__}: {e}")
+        if _stop.wait(INTERVAL):
+            return
+
+def start():
+    """ 스케줄러 스레드 시작 (앱 생성 시 한 번 호출, 여러 프로세스가 함께 돌려도 회차는 한 번만 들어감) """
+    global _worker
+    if _worker is not None or not SCHEDULER_ENABLED:
+        return
+    _worker = threading.Thread(target=_loop, name='recurring-scheduler', daemon=True)
+    _worker.start()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m modules.recurring", description="반복 내역 회차 넣기")
+    parser.add_argument("command", choices=["run"])
+    parser.add_argument("--date", type=date.fromisoformat, default=None, help="기준 날짜 (기본: 오늘)")
+    args = parser.parse_args(argv)
+
+    print(f"{run(args.date)}건 추가")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""
+응답 직렬화 (JSON 인코딩, 내역 행 컬럼 선택, gzip 압축)
+
+    - JSON: orjson 이 있으면 사용, 없으면 표준 json (date/datetime -> ISO 문자열, Decimal -> 숫자)
+      app.json 을 json_provider() 로 바꿔서 jsonify / app.json.dumps 가 모두 이 인코더를 씀
+    - 내역 행: 화면이 쓰는 컬럼(ROW_FIELDS)만 보냄 (user_id 등 제외)
+      ?compact=1 이면 {'columns': [...], 'rows': [[...], ...]} (키 이름을 행마다 반복하지 않음)
+    - gzip: 브라우저가 받을 수 있고 본문이 GZIP_MIN_SIZE 이상인 JSON/HTML 응답은 압축해서 보냄
+"""
+import gzip
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from operator import itemgetter
+
+from . import config
+
+try:
+    import orjson
+except ImportError:  # orjson 은 선택 사항 (없으면 표준 json)
+    orjson = None
+
+GZIP_ENABLED = getattr(config, 'gzip_enabled', True)
+GZIP_MIN_SIZE = getattr(config, 'gzip_min_size', 1024)   # 바이트, 이보다 작으면 압축 이득이 거의 없음
+GZIP_LEVEL = getattr(config, 'gzip_level', 6)
+GZIP_MIMETYPES = {'application/json', 'text/html'}
+
+# 내역 행에서 화면(ledger.js)이 쓰는 컬럼 (순서는 compact 형식의 columns)
+ROW_FIELDS = ('id', 'date', 'type', 'description', 'amount', 'category', 'pay')
+
+
+# ---------------- JSON ----------------
+
+def _default(obj):
+    if isinstance(obj, (date, datetime)):
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    raise TypeError(f"JSON 으로 바꿀 수 없는 값: {type(obj).__name__}")
+
+def dumps(obj, sort_keys=False, indent=None):
+    """ obj -> JSON 문자열 (UTF-8 그대로, 공백 없음) """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=option).decode('utf-8')
+    return json.dumps(obj, default=_default, ensure_ascii=False, sort_keys=sort_keys, indent=indent,
+                      separators=(',', ':') if indent is None else None)
+
+def json_provider(base):
+    """ Flask/Quart JSON provider 클래스를 받아 dumps 를 이 모듈의 dumps 로 바꾼 하위 클래스를 만듦 """
+    class FastJSONProvider(base):
+        def dumps(self, obj, **kwargs):
+            # jsonify 가 주는 separators 는 무시 (항상 공백 없음), 디버그 모드의 indent 만 따름
+            return dumps(obj, sort_keys=kwargs.get('sort_keys', self.sort_keys), indent=kwargs.get('indent'))
+    return FastJSONProvider
+
+
+# ---------------- 내역 행 ----------------
+
+_row_values = itemgetter(*ROW_FIELDS)
+
+def rows(items, compact=False):
+    """
+    DB 행(dict) 목록 -> 응답용 값 (ROW_FIELDS 만)
+
+    Returns:
+        list | dict: [{id, date, ...}, ...] 또는 compact 면 {'columns': [...], 'rows': [[...], ...]}
+    """
+    if compact:
+        return {'columns': list(ROW_FIELDS), 'rows': [_row_values(r) for r in items]}
+    return [dict(zip(ROW_FIELDS, _row_values(r))) for r in items]
+
+def row(item):
+    """ DB 행 하나 -> ROW_FIELDS 만 남긴 dict """
+    return dict(zip(ROW_FIELDS, _row_values(item)))
+
+
+# ---------------- gzip ----------------
+
+def should_compress(resp, accept_encodings):
+    """ 압축할 응답인지 (상태/형식/이미 압축됐는지/브라우저 지원) - 본문 크기는 compress() 에서 확인 """
+    return (GZIP_ENABLED
+            and resp.status_code == 200
+            and resp.mimetype in GZIP_MIMETYPES
+            and 'Content-Encoding' not in resp.headers
+            and accept_encodings['gzip'] > 0)
+
+def compress(resp, data):
+    """ 본문이 GZIP_MIN_SIZE 이상이면 gzip 으로 바꾸고 헤더 설정 (ETag 는 약한 ETag 로) """
+    resp.vary.add('Accept-Encoding')
+    if len(data) < GZIP_MIN_SIZE:
+        return resp
+    resp.set_data(gzip.compress(data, compresslevel=GZIP_LEVEL))
+    resp.headers['Content-Encoding'] = 'gzip'
+    etag, weak = resp.get_etag()
+    if etag and not weak:
+        # 압축 전/후 본문이 달라서 강한 ETag 는 쓸 수 없음 (If-None-Match 는 약한 비교라 재검증은 그대로 동작)
+        resp.set_etag(etag, weak=True)
+    return resp
@@ -0,0 +1,289 @@
+"""
+SQLite 백엔드 (config.storage_backend = 'sqlite')
+
+파일 하나(config.sqlite_path)에 저장하는 내장 DB 입니다. 네트워크 왕복이 없어서
+혼자 쓰는 서버나 개발/테스트 환경에 맞습니다.
+
+ledger.py / user.py 가 MySQL 용으로 쓰는 코드를 그대로 쓸 수 있도록 pymysql 연결처럼 동작합니다.
+    - %s 자리표시자 -> ?, 끝의 FOR UPDATE 는 제거 (SQL 변환 결과는 캐시)
+    - 행은 항상 dict, DATE 컬럼은 datetime.date 로 변환
+    - 쓰기 문장이나 FOR UPDATE 조회가 처음 나오면 BEGIN IMMEDIATE 로 쓰기 잠금을 잡고 시작
+      (읽기만 하는 연결은 트랜잭션 없이 문장마다 최신 데이터를 읽음)
+    - executemany 로 INSERT 하면 lastrowid 는 MySQL 처럼 첫 행의 id
+    - 오류는 pymysql.err.* 로 바꿔서 던짐 (UNIQUE 위반 -> IntegrityError(1062))
+    - db.close() 는 연결을 끊지 않고 유휴 목록에 반납
+
+연결은 WAL 모드로 열어 읽기와 쓰기가 서로 막지 않고, 문장은 연결마다 준비된 상태로 캐시됩니다.
+스키마(migrations/sqlite/schema.sql)는 프로세스에서 처음 연결할 때 만듭니다.
+"""
+import os
+import re
+import time
+import sqlite3
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+
+import pymysql
+
+from . import config
+from . import metrics
+
+PATH = getattr(config, 'sqlite_path', 'gagyabu.sqlite3')
+BUSY_TIMEOUT = getattr(config, 'pool_wait_timeout', 5)           # 쓰기 잠금을 기다리는 최대 시간(초)
+STATEMENT_CACHE = getattr(config, 'sqlite_statement_cache', 256)  # 연결별 준비된 문장 수
+MAX_IDLE = getattr(config, 'pool_max_size', 10)                   # 반납 후 열어 둘 연결 수
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           'migrations', 'sqlite', 'schema.sql')
+
+# pymysql 과 같은 오류 코드 (user.DUP_ENTRY 와 같음)
+DUP_ENTRY = 1062
+CHECK_VIOLATED = 3819
+
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_adapter(datetime, lambda v: v.isoformat(' '))
+sqlite3.register_adapter(Decimal, lambda v: int(v) if v == v.to_integral_value() else float(v))
+sqlite3.register_converter('DATE', lambda raw: date.fromisoformat(raw.decode()[:10]))
+
+
+# ---------------- SQL 변환 ----------------
+
+_PARAM_RE = re.compile(r'%([%s])')
+_FOR_UPDATE_RE = re.compile(r'\s+FOR\s+UPDATE\s*$', re.IGNORECASE)
+_WRITE_RE = re.compile(r'^\s*(INSERT|UPDATE|DELETE|REPLACE)\b', re.IGNORECASE)
+
+_translated = {}
+_TRANSLATE_CACHE_SIZE = 1024
+
+def translate(sql, with_args=True):
+    """
+    pymysql 형식 SQL -> (SQLite SQL, 쓰기 잠금이 필요한지)
+    pymysql 처럼 인자가 있을 때만 %s / %% 를 바꿉니다.
+    """
+    key = (sql, with_args)
+    hit = _translated.get(key)
+    if hit is not None:
+        return hit
+
+    text = sql.strip().rstrip(';')
+    locking = bool(_FOR_UPDATE_RE.search(text) or _WRITE_RE.match(text))
+    text = _FOR_UPDATE_RE.sub('', text)
+    if with_args:
+        text = _PARAM_RE.sub(lambda m: '%' if m.group(1) == '%' else '?', text)
+
+    hit = (text, locking)
+    if len(_translated) < _TRANSLATE_CACHE_SIZE:
+        _translated[key] = hit
+    return hit
+
+def _params(args):
+    if args is None:
+        return ()
+    if isinstance(args, (tuple, list)):
+        return args
+    return (args,)
+
+def _reraise(e):
+    """ sqlite3 오류 -> pymysql 오류 (기존 except pymysql.err.* 처리를 그대로 쓰기 위해) """
+    message = str(e)
+    if isinstance(e, sqlite3.IntegrityError):
+        if message.startswith('UNIQUE') or 'PRIMARY KEY' in message:
+            raise pymysql.err.IntegrityError(DUP_ENTRY, message) from e
+        if message.startswith('CHECK'):
+            raise pymysql.err.IntegrityError(CHECK_VIOLATED, message) from e
+        raise pymysql.err.IntegrityError(0, message) from e
+    if isinstance(e, sqlite3.OperationalError):
+        raise pymysql.err.OperationalError(0, message) from e
+    raise pymysql.err.DatabaseError(0, message) from e
+
+
+# ---------------- 커서 / 연결 ----------------
+
+def _dict_row(cursor, row):
+    return {col[0]: value for col, value in zip(cursor.description, row)}
+
+
+class Cursor:
+    """ pymysql DictCursor 처럼 쓰는 커서 """
+
+    def __init__(self, conn):
+        self._conn = conn
+        self._cur = conn._raw.cursor()
+        self.lastrowid = None
+        self.rowcount = -1
+
+    @property
+    def description(self):
+        return self._cur.description
+
+    def execute(self, query, args=None):
+        text, locking = translate(query, args is not None)
+        try:
+            self._conn._begin(locking)
+            self._cur.execute(text, _params(args))
+        except sqlite3.Error as e:
+            _reraise(e)
+        self.lastrowid = self._cur.lastrowid
+        self.rowcount = self._cur.rowcount
+        return self.rowcount
+
+    def executemany(self, query, args):
+        rows = [_params(a) for a in args]
+        if not rows:
+            return 0
+        text, locking = translate(query, True)
+        try:
+            self._conn._begin(locking)
+            # 첫 행만 따로 실행해서 id 를 기억 (쓰기 잠금 안이라 나머지 id 는 연속으로 배정됨)
+            self._cur.execute(text, rows[0])
+            first_id, total = self._cur.lastrowid, self._cur.rowcount
+            if len(rows) > 1:
+                self._cur.executemany(text, rows[1:])
+                total += self._cur.rowcount
+        except sqlite3.Error as e:
+            _reraise(e)
+        self.lastrowid = first_id
+        self.rowcount = total
+        return total
+
+    def fetchone(self):
+        return self._cur.fetchone()
+
+    def fetchmany(self, size=None):
+        return self._cur.fetchmany(size or self._cur.arraysize)
+
+    def fetchall(self):
+        return self._cur.fetchall()
+
+    def __iter__(self):
+        return iter(self._cur)
+
+    def close(self):
+        self._cur.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class Connection:
+    """ db_connector() 가 돌려주는 연결 (close() 하면 유휴 목록으로 반납) """
+
+    def __init__(self, raw):
+        self._raw = raw
+
+    def cursor(self, *args, **kwargs):
+        """ 커서 종류(DictCursor, SSDictCursor ...) 인자는 무시, 항상 dict 행을 돌려줌 """
+        if self._raw is None:
+            raise pymysql.err.InterfaceError(0, "이미 반납된 연결입니다.")
+        cur = Cursor(self)
+        return metrics.TimedCursor(cur) if metrics.ENABLED else cur
+
+    def _begin(self, locking):
+        if locking and not self._raw.in_transaction:
+            self._raw.execute("BEGIN IMMEDIATE")
+
+    def commit(self):
+        try:
+            self._raw.commit()
+        except sqlite3.Error as e:
+            _reraise(e)
+
+    def rollback(self):
+        self._raw.rollback()
+
+    def ping(self, reconnect=False):
+        self._raw.execute("SELECT 1")
+
+    def close(self):
+        raw, self._raw = self._raw, None
+        if raw is not None:
+            _release(raw)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+# ---------------- 연결 관리 ----------------
+
+_idle = []
+_lock = threading.Lock()
+_schema_ready = False
+_counters = {'opened': 0, 'hits': 0, 'misses': 0}
+
+def _open():
+    started = time.perf_counter()
+    raw = sqlite3.connect(
+        PATH,
+        timeout=BUSY_TIMEOUT,
+        detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
+        isolation_level=None,        # 트랜잭션은 Connection._begin 이 직접 시작
+        check_same_thread=False,     # 반납된 연결을 다른 스레드가 다시 씀 (동시에 쓰지는 않음)
+        cached_statements=STATEMENT_CACHE,
+    )
+    raw.row_factory = _dict_row
+    raw.execute("PRAGMA journal_mode = WAL")
+    raw.execute("PRAGMA synchronous = NORMAL")
+    raw.execute("PRAGMA foreign_keys = ON")
+    raw.execute("PRAGMA temp_store = MEMORY")
+    _ensure_schema(raw)
+    if metrics.ENABLED:
+        metrics.observe('gagyabu_db_connect_duration_seconds', time.perf_counter() - started)
+    return raw
+
+def _ensure_schema(raw):
+    global _schema_ready
+    if _schema_ready:
+        return
+    with _lock:
+        if _schema_ready:
+            return
+        with open(SCHEMA_PATH, encoding='utf-8') as f:
+            raw.executescript(f.read())
+        _schema_ready = True
+
+def connect():
+    """ 유휴 연결이 있으면 재사용, 없으면 새로 엶 """
+    raw = None
+    with _lock:
+        if _idle:
+            raw = _idle.pop()
+            _counters['hits'] += 1
+        else:
+            _counters['misses'] += 1
+    if raw is None:
+        raw = _open()
+        with _lock:
+            _counters['opened'] += 1
+    return Connection(raw)
+
+def _release(raw):
+    try:
+        # 끝나지 않은 트랜잭션(쓰기 잠금)을 다음 사용자에게 넘기지 않음
+        raw.rollback()
+    except sqlite3.Error:
+        raw.close()
+        return
+    with _lock:
+        if len(_idle) < MAX_IDLE:
+            _idle.append(raw)
+            return
+    raw.close()
+
+def close_all():
+    """ 유휴 연결을 모두 닫음 (테스트/종료용) """
+    with _lock:
+        idle, _idle[:] = list(_idle), []
+    for raw in idle:
+        raw.close()
+
+def stats():
+    """ user.pool_stats() 와 비슷한 형식의 상태 """
+    with _lock:
+        return {'backend': 'sqlite', 'path': PATH, 'idle': len(_idle), 'max_idle': MAX_IDLE, **_counters}
@@ -0,0 +1,29 @@
+"""
+저장소(DB) 백엔드 선택
+
+config.storage_backend:
+    'mysql'  (기본) pymysql + 커넥션 풀 (modules/user.py, modules/db_pool.py)
+    'sqlite' 파일 하나에 저장하는 내장 DB (modules/sqlite_db.py) - 네트워크 없이 혼자 쓰는 서버/개발용
+
+라우트가 호출하는 ledger.py / user.py / importer.py 함수는 db_connector() 가 돌려주는 연결만 쓰므로
+두 백엔드에서 같은 코드로 동작합니다. (SQLite 연결은 pymysql 과 같은 사용법/예외를 흉내 냄)
+문법이 다른 SQL 만 sql(mysql=..., sqlite=...) 로 백엔드별 문장을 고릅니다.
+
+비동기 서버(asgi.py, aiomysql)는 MySQL 백엔드에서만 쓸 수 있습니다.
+"""
+from . import config
+
+BACKENDS = ('mysql', 'sqlite')
+
+BACKEND = getattr(config, 'storage_backend', 'mysql')
+if BACKEND not in BACKENDS:
+    raise ValueError(f"storage_backend 는 {', '.join(BACKENDS)} 중 하나여야 합니다: {BACKEND!r}")
+
+
+def is_sqlite():
+    return BACKEND == 'sqlite'
+
+
+def sql(mysql, sqlite):
+    """ 현재 백엔드에 맞는 SQL 문장 """
+    return sqlite if BACKEND == 'sqlite' else mysql
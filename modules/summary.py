@@ -0,0 +1,204 @@
+"""
+일별 요약 테이블(ledger_summary) 관리
+
+ledger 원본 행을 (user_id, 날짜, 유형, 카테고리, 지불수단) 단위로 미리 합산해 두는 테이블입니다.
+통계 함수는 원본 대신 이 테이블을 읽고, insert/update/delete 는 같은 트랜잭션 안에서
+apply_deltas()로 이 테이블을 함께 갱신합니다.
+
+테이블 생성은 마이그레이션(migrations/0004_ledger_summary.sql)이 담당합니다.
+
+사용법 (프로젝트 루트에서):
+    python -m modules.summary rebuild [--user ID] # ledger 에서 다시 채우기
+    python -m modules.summary check   [--user ID] # ledger 와 일치하는지 검사
+"""
+import sys
+import argparse
+from decimal import Decimal
+
+import pymysql
+
+from . import storage
+
+# ledger 원본을 요약 테이블 형식으로 집계 (rebuild / check 공용)
+# 요약 키 식 (summary_key 와 같은 정규화) - SELECT 와 GROUP BY 가 같은 식을 쓰도록 한 곳에 둠
+_KEY_EXPRS = (
+    ("user_id", "user_id"),
+    ("date", "d"),
+    ("TRIM(type)", "type"),
+    ("COALESCE(TRIM(category), '')", "category"),
+    ("COALESCE(pay, '')", "pay"),
+)
+
+_AGGREGATE_LEDGER_SQL = (
+    "SELECT " + ", ".join(f"{expr} AS {alias}" for expr, alias in _KEY_EXPRS)
+    + ", SUM(amount) AS amount, COUNT(*) AS cnt"
+    + " FROM ledger {where}"
+    + " GROUP BY " + ", ".join(expr for expr, _ in _KEY_EXPRS)
+)
+
+UPSERT_SQL = storage.sql(
+    mysql="""
+    INSERT INTO ledger_summary (user_id, d, type, category, pay, amount, cnt)
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE amount = amount + VALUES(amount), cnt = cnt + VALUES(cnt)
+""",
+    sqlite="""
+    INSERT INTO ledger_summary (user_id, d, type, category, pay, amount, cnt)
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+    ON CONFLICT (user_id, d, type, category, pay)
+    DO UPDATE SET amount = amount + excluded.amount, cnt = cnt + excluded.cnt
+""",
+)
+
+DELETE_EMPTY_SQL = """
+    DELETE FROM ledger_summary
+    WHERE user_id = %s AND d = %s AND type = %s AND category = %s AND pay = %s AND cnt <= 0
+"""
+
+
+def to_amount(value):
+    """ '12,000' / 12000 / Decimal 등 금액 입력값을 정수로 변환 """
+    if value is None or value == '':
+        return 0
+    if isinstance(value, int):
+        return value
+    return int(Decimal(str(value).replace(',', '').strip()))
+
+
+def summary_key(user_id, d, type, category, pay):
+    """ 요약 테이블 기본키 형식으로 정규화 """
+    return (user_id, d, (type or '').strip(), (category or '').strip(), pay or '')
+
+
+def delta_rows(deltas):
+    """
+    증감분 목록을 키별로 합쳐 (UPSERT_SQL 파라미터 목록, DELETE_EMPTY_SQL 파라미터 목록)으로 변환
+
+    Args:
+        deltas: (user_id, date, type, category, pay, amount, cnt) 튜플 목록
+                (삭제/수정 전 값은 amount, cnt 를 음수로 넘김)
+    """
+    merged = {}
+    for user_id, d, type, category, pay, amount, cnt in deltas:
+        key = summary_key(user_id, d, type, category, pay)
+        acc = merged.setdefault(key, [0, 0])
+        acc[0] += to_amount(amount)
+        acc[1] += cnt
+
+    rows = [key + tuple(acc) for key, acc in merged.items() if acc != [0, 0]]
+    # 건수가 줄어든 칸은 0이 되었으면 지워서 테이블이 원본보다 커지지 않게 함
+    emptied = [row[:5] for row in rows if row[6] < 0]
+    return rows, emptied
+
+
+def apply_deltas(cursor, deltas):
+    """
+    요약 테이블에 증감분을 반영합니다. 호출자의 트랜잭션 안에서 실행되며 commit은 하지 않습니다.
+
+    Args:
+        cursor: 열린 DB 커서
+        deltas: delta_rows() 와 같은 형식
+    """
+    rows, emptied = delta_rows(deltas)
+    if rows:
+        cursor.executemany(UPSERT_SQL, rows)
+    if emptied:
+        cursor.executemany(DELETE_EMPTY_SQL, emptied)
+
+
+def rebuild(db, user_id=None):
+    """
+    ledger 원본에서 요약 테이블을 다시 만듭니다. (user_id 가 없으면 전체)
+
+    Returns:
+        int: 새로 채운 요약 행 수
+    """
+    cur = db.cursor()
+    try:
+        if user_id is None:
+            cur.execute("DELETE FROM ledger_summary")
+            where, params = "", ()
+        else:
+            cur.execute("DELETE FROM ledger_summary WHERE user_id = %s", (user_id,))
+            where, params = "WHERE user_id = %s", (user_id,)
+
+        cur.execute(
+            "INSERT INTO ledger_summary (user_id, d, type, category, pay, amount, cnt) "
+            + _AGGREGATE_LEDGER_SQL.format(where=where),
+            params,
+        )
+        count = cur.rowcount
+        db.commit()
+        return count
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        cur.close()
+
+
+def check(db, user_id=None):
+    """
+    요약 테이블이 ledger 원본 집계와 같은지 검사합니다.
+
+    Returns:
+        list: 불일치 목록 [(key, 원본 (amount, cnt), 요약 (amount, cnt))], 비어 있으면 정상
+    """
+    cur = db.cursor(pymysql.cursors.DictCursor)
+    try:
+        where, params = ("", ()) if user_id is None else ("WHERE user_id = %s", (user_id,))
+
+        cur.execute(_AGGREGATE_LEDGER_SQL.format(where=where), params)
+        expected = {
+            summary_key(r['user_id'], r['d'], r['type'], r['category'], r['pay']):
+                (int(r['amount'] or 0), int(r['cnt']))
+            for r in cur.fetchall()
+        }
+
+        cur.execute(
+            "SELECT user_id, d, type, category, pay, amount, cnt FROM ledger_summary " + where,
+            params,
+        )
+        actual = {
+            (r['user_id'], r['d'], r['type'], r['category'], r['pay']): (int(r['amount']), int(r['cnt']))
+            for r in cur.fetchall()
+        }
+    finally:
+        cur.close()
+
+    mismatches = []
+    for key in sorted(expected.keys() | actual.keys(), key=str):
+        exp = expected.get(key, (0, 0))
+        act = actual.get(key, (0, 0))
+        if exp != act:
+            mismatches.append((key, exp, act))
+    return mismatches
+
+
+def main(argv=None):
+    from .user import db_connector
+
+    parser = argparse.ArgumentParser(prog="python -m modules.summary",
+                                     description="ledger_summary 요약 테이블 관리")
+    parser.add_argument("command", choices=["rebuild", "check"])
+    parser.add_argument("--user", help="특정 사용자 ID만 처리")
+    args = parser.parse_args(argv)
+
+    db = db_connector()
+    try:
+        if args.command == "rebuild":
+            count = rebuild(db, args.user)
+            print(f"요약 행 {count}개 재생성 완료")
+            return 0
+
+        mismatches = check(db, args.user)
+        for key, exp, act in mismatches:
+            print(f"[MISMATCH] {key}: ledger={exp} summary={act}")
+        print("일치합니다." if not mismatches else f"불일치 {len(mismatches)}건")
+        return 1 if mismatches else 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,25 @@
+import time
+import threading
+from collections import OrderedDict
+
 import pymysql
 from . import config
+from .db_pool import ConnectionPool
+from . import passwords
+from . import metrics
+from . import storage
 
-def db_connector():
+_pool = None
+_pool_lock = threading.Lock()
+
+def _connect():
     """
-    데이터베이스 연결 객체를 생성합니다.
+    실제 DB 연결 객체를 새로 생성합니다. (커넥션 풀이 필요할 때만 호출)
 
     Returns:
         pymysql.Connection: DB 연결 객체
     """
+    started = time.perf_counter()
     try:
         conn = pymysql.connect(
             host=config.host,
@@ -20,35 +32,178 @@ def db_connector():
             # 쿼리 결과를 Python 딕셔너리 형태로 받기 위한 설정입니다.
             cursorclass=pymysql.cursors.DictCursor
         )
+        if metrics.ENABLED:
+            metrics.observe('gagyabu_db_connect_duration_seconds', time.perf_counter() - started)
         return conn
     except Exception as e:
         print(f"[DB CONNECT ERROR] {type(e).__name__}: {e}")
         raise
 
+def get_pool():
+    """
+    프로세스 전역 커넥션 풀을 반환합니다. (처음 호출할 때 생성)
+    크기/타임아웃은 config.py의 pool_* 값으로 조절할 수 있습니다.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    _connect,
+                    min_size=getattr(config, 'pool_min_size', 1),
+                    max_size=getattr(config, 'pool_max_size', 10),
+                    idle_timeout=getattr(config, 'pool_idle_timeout', 300),
+                    wait_timeout=getattr(config, 'pool_wait_timeout', 5),
+                    ping_interval=getattr(config, 'pool_ping_interval', 30),
+                    cursor_wrapper=metrics.TimedCursor if metrics.ENABLED else None,
+                )
+    return _pool
+
+def db_connector():
+    """
+    커넥션 풀에서 DB 연결 객체를 하나 꺼냅니다.
+    사용 후 db.close()를 호출하면 연결이 끊기지 않고 풀로 반납됩니다.
+
+    Returns:
+        PooledConnection: pymysql.Connection 처럼 사용할 수 있는 연결 객체
+                          (SQLite 백엔드면 같은 방식으로 쓰는 sqlite_db.Connection)
+    """
+    if storage.is_sqlite():
+        from . import sqlite_db
+        return sqlite_db.connect()
+    if not metrics.ENABLED:
+        return get_pool().acquire()
+    started = time.perf_counter()
+    db = get_pool().acquire()
+    metrics.observe('gagyabu_db_acquire_duration_seconds', time.perf_counter() - started)
+    return db
+
+def pool_stats():
+    """
+    커넥션 풀 상태 및 hit/miss/wait 카운터를 반환합니다.
+
+    Returns:
+        dict: size, idle, in_use, hits, misses, waits, timeouts ...
+    """
+    if storage.is_sqlite():
+        from . import sqlite_db
+        return sqlite_db.stats()
+    return get_pool().stats()
+
+# -------------------------------------------------------------
+# 사용자 정보 캐시 (id -> 비밀번호를 뺀 user 행)
+# 로그인 세션 확인처럼 요청마다 필요한 조회를 DB 대신 여기서 처리합니다.
+# 회원가입/로그아웃 시 해당 id 를 지우고, 나머지는 TTL 이 지나면 다시 읽습니다.
+# -------------------------------------------------------------
+USER_CACHE_SIZE = getattr(config, 'user_cache_size', 1024)
+USER_CACHE_TTL = getattr(config, 'user_cache_ttl', 60)
+
+# MySQL 중복 키 오류 코드
+DUP_ENTRY = 1062
+
+_user_cache = OrderedDict()   # id -> (row, 저장 시각)
+_user_cache_lock = threading.Lock()
+
+def cached_user(id):
+    """ 캐시에 있으면 사용자 행, 없거나 만료되었으면 None """
+    with _user_cache_lock:
+        entry = _user_cache.get(id)
+        if entry is None:
+            return None
+        row, stored_at = entry
+        if time.monotonic() - stored_at > USER_CACHE_TTL:
+            del _user_cache[id]
+            return None
+        _user_cache.move_to_end(id)
+        return row
+
+def cache_user(row):
+    """ 사용자 행(비밀번호 제외)을 캐시에 넣음 """
+    row = {k: v for k, v in row.items() if k != 'password'}
+    with _user_cache_lock:
+        _user_cache[row['id']] = (row, time.monotonic())
+        _user_cache.move_to_end(row['id'])
+        while len(_user_cache) > USER_CACHE_SIZE:
+            _user_cache.popitem(last=False)
+    return row
+
+def invalidate_user(id):
+    """ 회원가입/로그아웃 시 해당 사용자 캐시 삭제 """
+    with _user_cache_lock:
+        _user_cache.pop(id, None)
+
+def get_user(id):
+    """
+    ID 로 사용자 정보 조회 (캐시 우선, 비밀번호 제외)
+
+    Returns:
+        dict or None: 없는 사용자면 None
+    """
+    if not id:
+        return None
+    row = cached_user(id)
+    if row is not None:
+        return row
+
+    db = db_connector()
+    cur = db.cursor(pymysql.cursors.DictCursor)
+    try:
+        cur.execute("SELECT id, user_name FROM user WHERE id=%s", (id,))
+        row = cur.fetchone()
+    finally:
+        cur.close()
+        db.close()
+    return cache_user(row) if row else None
+
 def select_user_info(id, pw):
     """
-    (보안 위험! 테스트용) ID와 평문 비밀번호로 사용자를 조회합니다.
-    (추후 반드시 비밀번호 해시를 비교하는 방식으로 변경해야 합니다.)
+    ID와 비밀번호로 사용자를 확인합니다.
+    저장된 해시와 비교하며(modules/passwords.py), 예전 평문 비밀번호나 설정이 바뀐 해시는
+    로그인에 성공한 김에 현재 설정의 해시로 바꿔 저장합니다.
 
     Args:
         id (str): 사용자가 입력한 아이디
         pw (str): 사용자가 입력한 비밀번호 (평문)
 
     Returns:
-        dict or None: 사용자 정보 딕셔너리, 일치하는 사용자가 없으면 None
+        dict or None: 사용자 정보 딕셔너리(password 제외), 일치하는 사용자가 없으면 None
+
+    Raises:
+        passwords.PasswordBusyError: 해시 작업이 밀려 있을 때
     """
     db = db_connector()
     # DictCursor를 인자로 넘겨, 이 쿼리의 결과만 딕셔너리로 받습니다.
     cur = db.cursor(pymysql.cursors.DictCursor) 
     try:
-        # (보안 경고: SQL injection에 취약할 수 있으며, 비밀번호를 평문으로 비교합니다.)
-        cur.execute("SELECT * FROM user WHERE id=%s AND password=%s", (id, pw))
+        cur.execute("SELECT * FROM user WHERE id=%s", (id,))
         row = cur.fetchone() 
-        return row or None
     finally:
         cur.close()
         db.close()
 
+    # 없는 아이디도 더미 해시와 비교 (응답 시간으로 아이디가 있는지 알 수 없게)
+    ok, rehash = passwords.verify_password(pw, row.pop('password') if row else None)
+    if not ok:
+        return None
+    if rehash:
+        _update_password_hash(id, passwords.hash_password(pw))
+    return cache_user(row)
+
+def _update_password_hash(id, hashed):
+    """ 로그인 시 해시 갱신 (실패해도 로그인은 그대로 진행) """
+    db = cur = None
+    try:
+        db = db_connector()
+        cur = db.cursor()
+        cur.execute("UPDATE user SET password=%s WHERE id=%s", (hashed, id))
+        db.commit()
+    except Exception as e:
+        print(f"[DB REHASH ERROR] {type(e).__name__}: {e}")
+        if db: db.rollback()
+    finally:
+        if cur: cur.close()
+        if db: db.close()
+
 # -------------------------------------------------------------
 # [신규] 회원가입 관련 함수
 # -------------------------------------------------------------
@@ -56,38 +211,38 @@ def check_user_exists(id):
     """
     ID 중복 여부를 확인합니다.
     """
-    db = db_connector()
-    cur = db.cursor()
-    try:
-        cur.execute("SELECT id FROM user WHERE id=%s", (id,))
-        return cur.fetchone() is not None
-    finally:
-        cur.close()
-        db.close()
+    return get_user(id) is not None
 
 def create_user(user_name, id, password):
     """
-    새로운 사용자를 DB에 등록합니다.
-    (보안 위험: 비밀번호를 평문으로 저장합니다. 해시 함수를 사용해야 합니다.)
+    새로운 사용자를 DB에 등록합니다. (비밀번호는 해시해서 저장)
+    중복 확인을 따로 하지 않고 INSERT 한 번으로 처리하며, 같은 ID 가 있으면
+    기본키(id) 중복 오류(1062)로 판단합니다. (동시에 같은 ID 로 가입해도 한 명만 성공)
 
     Returns:
         tuple: (성공 여부 bool, 이유 str)
     """
-    if check_user_exists(id):
-        return False, "duplicate_id"
+    hashed = passwords.hash_password(password)
 
     db = db_connector()
     cur = db.cursor()
     try:
         # SQL Injection 방지를 위해 %s 플레이스홀더를 사용합니다.
         sql = "INSERT INTO user (user_name, id, password) VALUES (%s, %s, %s)"
-        cur.execute(sql, (user_name, id, password))
+        cur.execute(sql, (user_name, id, hashed))
         db.commit()
+        invalidate_user(id)
         return True, ""
+    except pymysql.err.IntegrityError as e:
+        db.rollback()
+        if e.args and e.args[0] == DUP_ENTRY:
+            return False, "duplicate_id"
+        print(f"[DB INSERT ERROR] {type(e).__name__}: {e}")
+        return False, "db_error"
     except Exception as e:
         print(f"[DB INSERT ERROR] {type(e).__name__}: {e}")
         db.rollback()
         return False, "db_error"
     finally:
         cur.close()
-        db.close()
\ No newline at end of file
+        db.close()
@@ -0,0 +1,179 @@
+"""
+app.py(Flask) / asgi.py(Quart) 가 같이 쓰는 요청 처리 함수
+(쿼리스트링 파싱/검사, 응답 본문 조립 등 DB 나 프레임워크를 쓰지 않는 부분)
+"""
+from datetime import date, timedelta
+
+from markupsafe import Markup
+
+from . import config
+from . import ledger
+from . import aggregate
+from . import cache as stats_cache
+
+
+# 로그인 없이 접근 허용할 엔드포인트 이름들
+PUBLIC_ENDPOINTS = {'login_view', 'login', 'register_view', 'register', 'static', 'static_dist', 'prometheus_metrics', 'db_pool_stats'}
+
+def is_public(endpoint):
+    return (endpoint or '').split('.')[0] in PUBLIC_ENDPOINTS
+
+def wants_401(is_json, path):
+    """ 로그인 안 한 요청이 API 면 401, 일반 페이지면 로그인 페이지로 이동 """
+    return is_json or path.startswith(('/add', '/delete', '/transactions', '/api'))
+
+def next_url(nxt, default):
+    """ 로그인 후 이동할 주소 (같은 사이트 경로만) """
+    if not nxt or not nxt.startswith('/'):
+        return default
+    return nxt
+
+def too_many_requests(wait, message_key='message', **body):
+    """ 요청 제한(429) 응답 (body, 429, headers), Retry-After 헤더에 다시 시도까지 남은 초 """
+    seconds = max(1, int(wait + 0.999))
+    body[message_key] = f"시도가 너무 많습니다. {seconds}초 후 다시 시도해주세요."
+    return body, 429, {'Retry-After': str(seconds)}
+
+
+# ====================== 페이지 ======================
+
+# 첫 화면에 필요한 데이터를 페이지에 JSON 으로 같이 넣어 보냄 (브라우저가 API 를 따로 부르지 않음)
+INLINE_INITIAL_DATA = getattr(config, 'inline_initial_data', True)
+
+# 통계 페이지가 쓰는 대시보드 주 수 (월간/카테고리 API 도 같은 캐시 항목을 씀)
+DASHBOARD_WEEKS = 10
+
+def inline_json(text):
+    """ <script type="application/json"> 안에 넣을 JSON (문자열 안의 </script> 등으로 태그가 끝나지 않게) """
+    return Markup(text.replace('<', '\\u003c').replace('>', '\\u003e').replace('&', '\\u0026'))
+
+
+# ====================== 가계부(Ledger) API ======================
+
+def compact(args):
+    """ ?compact=1 이면 내역을 {'columns', 'rows'} 배열 형식으로 보냄 """
+    return args.get('compact') == '1'
+
+def parse_after(value):
+    """ '2025-11-04,123' -> (date(2025, 11, 4), 123) """
+    d, _, i = value.partition(',')
+    return date.fromisoformat(d.strip()), int(i)
+
+def format_after(cursor):
+    return f"{cursor[0].isoformat()},{cursor[1]}" if cursor else None
+
+def search_args(args):
+    """ 검색 쿼리스트링 -> search_transactions 인자 (형식이 틀리면 ValueError) """
+    after = args.get('after')
+    min_amount, max_amount = args.get('min_amount'), args.get('max_amount')
+    return {
+        'q': args.get('q', '').strip() or None,
+        'category': args.get('category') or None,
+        'pay': args.get('pay') or None,
+        'min_amount': int(min_amount) if min_amount else None,
+        'max_amount': int(max_amount) if max_amount else None,
+        'after': parse_after(after) if after else None,
+        'limit': int(args.get('limit', 50)),
+    }
+
+def parse_months(value):
+    """ '2025-10,2025-11' -> [(2025, 10), (2025, 11)] (형식/범위가 틀리면 ValueError) """
+    months = []
+    for ym in filter(None, value.split(',')):
+        try:
+            y, m = (int(x) for x in ym.split('-'))
+        except ValueError:
+            raise ValueError("months=YYYY-MM,YYYY-MM 형식이어야 합니다.")
+        ledger.check_month(y, m)
+        months.append((y, m))
+    return months
+
+def month_key(year, month):
+    return f"{year:04d}-{month:02d}"
+
+def day_of(value):
+    """ 쓰기 API 응답용 날짜 ('YYYY-MM-DD...' 문자열이면 date 로) """
+    return date.fromisoformat(value[:10]) if isinstance(value, str) else value
+
+def add_fields(data):
+    """ /add 본문 -> insert_transaction 인자 (배치 API 와 같은 검사/정규화, 잘못된 값은 ValueError) """
+    return ledger._normalize_fields({'category': None, 'payment_method': None, **data})
+
+def edit_fields(data):
+    """ /edit 본문 -> update_transaction 인자 (빠진 값이나 잘못된 값은 ValueError) """
+    if not all([data.get('id'), data.get('date'), data.get('type'), data.get('desc'), data.get('amount') is not None]):
+        raise ValueError('모든 값이 필요합니다.')
+    return ledger._normalize_fields({k: data[k] for k in ('date', 'type', 'desc', 'amount')})
+
+def rule_payload(rule):
+    return {k: rule[k] for k in ('id', 'type', 'description', 'amount', 'category', 'pay',
+                                 'freq', 'every', 'start_date', 'end_date', 'next_date')}
+
+
+# ====================== 통계(Stats) API ======================
+
+def year_month(args):
+    """ ?year=&month= (생략하면 이번 달, 형식/범위가 틀리면 ValueError) """
+    today = date.today()
+    try:
+        year = int(args.get('year', today.year))
+        month = int(args.get('month', today.month))
+    except ValueError:
+        raise ValueError("year / month 는 정수여야 합니다.")
+    ledger.check_month(year, month)
+    return year, month
+
+def weekly_args(args):
+    """ ?n=주 수&offset=페이지 (범위가 틀리면 ValueError) """
+    n = int(args.get('n', 10))
+    offset = int(args.get('offset', 0))
+    ledger.check_weekly(n, offset)
+    return n, offset
+
+def range_args(args):
+    """
+    ?from=&to=(포함)&granularity=&tz= -> (start, end, to, granularity), end 는 to 다음 날
+    - to 생략: tz 기준 오늘, from 생략: to 가 속한 해의 1월 1일
+    """
+    granularity = args.get('granularity', 'day')
+    tz = args.get('tz') or getattr(config, 'stats_timezone', 'Asia/Seoul')
+    to = args.get('to')
+    to = date.fromisoformat(to) if to else aggregate.local_today(tz)
+    start = args.get('from')
+    start = date.fromisoformat(start) if start else date(to.year, 1, 1)
+    end = to + timedelta(days=1)
+    ledger.check_range(start, end, granularity)
+    return start, end, to, granularity
+
+def is_projected(args):
+    """ ?projected=1 : 이번 달이면 아직 넣지 않은 반복 내역까지 더한 누적(projected)도 같이 보냄 """
+    return args.get('projected') in ('1', 'true', 'yes')
+
+def dashboard_key(year, month, n, today):
+    """ 대시보드 캐시 항목의 (months, params) """
+    return (stats_cache.dashboard_months(year, month, today, n),
+            {'year': year, 'month': month, 'n': n, 'today': today})
+
+def etag_headers(etag):
+    # 매번 서버에 확인(재검증)하고, 다른 사용자와 공유되는 캐시에는 저장하지 않음
+    return {'ETag': f'"{etag}"', 'Cache-Control': 'private, no-cache'}
+
+# 대시보드 결과에서 개별 통계 API 가 보내는 부분 (dashboard: 캐시된 대시보드 본문을 json.loads 한 것)
+
+def pick_monthly_total(dashboard):
+    """ 월간 일별 누적 지출 (monthly 의 cumSpend) """
+    monthly = dashboard.get('monthly') or {}
+    return {'labels': monthly.get('labels', []), 'thisMonth': monthly.get('cumSpend', [])}
+
+def pick_monthly_spend(dashboard, projected=False):
+    """ 월간 수입/지출 누적 (projected 는 요청했을 때만) """
+    monthly = dict(dashboard.get('monthly') or {})
+    if not projected:
+        monthly.pop('projected', None)
+    return monthly
+
+def pick_monthly_cats(dashboard):
+    return dashboard.get('categories') or {}
+
+def pick_weekly(dashboard):
+    return dashboard.get('weekly') or {}
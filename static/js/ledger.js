@@ -19,6 +19,22 @@ const categoryList = {
 let selectedDate = null;
 let currentDate = new Date();
 
+// 서버가 페이지에 같이 넣어 보낸 첫 화면 데이터 (없으면 null)
+// { activeDates: {'YYYY-MM': [...]}, today: { date, transactions } }
+function readInitialData() {
+    const el = document.getElementById('initial-data');
+    if (!el) return null;
+    try {
+        return JSON.parse(el.textContent);
+    } catch (e) {
+        console.error("첫 화면 데이터 읽기 실패:", e);
+        return null;
+    }
+}
+const initialData = readInitialData();
+// 오늘 내역은 처음 한 번만 사용 (이후에는 서버에서 다시 받음)
+let initialDay = initialData ? initialData.today : null;
+
 // 페이지가 처음 로드될 때 실행될 함수
 document.addEventListener('DOMContentLoaded', async () => {
     renderCalendar(currentDate);
@@ -140,47 +156,64 @@ async function renderCalendar(date) {
     await markActiveDates(year, month + 1);
 }
 
+// 달별 "내역 있는 날짜" (키: 'YYYY-MM') - 이전/다음 달은 미리 받아둠
+// 페이지에 같이 온 세 달은 요청 없이 바로 사용
+const activeDatesCache = new Map(Object.entries((initialData && initialData.activeDates) || {}));
+
+function monthKey(year, month) { // month: 1~12
+    return `${year}-${String(month).padStart(2, '0')}`;
+}
+
 /**
- * [신규] 서버에서 내역 있는 날짜를 받아와 표시하는 함수
+ * [신규] 해당 월의 내역이 있는 날짜를 가져와 클래스를 추가하는 함수
+ * 처음 보는 달이면 이전/현재/다음 달을 한 번에 요청해서 캐시에 담음
  */
 async function markActiveDates(year, month) {
+    const key = monthKey(year, month);
     try {
-        const res = await fetch(`/month-active-dates?year=${year}&month=${month}`);
-        if (!res.ok) return;
-
-        const activeDates = await res.json(); 
+        if (!activeDatesCache.has(key)) {
+            const keys = [-1, 0, 1].map(delta => {
+                const d = new Date(year, month - 1 + delta, 1);
+                return monthKey(d.getFullYear(), d.getMonth() + 1);
+            });
+            const res = await fetch(`/month-active-dates?months=${keys.join(',')}`);
+            if (!res.ok) return;
 
-        const days = calendarDiv.querySelectorAll('.day:not(.empty)');
-        days.forEach(dayDiv => {
-            if (activeDates.includes(dayDiv.dataset.date)) {
-                dayDiv.classList.add('has-transaction');
-            }
-        });
+            const byMonth = await res.json(); // 예: {'2025-05': ['2025-05-01', '2025-05-15'], ...}
+            keys.forEach(k => activeDatesCache.set(k, byMonth[k] || []));
+        }
+        paintActiveDates(activeDatesCache.get(key));
     } catch (e) {
-        console.error("날짜 표시 실패:", e);
+        console.error("내역 날짜 표시 실패:", e);
     }
 }
 
 /**
- * [신규] 해당 월의 내역이 있는 날짜를 가져와 클래스를 추가하는 함수
+ * 달력의 모든 날짜 칸을 돌면서, 내역 리스트에 포함된 날짜면 클래스 추가 (없으면 제거)
  */
-async function markActiveDates(year, month) {
-    try {
-        // 3단계에서 만든 Flask 라우트 호출
-        const res = await fetch(`/month-active-dates?year=${year}&month=${month}`);
-        if (!res.ok) return;
-
-        const activeDates = await res.json(); // 예: ['2025-05-01', '2025-05-15']
+function paintActiveDates(activeDates) {
+    const days = calendarDiv.querySelectorAll('.day:not(.empty)');
+    days.forEach(dayDiv => {
+        dayDiv.classList.toggle('has-transaction', activeDates.includes(dayDiv.dataset.date));
+    });
+}
 
-        // 달력의 모든 날짜 칸을 돌면서, 내역 리스트에 포함된 날짜면 클래스 추가
-        const days = calendarDiv.querySelectorAll('.day:not(.empty)');
-        days.forEach(dayDiv => {
-            if (activeDates.includes(dayDiv.dataset.date)) {
-                dayDiv.classList.add('has-transaction');
-            }
-        });
-    } catch (e) {
-        console.error("내역 날짜 표시 실패:", e);
+/**
+ * /add, /delete 응답({ date, transactions, activeDates })으로 화면 갱신
+ * (전체 목록을 다시 요청하지 않고 해당 날짜만 반영)
+ */
+function applyDayPayload(data) {
+    initialDay = null;
+    if (data.date === selectedDate) {
+        updateList(data.transactions || []);
+    }
+    // 달력에 보이는 달과 같은 달일 때만 날짜 색칠 갱신
+    const [year, month] = (data.date || '').split('-').map(Number);
+    if (year && month) {
+        activeDatesCache.set(monthKey(year, month), data.activeDates || []);
+    }
+    if (year === currentDate.getFullYear() && month === currentDate.getMonth() + 1) {
+        paintActiveDates(data.activeDates || []);
     }
 }
 
@@ -212,6 +245,13 @@ async function selectDate(year, month, day) {
     inputTitle.textContent = `${selectedDate} 내역 입력`;
     form.style.display = 'flex';
 
+    // 페이지에 같이 온 오늘 내역이면 바로 표시
+    if (initialDay && initialDay.date === selectedDate) {
+        updateList(initialDay.transactions || []);
+        initialDay = null;
+        return;
+    }
+
     // 날짜를 클릭하면 해당 날짜의 API를 호출
     try {
         const res = await fetch(`/transactions-by-date?date=${selectedDate}`);
@@ -274,13 +314,12 @@ applyBtn.onclick = async () => {
         document.getElementById('category').value = '';
         document.getElementById('payment-method').value = '';
 
+        // 응답에 담긴 해당 날짜 목록으로 바로 갱신
+        applyDayPayload(data);
     } catch (error) {
         console.error('Error adding transaction:', error);
         alert(error.message); 
     }
-    
-    // 목록 새로고침
-    await refreshCurrentList();
 };
 
 // '삭제', '수정', '저장', '취소' 버튼 클릭을 감지하는 이벤트 리스너
@@ -461,6 +500,9 @@ async function handleSave(tr, transactionId) {
         alert(err.message);
     }
 
+    // 날짜가 바뀌었을 수 있으므로 원래 날짜/새 날짜가 속한 달의 캐시를 비움
+    [selectedDate, newDate].forEach(d => activeDatesCache.delete((d || '').slice(0, 7)));
+
     // 목록 새로고침
     await refreshCurrentList();
 }
@@ -484,13 +526,15 @@ async function handleDelete(transactionId) {
         if (!res.ok) {
             throw new Error(data.error || '삭제에 실패했습니다.');
         }
+
+        // 응답에 담긴 해당 날짜 목록으로 바로 갱신
+        applyDayPayload(data);
     } catch (error) {
         console.error('Error deleting transaction:', error);
         alert(error.message); 
+        // 실패 시에는 서버 상태로 다시 맞춤
+        await refreshCurrentList();
     }
-    
-    // 목록 새로고침
-    await refreshCurrentList();
 }
 
 /* 거래 내역 리스트 업데이트 함수 (수정 기능 추가) */
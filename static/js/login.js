@@ -41,7 +41,7 @@ document.addEventListener('DOMContentLoaded', () => {
 			if (data.success) {
 				window.location.href = data.next || "/";
 			} else {
-				alert("아이디와 비밀번호를 확인해주세요.");
+				alert(data.message || "아이디와 비밀번호를 확인해주세요.");
 			}
 		})
 		.catch(err => {
@@ -110,11 +110,8 @@ console.log('statistics.js loaded');
 
 			if (before1) before1.addEventListener('click', async () => {
 				monthYM = addMonth(monthYM.year, monthYM.month, -1);
-				await updateMonthlyTotalSection();
-				await updateMonthlySpendSection();
-				updateCategoryPills();
+				await loadMonth();
 				updateMonthNavButtons();
-				await updateBalanceCard();
 			});
 	
 			if (after1) after1.addEventListener('click', async () => {
@@ -124,21 +121,15 @@ console.log('statistics.js loaded');
 				if (clamped.year === monthYM.year && clamped.month === monthYM.month) return;
 	
 				monthYM = clamped;
-				await updateMonthlyTotalSection();
-				await updateMonthlySpendSection();
-				updateCategoryPills();
+				await loadMonth();
 				updateMonthNavButtons();
-				await updateBalanceCard();
 			});
 	
 			// 월간 지출 카드의 화살표도 같은 monthYM을 공유하도록 동일 동작
 			if (before2) before2.addEventListener('click', async () => {
 				monthYM = addMonth(monthYM.year, monthYM.month, -1);
-				await updateMonthlyTotalSection();
-				await updateMonthlySpendSection();
-				updateCategoryPills();
+				await loadMonth();
 				updateMonthNavButtons();
-				await updateBalanceCard();
 			});
 	
 			if (after2) after2.addEventListener('click', async () => {
@@ -147,11 +138,8 @@ console.log('statistics.js loaded');
 				if (clamped.year === monthYM.year && clamped.month === monthYM.month) return;
 	
 				monthYM = clamped;
-				await updateMonthlyTotalSection();
-				await updateMonthlySpendSection();
-				updateCategoryPills();
+				await loadMonth();
 				updateMonthNavButtons();
-				await updateBalanceCard();
 			});
 	
 			// --- 주간 합계: 10주씩 이동 ---
@@ -254,21 +242,43 @@ console.log('statistics.js loaded');
 
 		
 	// ---------- 데이터 요청 ----------
-	async function fetchMonthlySpend(year, month) {
-		const res = await fetch(`/api/stats/monthly-spend?year=${year}&month=${month}`);
-		if (!res.ok) throw new Error('monthly-spend api failed');
-		return res.json(); // { labels, dailySpend, dailyIncome, cumSpend, cumIncome, totalSpend, totalIncome }
+	// 월간 합계/지출/카테고리/주간/조언을 한 번에 받아옴
+	async function fetchDashboard(year, month) {
+		const res = await fetch(`/api/stats/dashboard?year=${year}&month=${month}`, { cache: 'no-cache' });
+		if (!res.ok) throw new Error('dashboard api failed');
+		return res.json(); // { monthly, prevMonthly, categories, weekly, advice }
+	}
+
+	// 서버가 페이지에 같이 넣어 보낸 대시보드 (보고 있는 달과 같을 때만 사용, 없으면 null)
+	function readInitialDashboard(year, month) {
+		const el = document.getElementById('initial-dashboard');
+		if (!el || Number(el.dataset.year) !== year || Number(el.dataset.month) !== month) return null;
+		try {
+			return JSON.parse(el.textContent);
+		} catch (e) {
+			console.error('Error reading initial dashboard:', e);
+			return null;
+		}
+	}
+
+	// 선택한 달 기준 섹션 전체 갱신 (대시보드 요청 1번, dash 를 주면 요청 없이)
+	async function loadMonth(year = monthYM.year, month = monthYM.month, dash = null) {
+		dash = dash || await fetchDashboard(year, month);
+		updateMonthlyTotalSection(dash, year, month);
+		updateMonthlySpendSection(dash, year, month);
+		updateCategoryPills(dash);
+		updateBalanceCard(dash);
+		return dash;
 	}
 
 	// ---------- 월간 합계 (수입 - 지출 = 순변화) ----------
 		// ---------- 월간 합계 (수입 - 지출 = 순변화) ----------
-		async function updateMonthlyTotalSection(year = monthYM.year, month = monthYM.month) {
+		function updateMonthlyTotalSection(dash, year = monthYM.year, month = monthYM.month) {
 			// 화면 상단 기간 표시
 			setRangeFor('rangeMonthly', year, month);
 	
-			// {labels, cumSpend, cumIncome} 반환 - /api/stats/monthly-spend 응답
-			const { labels = [], cumSpend = [], cumIncome = [] } =
-				await fetchMonthlySpend(year, month);
+			// {labels, cumSpend, cumIncome} - /api/stats/monthly-spend 와 같은 형식
+			const { labels = [], cumSpend = [], cumIncome = [] } = dash.monthly || {};
 	
 			// 누적 순변화 = 누적수입 − 누적지출
 			const len = Math.max(cumIncome.length, cumSpend.length);
@@ -323,12 +333,8 @@ console.log('statistics.js loaded');
 
 	// --- 이번 달 남은 돈 카드 업데이트 ---
 	// --- 이번 달 남은 돈 카드 업데이트 ---
-async function updateBalanceCard(year = monthYM.year, month = monthYM.month) {
-    //const now = new Date();
-    //const y = now.getFullYear();
-    //const m = now.getMonth() + 1;
-
-    const d = await fetchMonthlySpend(year, month);
+function updateBalanceCard(dash) {
+    const d = dash.monthly || {};
 
     const income   = (d.totalIncome   ?? (d.cumIncome?.at(-1)   || 0)) | 0;
     const spend    = (d.totalSpend    ?? (d.cumSpend?.at(-1)    || 0)) | 0;
@@ -355,19 +361,12 @@ async function updateBalanceCard(year = monthYM.year, month = monthYM.month) {
 
 	// ---------- 월간 지출 (이번달 지출 vs 지난달 지출 비교) ----------
 		// ---------- 월간 지출 (이번달 지출 vs 지난달 지출 비교) ----------
-		async function updateMonthlySpendSection(year = monthYM.year, month = monthYM.month) {
-			const { year: py, month: pm } = prevYM(year, month);
-	
+		function updateMonthlySpendSection(dash, year = monthYM.year, month = monthYM.month) {
 			setRangeFor('rangeMonthlySpend', year, month);
 	
-			// 이번달/지난달 각각 요청
-			const [
-				{ labels: labelsCur = [], cumSpend: cumSpendCur = [] },
-				{ labels: labelsPrev = [], cumSpend: cumSpendPrev = [] },
-			] = await Promise.all([
-				fetchMonthlySpend(year, month),
-				fetchMonthlySpend(py, pm),
-			]);
+			// 이번달/지난달 누적 지출 (대시보드 응답에 함께 들어있음)
+			const { labels: labelsCur = [], cumSpend: cumSpendCur = [], projected = null } = dash.monthly || {};
+			const { cumSpend: cumSpendPrev = [] } = dash.prevMonthly || {};
 	
 			// 라벨은 이번달 기준, 지난달 누적은 길이 맞춰 정렬
 			const labels = labelsCur;
@@ -384,52 +383,57 @@ async function updateBalanceCard(year = monthYM.year, month = monthYM.month) {
 					? `지난달보다 ${won(diff)} 더 쓰는 중`
 					: `지난달보다 ${won(-diff)} 덜 쓰는 중`;
 	
+			const datasets = [
+				{
+					label: '이번달 누적 지출',
+					data: cumSpendCur,
+					borderColor: '#3b82f6',
+					backgroundColor: 'rgba(59,130,246,0.15)',
+					borderWidth: 3,
+					tension: 0.3,
+					fill: true,
+					pointRadius: 0,
+				},
+				{
+					label: '지난달 누적 지출',
+					data: prevAligned,
+					borderColor: '#9ca3af',
+					backgroundColor: 'rgba(156,163,175,0.12)',
+					borderWidth: 2,
+					tension: 0.3,
+					fill: true,
+					pointRadius: 0,
+				},
+			];
+			// 이번 달: 아직 들어오지 않은 반복 내역까지 더한 예상 누적 (점선)
+			if (projected && projected.totalSpend !== curTotal) {
+				datasets.push({
+					label: '반복 내역 포함 예상',
+					data: projected.cumSpend,
+					borderColor: '#3b82f6',
+					borderDash: [6, 4],
+					borderWidth: 2,
+					tension: 0.3,
+					fill: false,
+					pointRadius: 0,
+				});
+			}
+
 			const canvas = document.getElementById('chartMonthlySpend');
-			renderChart(
-				canvas,
-				[
-					{
-						label: '이번달 누적 지출',
-						data: cumSpendCur,
-						borderColor: '#3b82f6',
-						backgroundColor: 'rgba(59,130,246,0.15)',
-						borderWidth: 3,
-						tension: 0.3,
-						fill: true,
-						pointRadius: 0,
-					},
-					{
-						label: '지난달 누적 지출',
-						data: prevAligned,
-						borderColor: '#9ca3af',
-						backgroundColor: 'rgba(156,163,175,0.12)',
-						borderWidth: 2,
-						tension: 0.3,
-						fill: true,
-						pointRadius: 0,
-					},
-				],
-				labels
-			);
+			renderChart(canvas, datasets, labels);
 		}
 	
 
 	  
 
-	async function fetchMonthlyCats(year, month) {
-		const res = await fetch(`/api/stats/monthly-cats?year=${year}&month=${month}`);
-		if (!res.ok) throw new Error('monthly-cats api failed');
-		return res.json(); // { total, items:[{category, amount, pct}] }
-	}
-
-	async function updateCategoryPills(year = monthYM.year, month = monthYM.month) {
+	function updateCategoryPills(dash) {
 		const wrap = document.getElementById('categoryBreak');
 		const msgEl = document.getElementById('topCategoryMsg');
 		if (!wrap) return;
 		wrap.innerHTML = '';
 
 		try {
-			const { items = [] } = await fetchMonthlyCats(year, month);
+			const { items = [], total = 0 } = dash.categories || {};
 
 			if (!items.length) {
 				const span = document.createElement('span');
@@ -478,7 +482,7 @@ async function updateBalanceCard(year = monthYM.year, month = monthYM.month) {
 
 	  
 	async function fetchWeekly(n = 10, offset = 0) {
-		const res = await fetch(`/api/stats/weekly?n=${n}&offset=${offset}`);
+		const res = await fetch(`/api/stats/weekly?n=${n}&offset=${offset}`, { cache: 'no-cache' });
 		if (!res.ok) throw new Error('weekly api failed');
 		const data = await res.json();
 		data.net = (data.net || []).map(v => Number(v) || 0);
@@ -488,7 +492,11 @@ async function updateBalanceCard(year = monthYM.year, month = monthYM.month) {
 	  
 	async function updateWeeklySection() {
 		const n = 10;
-		const { labels = [], net = [] } = await fetchWeekly(n, weeklyOffset);
+		renderWeekly(await fetchWeekly(n, weeklyOffset));
+	}
+
+	function renderWeekly({ labels = [], net = [] }) {
+		net = net.map(v => Number(v) || 0);
 
 		// KPI
 		document.getElementById('wtSum').textContent =
@@ -554,26 +562,23 @@ async function updateBalanceCard(year = monthYM.year, month = monthYM.month) {
 		bindTabs();
 		bindRangeButtons();
 		renderBalance();
-		await updateMonthlyTotalSection();  
-		await updateMonthlySpendSection();  
-		await updateWeeklySection(); 
-		updateBalanceCard();
-		updateCategoryPills();
-		loadSpendingAdvice();
+		try {
+			// 첫 화면은 페이지에 같이 온 대시보드(없으면 요청 1번)로 모두 그림 (주간은 이번 주 기준, offset=0)
+			const dash = await loadMonth(monthYM.year, monthYM.month, readInitialDashboard(monthYM.year, monthYM.month));
+			renderWeekly(dash.weekly || {});
+			renderAdvice(dash.advice);
+		} catch (e) {
+			console.error('Error loading dashboard:', e);
+		}
 	}
 
-	// ---------- (신규) 지출 조언 API 호출 ----------
-    async function loadSpendingAdvice() {
+	// ---------- (신규) 지출 조언 표시 ----------
+    function renderAdvice(advice) {
         try {
-            const res = await fetch('/api/stats/spending-advice');
-            if (!res.ok) return; // 에러 시 조용히 실패
-
-            const data = await res.json();
-
             // 1. '조언' 메시지가 있는지 확인
-            if (data.advice) {
+            if (advice) {
                 // 2. 메시지를 HTML에 삽입
-                document.getElementById('advice-message').textContent = data.advice;
+                document.getElementById('advice-message').textContent = advice;
                 // 3. 숨겨둔 카드를 보여주기
                 document.getElementById('advice-card').style.display = 'block';
             } else {
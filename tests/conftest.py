@@ -0,0 +1,127 @@
+"""
+pytest 공통 설정 (프로젝트 루트에서 python -m pytest -q)
+
+modules/config.py 대신 테스트용 설정 모듈을 먼저 넣고 app 을 불러옵니다. (실제 DB 는 건드리지 않음)
+    - 기본: 임시 디렉터리의 SQLite 파일 (storage_backend = 'sqlite')
+    - GAGYABU_TEST_MYSQL_DB 가 있으면 그 MySQL DB 에 마이그레이션을 적용하고 같은 테스트를 실행
+      (DB 이름에 'test' 가 있어야 함, 접속 정보는 GAGYABU_TEST_MYSQL_HOST / _PORT / _USER / _PASSWORD)
+
+테스트마다 새 사용자(pytest_<임의 문자열>)로 가입/로그인하므로 서로의 내역이나 캐시에 영향을 주지 않습니다.
+"""
+import os
+import sys
+import types
+import uuid
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+MYSQL_DB = os.environ.get('GAGYABU_TEST_MYSQL_DB')
+USER_PREFIX = 'pytest_'
+PASSWORD = 'pytest-pass'
+
+_tmpdir = tempfile.TemporaryDirectory(prefix='gagyabu-test-')
+
+config = types.ModuleType('modules.config')
+config.secret = 'pytest'
+config.password_pbkdf2_iterations = 1000    # 가입/로그인이 많으므로 해시 비용을 낮춤
+config.login_rate_per_ip = 100000
+config.login_burst_per_ip = 100000
+config.recurring_scheduler_enabled = False
+config.advice_refresh_enabled = False
+if MYSQL_DB:
+    if 'test' not in MYSQL_DB:
+        raise RuntimeError(f"GAGYABU_TEST_MYSQL_DB 이름에 'test' 가 없습니다: {MYSQL_DB!r}")
+    config.storage_backend = 'mysql'
+    config.host = os.environ.get('GAGYABU_TEST_MYSQL_HOST', '127.0.0.1')
+    config.port = int(os.environ.get('GAGYABU_TEST_MYSQL_PORT', 3306))
+    config.user = os.environ.get('GAGYABU_TEST_MYSQL_USER', 'root')
+    config.passwd = os.environ.get('GAGYABU_TEST_MYSQL_PASSWORD', '')
+    config.db = MYSQL_DB
+else:
+    config.storage_backend = 'sqlite'
+    config.sqlite_path = os.path.join(_tmpdir.name, 'gagyabu.sqlite3')
+
+import modules  # noqa: E402
+sys.modules['modules.config'] = config
+modules.config = config
+
+from modules import migrate  # noqa: E402
+from modules.user import db_connector  # noqa: E402
+
+# 테스트 사용자 행을 지울 테이블 (MySQL 테스트 DB 를 다시 써도 쌓이지 않게)
+_CLEANUP_SQL = (
+    "DELETE FROM recurring_occurrence WHERE rule_id IN "
+    "(SELECT id FROM recurring_rule WHERE user_id LIKE %s)",
+    "DELETE FROM recurring_rule WHERE user_id LIKE %s",
+    "DELETE FROM ledger_summary WHERE user_id LIKE %s",
+    "DELETE FROM ledger WHERE user_id LIKE %s",
+    "DELETE FROM user WHERE id LIKE %s",
+)
+
+
+@pytest.fixture(scope='session')
+def app():
+    if MYSQL_DB:
+        db = db_connector()
+        try:
+            migrate.apply(db)
+        finally:
+            db.close()
+
+    import app as app_module
+    yield app_module.app
+
+    if MYSQL_DB:
+        db = db_connector()
+        cur = db.cursor()
+        try:
+            for sql in _CLEANUP_SQL:
+                cur.execute(sql, (USER_PREFIX.replace('_', '\\_') + '%',))
+            db.commit()
+        finally:
+            cur.close()
+            db.close()
+
+
+def new_user_id():
+    return USER_PREFIX + uuid.uuid4().hex[:12]
+
+
+def login_client(app, user_id=None):
+    """ 새 사용자로 가입 + 로그인한 test client (client.user_id 에 아이디) """
+    user_id = user_id or new_user_id()
+    client = app.test_client()
+    resp = client.post('/api/register', json={'username': user_id, 'id': user_id, 'password': PASSWORD})
+    assert resp.status_code == 201, resp.get_json()
+    resp = client.post('/login_check', json={'id': user_id, 'password': PASSWORD})
+    assert resp.get_json()['success']
+    client.user_id = user_id
+    return client
+
+
+@pytest.fixture
+def client(app):
+    return login_client(app)
+
+
+@pytest.fixture
+def db(app):
+    conn = db_connector()
+    yield conn
+    conn.close()
+
+
+def add(client, day, amount, type='출금', desc='테스트', category=None, pay=None):
+    """ /add 로 내역 하나 추가 -> 새 id """
+    body = {'date': day, 'type': type, 'desc': desc, 'amount': amount}
+    if category:
+        body['category'] = category
+    if pay:
+        body['payment_method'] = pay
+    resp = client.post('/add', json=body)
+    assert resp.status_code == 200, resp.get_json()
+    return resp.get_json()['id']
@@ -0,0 +1,54 @@
+""" 비동기 앱(asgi.py): DB 없이 확인할 수 있는 라우트/로그인 확인/접근 제한 (DB 를 쓰는 API 는 MySQL 에서만 동작) """
+import asyncio
+
+import pytest
+
+pytest.importorskip('quart')
+pytest.importorskip('aiomysql')
+
+import asgi  # noqa: E402
+from modules import metrics  # noqa: E402
+
+# Quart 테스트 클라이언트의 기본 주소는 '<local>' 이라 주소를 직접 지정
+LOCAL = {'client': ('127.0.0.1', 1234)}
+OUTSIDE = {'client': ('203.0.113.5', 1234)}
+
+
+def request(path, **kwargs):
+    async def go():
+        resp = await asgi.app.test_client().get(path, **kwargs)
+        return resp.status_code, resp.headers, await resp.get_data(as_text=True)
+    return asyncio.run(go())
+
+
+def test_routes_match_sync_app(app):
+    endpoints = {rule.endpoint for rule in asgi.app.url_map.iter_rules()}
+    sync_only = {rule.endpoint for rule in app.url_map.iter_rules()} - endpoints
+    assert {'stats_dashboard', 'stats_monthly_spend', 'add_transaction', 'db_pool_stats'} <= endpoints
+    # 대량 처리 API 는 동기 앱에만 있음
+    assert {'import_transactions', 'batch_transactions'} <= sync_only
+
+
+def test_login_required():
+    status, _, html = request('/login')
+    assert status == 200 and '<form' in html
+    status, headers, _ = request('/ledger')
+    assert status == 302 and headers['Location'].endswith('/login?next=/ledger')
+    assert request('/')[0] == 302
+    status, _, body = request('/api/stats/weekly')
+    assert status == 401 and '"success":false' in body.replace(' ', '')
+    assert request('/transactions')[0] == 401
+
+
+@pytest.mark.skipif(not metrics.ENABLED, reason="metrics_enabled = False")
+def test_restricted_endpoints_hidden_from_outside():
+    assert request('/metrics', scope_base=LOCAL)[0] == 200
+    assert request('/metrics', scope_base=OUTSIDE)[0] == 404
+    assert request('/api/db/pool-stats', scope_base=LOCAL)[0] == 200
+    assert request('/api/db/pool-stats', scope_base=OUTSIDE)[0] == 404
+
+
+def test_create_app_returns_new_app():
+    other = asgi.create_app()
+    assert other is not asgi.app
+    assert {r.endpoint for r in other.url_map.iter_rules()} == {r.endpoint for r in asgi.app.url_map.iter_rules()}
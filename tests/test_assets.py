@@ -0,0 +1,77 @@
+""" 정적 파일 빌드: 축소, 해시 파일명, 미리 압축한 파일 서비스, 옛 빌드 정리 """
+import gzip
+import json
+import shutil
+
+import pytest
+
+from modules import assets
+
+
+def test_minify_js_keeps_strings_regex_and_templates():
+    source = """
+    // 주석
+    const a = "a  // b";   /* 블록 */
+    const re = /\\/+[/]x/g, half = total / 2;
+    const t = `  ${ n  /  2 }  // ${"}"}  `;
+
+    return a
+    """
+    assert assets.minify_js(source) == (
+        'const a = "a  // b";\n'
+        'const re = /\\/+[/]x/g, half = total / 2;\n'
+        'const t = `  ${ n / 2 }  // ${"}"}  `;\n'
+        'return a\n'
+    )
+
+
+def test_minify_css_keeps_strings():
+    source = '/* 주석 */\n.a  >  .b {\n  content: " , ";\n  color : red;\n}\n'
+    assert assets.minify_css(source) == '.a>.b{content: " , ";color : red}'
+
+
+@pytest.fixture
+def static_copy(tmp_path, monkeypatch):
+    """ static/ 복사본에서 빌드 (저장소의 static/dist 는 건드리지 않음) """
+    static = tmp_path / 'static'
+    shutil.copytree(assets.STATIC_DIR, static, ignore=shutil.ignore_patterns('dist'))
+    monkeypatch.setattr(assets, 'STATIC_DIR', str(static))
+    monkeypatch.setattr(assets, 'DIST_DIR', str(static / 'dist'))
+    monkeypatch.setattr(assets, 'MANIFEST_PATH', str(static / 'dist' / 'manifest.json'))
+    monkeypatch.setattr(assets, 'USE_BUILD', True)
+    monkeypatch.setattr(assets, '_manifest', None)
+    return static
+
+
+def test_build_and_prune(static_copy):
+    report = {path: name for path, name, *_ in assets.build()}
+    assert report['js/ledger.js'].startswith('js/ledger.') and report['css/common.css'].endswith('.css')
+    dist = static_copy / 'dist'
+    assert json.loads((dist / 'manifest.json').read_text(encoding='utf-8')) == report
+    built = (dist / report['js/ledger.js']).read_bytes()
+    assert gzip.decompress((dist / (report['js/ledger.js'] + '.gz')).read_bytes()) == built
+
+    # 내용이 바뀌면 새 이름, 옛 파일은 prune 할 때까지 남음
+    (static_copy / 'js' / 'ledger.js').write_text('var changed = 1;\n', encoding='utf-8')
+    old = report['js/ledger.js']
+    new = dict((p, n) for p, n, *_ in assets.build())['js/ledger.js']
+    assert new != old and (dist / old).exists()
+    removed = assets.prune()
+    assert sorted(removed)[:2] == [old, old + '.gz']
+    assert not (dist / old).exists() and (dist / new).exists()
+
+
+def test_serve_built_files(app, static_copy):
+    assets.build()
+    client = app.test_client()
+    html = client.get('/login').get_data(as_text=True)
+    url = next(part.split('"')[0] for part in html.split('src="')[1:] if '/static/dist/' in part)
+
+    plain = client.get(url)
+    assert plain.status_code == 200
+    assert plain.headers['Cache-Control'] == assets.CACHE_CONTROL
+    assert 'Content-Encoding' not in plain.headers and 'javascript' in plain.mimetype
+
+    gz = client.get(url, headers={'Accept-Encoding': 'gzip'})
+    assert gz.headers['Content-Encoding'] == 'gzip' and gz.headers['Vary'] == 'Accept-Encoding'
+    assert gzip.decompress(gz.get_data()) == plain.get_data()
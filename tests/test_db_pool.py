@@ -0,0 +1,81 @@
+""" 커넥션 풀 재사용/상한/대기 시간 초과, /api/db/pool-stats 접근 제한 """
+import threading
+
+import pytest
+
+from modules.db_pool import ConnectionPool, PoolTimeoutError
+
+
+class FakeConnection:
+    """ 풀이 부르는 rollback/ping/close 만 가진 연결 """
+
+    def __init__(self, alive=True):
+        self.alive = alive
+        self.closed = False
+
+    def rollback(self):
+        if not self.alive:
+            raise ConnectionError("끊긴 연결")
+
+    def ping(self, reconnect=False):
+        if not self.alive:
+            raise ConnectionError("끊긴 연결")
+
+    def close(self):
+        self.closed = True
+
+
+def make_pool(**kwargs):
+    made = []
+
+    def connect():
+        made.append(FakeConnection())
+        return made[-1]
+
+    return ConnectionPool(connect, **kwargs), made
+
+
+def test_close_returns_connection_for_reuse():
+    pool, made = make_pool(max_size=2)
+    db = pool.acquire()
+    db.close()
+    db.close()  # 두 번 반납해도 한 번만
+    with pool.acquire() as again:
+        assert again._conn is made[0]
+    stats = pool.stats()
+    assert (stats['size'], stats['idle'], stats['hits'], stats['misses']) == (1, 1, 1, 1)
+
+
+def test_full_pool_waits_then_times_out():
+    pool, _ = make_pool(max_size=1, wait_timeout=0.05)
+    held = pool.acquire()
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
+
+    # 기다리는 중에 반납되면 그 연결을 받음
+    timer = threading.Timer(0.01, held.close)
+    pool.wait_timeout = 1
+    timer.start()
+    pool.acquire().close()
+    timer.join()
+    stats = pool.stats()
+    assert stats['timeouts'] == 1 and stats['waits'] == 2 and stats['size'] == 1
+
+
+def test_broken_connections_are_discarded():
+    pool, made = make_pool(max_size=2, ping_interval=0)
+    pool.acquire().close()
+    made[0].alive = False
+    db = pool.acquire()  # ping 실패 -> 버리고 새로 연결
+    assert db._conn is made[1] and made[0].closed
+    made[1].alive = False
+    db.close()           # rollback 실패 -> 풀에 넣지 않고 버림
+    stats = pool.stats()
+    assert (stats['size'], stats['idle'], stats['discarded']) == (0, 0, 2)
+
+
+def test_pool_stats_requires_metrics_access(app, client):
+    assert client.get('/api/db/pool-stats').status_code == 200
+    outside = {'REMOTE_ADDR': '203.0.113.5'}
+    assert client.get('/api/db/pool-stats', environ_base=outside).status_code == 404
+    assert app.test_client().get('/api/db/pool-stats', environ_base=outside).status_code == 404
@@ -0,0 +1,47 @@
+""" /transactions?format=csv|ndjson 스트리밍 내보내기 """
+import csv
+import io
+import json
+
+from conftest import add
+
+
+def test_csv_export(client):
+    first = add(client, '2025-03-01', 1000, desc='김밥, 라면', category='식비', pay='카드')
+    second = add(client, '2025-03-02', 5000, type='입금', desc='용돈')
+
+    resp = client.get('/transactions?format=csv')
+    assert resp.status_code == 200
+    assert resp.mimetype == 'text/csv'
+    assert 'attachment' in resp.headers['Content-Disposition']
+    rows = list(csv.reader(io.StringIO(resp.get_data(as_text=True))))
+    assert rows[0] == ['id', 'date', 'type', 'description', 'amount', 'category', 'pay']
+    # 전체 목록과 같은 순서 (최신 날짜부터), 쉼표가 든 내용은 따옴표로 감쌈
+    assert [(int(r[0]), r[1], r[3], r[4], r[6]) for r in rows[1:]] == [
+        (second, '2025-03-02', '용돈', '5000', ''),
+        (first, '2025-03-01', '김밥, 라면', '1000', '카드'),
+    ]
+
+
+def test_csv_export_without_rows_sends_header(client):
+    resp = client.get('/transactions?format=csv')
+    assert resp.get_data(as_text=True).splitlines() == ['id,date,type,description,amount,category,pay']
+
+
+def test_ndjson_export_matches_full_list(client):
+    for i, day in enumerate(('2025-01-05', '2025-02-10', '2025-02-10')):
+        add(client, day, 100 * (i + 1), category='식비')
+
+    resp = client.get('/transactions?format=ndjson')
+    assert resp.mimetype == 'application/x-ndjson'
+    lines = resp.get_data(as_text=True).splitlines()
+    assert [json.loads(line) for line in lines] == client.get('/transactions').get_json()['transactions']
+
+
+def test_compact_rows(client):
+    tx_id = add(client, '2025-03-01', 1000, category='식비', pay='현금')
+    body = client.get('/transactions?compact=1').get_json()['transactions']
+    assert body['columns'][:2] == ['id', 'date']
+    [row] = body['rows']
+    assert dict(zip(body['columns'], row)) == client.get('/transactions').get_json()['transactions'][0]
+    assert row[0] == tx_id
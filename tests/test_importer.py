@@ -0,0 +1,76 @@
+""" 거래내역 파일 가져오기: 열 이름 맞추기, 중복 건너뛰기, 인코딩 오류 보고 """
+import io
+from datetime import date
+
+import pytest
+
+from conftest import add
+from modules import importer
+
+
+def upload(client, data, filename='bank.csv', **form):
+    return client.post('/api/import', data={'file': (io.BytesIO(data), filename), **form},
+                       content_type='multipart/form-data')
+
+
+def test_map_header_and_parse_row():
+    mapping = importer.map_header(['거래일자', '적요', '출금액', '입금액', '비고'])
+    assert mapping == {'date': 0, 'description': 1, 'spend': 2, 'income': 3}
+    assert importer.parse_row(['2025.03.01 12:30', ' 김밥 ', '4,500원', ''], mapping) == {
+        'date': date(2025, 3, 1), 'type': '출금', 'description': '김밥',
+        'amount': 4500, 'category': None, 'pay': None,
+    }
+    assert importer.parse_row(['20250302', '월급', '', '100000'], mapping)['type'] == '입금'
+    with pytest.raises(ValueError):
+        importer.parse_row(['2025-03-01', 'x', '100', '100'], mapping)
+
+    # 금액 하나로 된 파일은 부호로 입금/출금, 입금은 지불수단 없음
+    mapping = importer.map_header(['date', 'amount', 'pay', 'category'])
+    row = importer.parse_row(['2025-03-01', '-3000', '카드', '식비'], mapping)
+    assert (row['type'], row['amount'], row['pay'], row['category']) == ('출금', 3000, '카드', '식비')
+    row = importer.parse_row(['2025-03-01', '3000', '카드', '급여'], mapping)
+    assert (row['type'], row['pay'], row['category']) == ('입금', None, '급여')
+
+    with pytest.raises(importer.ImportFormatError):
+        importer.map_header(['내용', '금액'])
+
+
+def test_reimport_skips_existing_rows(client):
+    add(client, '2025-03-01', 3000, desc='김밥')
+    rows = [['날짜', '내용', '금액'],
+            ['2025-03-01', '김밥', '-3000'],
+            ['2025-03-01', '김밥', '-3000'],   # 기존 1건과 짝지어지고 남은 1건은 새로 넣음
+            ['2025-03-02', '라면', '-2000'],
+            [],
+            ['2025-13-01', '잘못된 날짜', '-1']]
+    report = importer.import_rows(client.user_id, rows, chunk_size=1)
+    assert (report['rows'], report['inserted'], report['duplicates'], report['error_count']) == (4, 2, 1, 1)
+    assert report['errors'][0]['row'] == 6   # 머리글이 1행, 빈 줄도 셈
+
+    again = importer.import_rows(client.user_id, rows, chunk_size=2)
+    assert (again['inserted'], again['duplicates']) == (0, 3)
+    assert len(client.get('/transactions').get_json()['transactions']) == 3
+
+
+def test_dry_run_inserts_nothing(client):
+    resp = upload(client, '날짜,내용,금액\n2025-03-01,김밥,-3000\n'.encode('utf-8'), dry_run='1')
+    assert resp.status_code == 200
+    assert (resp.get_json()['dry_run'], resp.get_json()['inserted']) == (True, 1)
+    assert client.get('/transactions').get_json()['transactions'] == []
+
+
+def test_cp949_upload(client):
+    data = '거래일자,적요,출금액,입금액\n2025-03-01,김밥,3000,\n'.encode('cp949')
+    assert upload(client, data).status_code == 400
+    resp = upload(client, data, encoding='cp949')
+    assert resp.get_json()['inserted'] == 1
+
+
+def test_decode_error_mid_file_keeps_earlier_rows(client):
+    good = ''.join(f'2025-03-{i % 28 + 1:02d},row{i},-{1000 + i}\n' for i in range(30))
+    data = ('날짜,내용,금액\n' + good).encode('utf-8') + '2025-03-01,김밥,-3000\n'.encode('cp949')
+    resp = upload(client, data)
+    assert resp.status_code == 200
+    report = resp.get_json()
+    assert (report['rows'], report['inserted'], report['error_count']) == (30, 30, 1)
+    assert report['errors'] == [{'row': 32, 'error': importer.DECODE_ERROR}]
@@ -0,0 +1,124 @@
+""" 내역 추가/수정/삭제, 목록/검색 keyset 페이지 """
+from conftest import add, login_client
+
+
+def by_date(client, day):
+    resp = client.get(f'/transactions-by-date?date={day}')
+    assert resp.status_code == 200
+    return resp.get_json()['transactions']
+
+
+def test_requires_login(app):
+    resp = app.test_client().get('/transactions-by-date?date=2025-03-01')
+    assert resp.status_code == 401
+
+
+def test_add_edit_delete(client):
+    resp = client.post('/add', json={'date': '2025-03-01', 'type': '출금', 'desc': '김밥',
+                                     'amount': '4,500', 'category': '식비', 'payment_method': '카드'})
+    assert resp.status_code == 200
+    body = resp.get_json()
+    new_id = body['id']
+    assert body['activeDates'] == ['2025-03-01']
+    assert [(r['id'], r['amount'], r['category'], r['pay']) for r in body['transactions']] == \
+        [(new_id, 4500, '식비', '카드')]
+
+    resp = client.post('/edit', json={'id': new_id, 'date': '2025-03-02', 'type': '출금',
+                                      'desc': '김밥 두 줄', 'amount': 9000})
+    assert resp.get_json() == {'success': True}
+    assert by_date(client, '2025-03-01') == []
+    [row] = by_date(client, '2025-03-02')
+    assert (row['id'], row['description'], row['amount']) == (new_id, '김밥 두 줄', 9000)
+
+    resp = client.post('/delete', json={'id': new_id})
+    assert resp.status_code == 200
+    assert resp.get_json()['activeDates'] == []
+    assert by_date(client, '2025-03-02') == []
+    assert client.post('/delete', json={'id': new_id}).status_code == 404
+    assert client.post('/edit', json={'id': new_id, 'date': '2025-03-02', 'type': '출금',
+                                      'desc': 'x', 'amount': 1}).status_code == 404
+
+
+def test_income_has_no_pay(client):
+    # /add, /edit, 배치 API 모두 입금은 지불수단을 NULL 로 저장
+    income = add(client, '2025-03-01', 5000, type='입금', pay='카드')
+    spend = add(client, '2025-03-01', 1000, pay='카드')
+    client.post('/edit', json={'id': spend, 'date': '2025-03-01', 'type': '입금', 'desc': 'x', 'amount': 1000})
+    resp = client.post('/api/transactions/batch', json={'operations': [
+        {'op': 'create', 'date': '2025-03-01', 'type': '입금', 'desc': 'b', 'amount': 400, 'payment_method': '현금'},
+    ]})
+    assert resp.status_code == 200, resp.get_json()
+    rows = by_date(client, '2025-03-01')
+    assert len(rows) == 3 and {r['pay'] for r in rows} == {None}
+    assert income in {r['id'] for r in rows}
+
+
+def test_add_rejects_invalid_input(client):
+    base = {'date': '2025-03-01', 'type': '출금', 'desc': 'x', 'amount': 1000}
+    for bad in ({'amount': 'abc'}, {'type': '환불'}, {'date': '2025-13-01'}, {'category': '없는분류'}):
+        resp = client.post('/add', json={**base, **bad})
+        assert resp.status_code == 400, bad
+    assert by_date(client, '2025-03-01') == []
+
+
+def test_other_user_rows_are_hidden(app, client):
+    tx_id = add(client, '2025-03-01', 1000)
+    other = login_client(app)
+    assert by_date(other, '2025-03-01') == []
+    assert other.post('/delete', json={'id': tx_id}).status_code == 404
+    assert other.post('/edit', json={'id': tx_id, 'date': '2025-03-01', 'type': '출금',
+                                     'desc': 'x', 'amount': 1}).status_code == 404
+    assert len(by_date(client, '2025-03-01')) == 1
+
+
+def collect_pages(client, path, limit):
+    """ next 를 따라가며 모든 페이지의 id 목록 """
+    ids, after = [], None
+    while True:
+        url = f'{path}{"&" if "?" in path else "?"}limit={limit}' + (f'&after={after}' if after else '')
+        resp = client.get(url)
+        assert resp.status_code == 200
+        body = resp.get_json()
+        assert len(body['transactions']) <= limit
+        ids += [r['id'] for r in body['transactions']]
+        after = body['next']
+        if after is None:
+            return ids
+
+
+def test_transactions_keyset_paging(client):
+    days = ['2025-01-05', '2025-02-10', '2025-02-10', '2025-02-10', '2025-03-01', '2025-03-01', '2025-04-20']
+    ids = {add(client, d, 1000 + i): d for i, d in enumerate(days)}
+    # 최신 날짜부터, 같은 날짜는 id 큰 것부터
+    expected = sorted(ids, key=lambda i: (ids[i], i), reverse=True)
+
+    for limit in (1, 3, 7, 10):
+        assert collect_pages(client, '/transactions', limit) == expected
+    full = client.get('/transactions').get_json()['transactions']
+    assert [r['id'] for r in full] == expected
+
+    assert client.get('/transactions?after=bad&limit=3').status_code == 400
+
+
+def test_search_paging_and_short_terms(app, client):
+    kimbap = [add(client, f'2025-03-0{i}', 3000, desc=desc)
+              for i, desc in enumerate(('김밥천국', '점심 김밥', '편의점 김밥 두 줄'), start=1)]
+    add(client, '2025-03-04', 5000, desc='스타벅스 커피')
+    add(login_client(app), '2025-03-05', 3000, desc='김밥')   # 다른 사용자
+
+    # 2글자 한글 검색어, 최신순
+    assert collect_pages(client, '/api/transactions/search?q=김밥', 2) == kimbap[::-1]
+    # 여러 단어는 모두 포함하는 내역
+    resp = client.get('/api/transactions/search?q=김밥 점심')
+    assert [r['id'] for r in resp.get_json()['transactions']] == [kimbap[1]]
+    # trigram 이상 길이
+    resp = client.get('/api/transactions/search?q=스타벅스')
+    assert [r['description'] for r in resp.get_json()['transactions']] == ['스타벅스 커피']
+    # 금액 조건
+    resp = client.get('/api/transactions/search?min_amount=4000')
+    assert [r['amount'] for r in resp.get_json()['transactions']] == [5000]
+    # LIKE 특수 문자는 글자 그대로
+    resp = client.get('/api/transactions/search?q=%25')
+    assert resp.get_json()['transactions'] == []
+
+    assert client.get('/api/transactions/search?min_amount=5&max_amount=1').status_code == 400
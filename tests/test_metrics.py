@@ -0,0 +1,53 @@
+""" /metrics 접근 제한과 Prometheus 출력 """
+import pytest
+
+from modules import metrics
+
+OUTSIDE = {'REMOTE_ADDR': '203.0.113.5'}
+
+
+def test_allowed_by_ip_and_proxy_headers(monkeypatch):
+    monkeypatch.setattr(metrics, 'TOKEN', None)
+    monkeypatch.setattr(metrics, 'TRUST_PROXY', False)
+    assert metrics.allowed('127.0.0.1', {})
+    assert not metrics.allowed('203.0.113.5', {})
+    # 같은 서버의 프록시를 거친 외부 요청은 127.0.0.1 로 보여도 거절
+    assert not metrics.allowed('127.0.0.1', {'X-Forwarded-For': '203.0.113.5'})
+
+    monkeypatch.setattr(metrics, 'TRUST_PROXY', True)
+    assert not metrics.allowed('127.0.0.1', {'X-Forwarded-For': '203.0.113.5'})
+    assert metrics.allowed('10.0.0.2', {'X-Forwarded-For': '203.0.113.5, 127.0.0.1'})
+
+
+def test_allowed_by_token(monkeypatch):
+    monkeypatch.setattr(metrics, 'TOKEN', 's3cret')
+    assert metrics.allowed('203.0.113.5', {'Authorization': 'Bearer s3cret'})
+    assert not metrics.allowed('203.0.113.5', {'Authorization': 'Bearer wrong'})
+    assert not metrics.allowed('203.0.113.5', {'Authorization': 's3cret'})
+
+
+@pytest.mark.skipif(not metrics.ENABLED, reason="metrics_enabled = False")
+def test_metrics_endpoint(app, client):
+    client.get('/transactions')
+    body = app.test_client().get('/metrics').get_data(as_text=True)
+    assert '# TYPE gagyabu_http_request_duration_seconds histogram' in body
+    assert 'endpoint="get_transactions"' in body
+    assert 'gagyabu_ledger_call_duration_seconds_count{function="select_ledger_by_user"}' in body
+
+    assert app.test_client().get('/metrics', environ_base=OUTSIDE).status_code == 404
+    assert app.test_client().get('/metrics', headers={'X-Forwarded-For': '203.0.113.5'}).status_code == 404
+
+
+def test_render_histograms_counters_and_gauges():
+    metrics.reset()
+    metrics.observe('gagyabu_db_query_duration_seconds', 0.003, function='f')
+    metrics.observe('gagyabu_db_query_duration_seconds', 0.2, function='f')
+    metrics.inc('gagyabu_slow_queries_total', function='f"x')
+    lines = metrics.render(metrics.pool_gauges({'size': 2, 'backend': 'x'})).splitlines()
+
+    assert 'gagyabu_db_query_duration_seconds_bucket{function="f",le="0.005"} 1' in lines
+    assert 'gagyabu_db_query_duration_seconds_bucket{function="f",le="+Inf"} 2' in lines
+    assert 'gagyabu_db_query_duration_seconds_count{function="f"} 2' in lines
+    assert 'gagyabu_slow_queries_total{function="f\\"x"} 1' in lines
+    assert lines[-2:] == ['# TYPE gagyabu_db_pool_size gauge', 'gagyabu_db_pool_size 2']
+    metrics.reset()
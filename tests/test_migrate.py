@@ -0,0 +1,98 @@
+""" 마이그레이션 파일 읽기, Check/적용/되돌리기 (적용 테스트는 MySQL 에서만) """
+import uuid
+
+import pytest
+
+from conftest import MYSQL_DB
+from modules import migrate
+
+
+def write(tmp_path, filename, text):
+    (tmp_path / filename).write_text(text, encoding='utf-8')
+
+
+def test_split_statements_skips_comments():
+    sql = """
+    -- 주석
+    CREATE TABLE t (
+        id INT  -- 줄 끝 주석은 그대로
+    );
+
+    INSERT INTO t VALUES (1);
+    SELECT 1
+    """
+    assert [' '.join(s.split()) for s in migrate.split_statements(sql)] == [
+        'CREATE TABLE t ( id INT -- 줄 끝 주석은 그대로 )',
+        'INSERT INTO t VALUES (1)',
+        'SELECT 1',
+    ]
+
+
+def test_load_migrations_sections(tmp_path):
+    write(tmp_path, '0002_second.sql', "-- +migrate Up\nSELECT 2;\n")
+    write(tmp_path, '0001_first.sql',
+          "-- 설명\n-- +migrate Check\nSELECT 0;\n-- +migrate Up\nSELECT 1;\nSELECT 11;\n-- +migrate Down\nSELECT -1;\n")
+    write(tmp_path, 'README.md', "무시")
+
+    first, second = migrate.load_migrations(str(tmp_path))
+    assert (first.version, first.name, first.up, first.down, first.check) == \
+        (1, 'first', ['SELECT 1', 'SELECT 11'], ['SELECT -1'], ['SELECT 0'])
+    assert (second.version, second.down, second.check) == (2, [], [])
+
+
+def test_load_migrations_rejects_bad_files(tmp_path):
+    write(tmp_path, '0001_a.sql', "-- +migrate Down\nSELECT 1;\n")
+    with pytest.raises(ValueError):
+        migrate.load_migrations(str(tmp_path))
+
+    write(tmp_path, '0001_a.sql', "-- +migrate Up\nSELECT 1;\n")
+    write(tmp_path, '0001_b.sql', "-- +migrate Up\nSELECT 1;\n")
+    with pytest.raises(ValueError):
+        migrate.load_migrations(str(tmp_path))
+
+
+def test_project_migrations_are_reversible():
+    migrations = migrate.load_migrations()
+    assert [m.version for m in migrations] == list(range(1, len(migrations) + 1))
+    assert all(m.up and m.down for m in migrations)
+
+
+@pytest.mark.skipif(not MYSQL_DB, reason="GAGYABU_TEST_MYSQL_DB 가 있을 때만 (MySQL DDL)")
+def test_check_apply_rollback(app, tmp_path, db):
+    table = 'pytest_mig_' + uuid.uuid4().hex[:8]
+    write(tmp_path, '9001_create.sql',
+          f"-- +migrate Up\nCREATE TABLE {table} (v INT NOT NULL);\n"
+          f"-- +migrate Down\nDROP TABLE {table};\n")
+    write(tmp_path, '9002_check.sql',
+          f"-- +migrate Check\nSELECT v FROM {table} WHERE v < 0;\n"
+          f"-- +migrate Up\nALTER TABLE {table} ADD COLUMN w INT NULL;\n"
+          f"-- +migrate Down\nALTER TABLE {table} DROP COLUMN w;\n")
+    migrations = migrate.load_migrations(str(tmp_path))
+
+    try:
+        assert migrate.apply(db, target=9001, migrations=migrations) == [9001]
+        cur = db.cursor()
+        cur.execute(f"INSERT INTO {table} (v) VALUES (-1)")
+        db.commit()
+        cur.close()
+
+        # Check 에 걸리면 적용하지 않음
+        assert migrate.check(db, migrations=migrations) == {9002: 1}
+        with pytest.raises(migrate.CheckFailed):
+            migrate.apply(db, migrations=migrations)
+        assert [s[2] for s in migrate.status(db, migrations)] == [True, False]
+
+        cur = db.cursor()
+        cur.execute(f"DELETE FROM {table}")
+        db.commit()
+        cur.close()
+        assert migrate.apply(db, migrations=migrations) == [9002]
+        assert migrate.apply(db, migrations=migrations) == []
+        assert migrate.rollback(db, steps=2, migrations=migrations) == [9002, 9001]
+        assert [s[2] for s in migrate.status(db, migrations)] == [False, False]
+    finally:
+        cur = db.cursor()
+        cur.execute(f"DROP TABLE IF EXISTS {table}")
+        cur.execute("DELETE FROM schema_migrations WHERE version >= 9000")
+        db.commit()
+        cur.close()
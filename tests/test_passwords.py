@@ -0,0 +1,103 @@
+""" 비밀번호 해시/검증, 평문 비밀번호 업그레이드, 로그인 요청 제한 """
+import pytest
+
+from conftest import PASSWORD, login_client, new_user_id
+from modules import passwords, ratelimit
+from modules.user import db_connector
+
+
+@pytest.mark.parametrize('scheme', ['pbkdf2_sha256', 'scrypt'])
+def test_hash_and_verify(scheme):
+    stored = passwords.hash_password_sync('비밀번호', scheme)
+    assert stored.startswith(scheme + '$')
+    assert stored != passwords.hash_password_sync('비밀번호', scheme)   # salt 가 매번 다름
+    assert passwords.verify_password_sync('비밀번호', stored)[0]
+    assert passwords.verify_password_sync('틀림', stored) == (False, False)
+    assert passwords.needs_rehash(stored) == (scheme != passwords.SCHEME)
+
+
+def test_plaintext_and_broken_hashes():
+    assert passwords.verify_password_sync('plain', 'plain') == (True, True)
+    assert passwords.verify_password_sync('plain', 'other') == (False, False)
+    assert passwords.verify_password_sync('x', 'pbkdf2_sha256$abc$$') == (False, False)
+    assert passwords.needs_rehash('pbkdf2_sha256$1$a$b')
+
+
+def test_unknown_id_checks_dummy_hash(monkeypatch):
+    calls = []
+    real = passwords.verify_password_sync
+
+    def spy(password, stored):
+        calls.append(stored)
+        return real(password, stored)
+
+    monkeypatch.setattr(passwords, 'verify_password_sync', spy)
+    assert passwords.verify_password('x', None) == (False, False)
+    # 없는 아이디도 더미 해시로 한 번 더 계산함
+    assert calls[0] is None and calls[1] == passwords._get_dummy_hash()
+
+
+def test_plaintext_password_is_upgraded_on_login(app):
+    user_id = new_user_id()
+    db = db_connector()
+    cur = db.cursor()
+    try:
+        cur.execute("INSERT INTO user (user_name, id, password) VALUES (%s, %s, %s)", (user_id, user_id, PASSWORD))
+        db.commit()
+    finally:
+        cur.close()
+        db.close()
+
+    client = app.test_client()
+    assert client.post('/login_check', json={'id': user_id, 'password': PASSWORD}).get_json()['success']
+
+    db = db_connector()
+    cur = db.cursor()
+    try:
+        cur.execute("SELECT password FROM user WHERE id = %s", (user_id,))
+        row = cur.fetchone()
+    finally:
+        cur.close()
+        db.close()
+    stored = row['password'] if isinstance(row, dict) else row[0]
+    assert stored.startswith(passwords.SCHEME + '$') and not passwords.needs_rehash(stored)
+
+
+def test_login_rejects_non_string_fields(app):
+    client = app.test_client()
+    for body in ({'id': ['a'], 'password': PASSWORD}, {'id': 'a', 'password': 1234}, {'id': 'a'}):
+        assert client.post('/login_check', json=body).status_code == 400, body
+    resp = client.post('/api/register', json={'username': 'x', 'id': new_user_id(), 'password': {'a': 1}})
+    assert resp.status_code == 400
+
+
+def test_login_rate_limit_per_id(app):
+    client = login_client(app)
+    other = app.test_client()
+    try:
+        for _ in range(ratelimit.login_by_id.burst):
+            assert other.post('/login_check', json={'id': client.user_id, 'password': 'x'}).status_code == 200
+        resp = other.post('/login_check', json={'id': client.user_id, 'password': PASSWORD})
+        assert resp.status_code == 429
+        assert int(resp.headers['Retry-After']) >= 1
+        assert resp.get_json()['success'] is False
+    finally:
+        ratelimit.login_by_id.reset(client.user_id)
+    assert other.post('/login_check', json={'id': client.user_id, 'password': PASSWORD}).get_json()['success']
+
+
+def test_token_bucket(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(ratelimit.time, 'monotonic', lambda: now[0])
+    limiter = ratelimit.TokenBucketLimiter(rate=1, burst=2, max_keys=2)
+    assert limiter.allow('a') == (True, 0.0)
+    assert limiter.allow('a') == (True, 0.0)
+    assert limiter.allow('a') == (False, 1.0)
+    now[0] += 0.5
+    assert limiter.allow('a') == (False, 0.5)
+    now[0] += 0.5
+    assert limiter.allow('a')[0]
+
+    limiter.allow('b')
+    limiter.allow('c')      # 가장 오래 안 쓴 a 는 잊힘 (다시 가득 찬 버킷)
+    assert list(limiter._buckets) == ['b', 'c']
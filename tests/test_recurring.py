@@ -0,0 +1,118 @@
+""" 반복 내역: 회차 계산, 밀린 회차 넣기(한 번만), 종료일 변경, 이번 달 예정 금액 """
+from datetime import date, timedelta
+
+import pytest
+
+from conftest import login_client
+from modules import recurring, summary
+
+
+@pytest.fixture
+def client(app):
+    """ 테스트가 끝나면 규칙을 지움 (materialize 는 모든 사용자의 규칙을 보므로 다른 테스트에 남지 않게) """
+    client = login_client(app)
+    yield client
+    for rule in client.get('/api/recurring').get_json()['rules']:
+        client.delete(f"/api/recurring/{rule['id']}")
+
+
+def create(client, **body):
+    data = {'type': '출금', 'desc': '월세', 'amount': 500000, 'freq': 'monthly', **body}
+    resp = client.post('/api/recurring', json=data)
+    assert resp.status_code == 201, resp.get_json()
+    return resp.get_json()['id']
+
+
+def ledger_rows(client):
+    return sorted((r['date'], r['amount'], r['pay']) for r in client.get('/transactions').get_json()['transactions'])
+
+
+def rule_of(client, rule_id):
+    return next(r for r in client.get('/api/recurring').get_json()['rules'] if r['id'] == rule_id)
+
+
+def test_occurrence_dates():
+    monthly = {'freq': 'monthly', 'every': 1, 'start_date': date(2025, 1, 31), 'end_date': None}
+    assert list(recurring.occurrence_dates(monthly, date(2025, 1, 1), date(2025, 5, 1))) == \
+        [date(2025, 1, 31), date(2025, 2, 28), date(2025, 3, 31), date(2025, 4, 30)]
+
+    biweekly = {'freq': 'weekly', 'every': 2, 'start_date': date(2025, 3, 3), 'end_date': date(2025, 4, 1)}
+    assert list(recurring.occurrence_dates(biweekly, date(2025, 3, 10))) == \
+        [date(2025, 3, 17), date(2025, 3, 31)]
+
+    quarterly = dict(monthly, every=3, end_date=date(2025, 12, 31))
+    assert recurring.first_date(quarterly, date(2025, 2, 1)) == date(2025, 4, 30)
+    assert recurring.first_date(quarterly, date(2025, 11, 1)) is None
+
+
+def test_rule_validation(client):
+    for bad in ({'freq': 'yearly'}, {'every': -1}, {'every': recurring.EVERY_MAX + 1},
+                {'start_date': '2025-02-30'}, {'start_date': '2025-03-01', 'end_date': '2025-02-01'}, {'amount': 'x'}):
+        body = {'type': '출금', 'desc': 'x', 'amount': 1, 'freq': 'daily', 'start_date': '2025-03-01', **bad}
+        assert client.post('/api/recurring', json=body).status_code == 400, bad
+
+
+def test_materialize_inserts_each_occurrence_once(client, db):
+    rule_id = create(client, start_date='2025-01-31', end_date='2025-04-30', payment_method='계좌이체')
+    income = create(client, type='입금', desc='월급', amount=3000000, start_date='2025-02-25',
+                    end_date='2025-03-25', payment_method='카드')
+
+    recurring.run(date(2025, 3, 15))
+    assert ledger_rows(client) == [('2025-01-31', 500000, '계좌이체'), ('2025-02-25', 3000000, None),
+                                   ('2025-02-28', 500000, '계좌이체')]
+    assert rule_of(client, rule_id)['next_date'] == '2025-03-31'
+
+    # 같은 날 다시 실행해도, 넣은 내역을 지워도 다시 넣지 않음
+    first = min(client.get('/transactions').get_json()['transactions'], key=lambda r: r['date'])
+    client.post('/delete', json={'id': first['id']})
+    recurring.run(date(2025, 3, 15))
+    assert len(ledger_rows(client)) == 2
+
+    recurring.run(date(2025, 6, 1))
+    assert [r[0] for r in ledger_rows(client)] == ['2025-02-25', '2025-02-28', '2025-03-25', '2025-03-31', '2025-04-30']
+    assert rule_of(client, rule_id)['next_date'] is None and rule_of(client, income)['next_date'] is None
+    assert summary.check(db, client.user_id) == []
+
+
+def test_materialize_limit_continues_next_run(client):
+    create(client, freq='daily', amount=1000, start_date='2025-03-01', end_date='2025-03-05')
+    recurring.materialize(date(2025, 3, 10), limit=2)
+    assert len(ledger_rows(client)) == 2
+    recurring.materialize(date(2025, 3, 10), limit=2)
+    recurring.materialize(date(2025, 3, 10), limit=2)
+    assert [r[0] for r in ledger_rows(client)] == [f'2025-03-0{d}' for d in range(1, 6)]
+
+
+def test_end_date_change(client):
+    rule_id = create(client, freq='weekly', amount=1000, start_date='2025-03-03', end_date='2025-03-10')
+    recurring.run(date(2025, 3, 31))
+    assert len(ledger_rows(client)) == 2 and rule_of(client, rule_id)['next_date'] is None
+
+    # 종료일을 늘리면 마지막으로 넣은 회차 다음부터 이어짐
+    assert client.patch(f'/api/recurring/{rule_id}', json={'end_date': '2025-03-24'}).status_code == 200
+    assert rule_of(client, rule_id)['next_date'] == '2025-03-17'
+    recurring.run(date(2025, 3, 31))
+    assert [r[0] for r in ledger_rows(client)] == ['2025-03-03', '2025-03-10', '2025-03-17', '2025-03-24']
+
+    assert client.patch(f'/api/recurring/{rule_id}', json={'end_date': '2025-03-01'}).status_code == 400
+    assert client.patch('/api/recurring/999999999', json={'end_date': None}).status_code == 404
+    assert client.delete(f'/api/recurring/{rule_id}').status_code == 200
+    assert len(ledger_rows(client)) == 4   # 넣은 내역은 남음
+
+
+def test_projected_this_month(client):
+    today = date.today()
+    end = date(today.year + (today.month == 12), today.month % 12 + 1, 1)
+    create(client, freq='daily', amount=100, start_date=today.isoformat(), payment_method='카드')
+    remaining = (end - today).days
+
+    url = f'/api/stats/monthly-spend?year={today.year}&month={today.month}'
+    assert 'projected' not in client.get(url).get_json()
+    body = client.get(url + '&projected=1').get_json()
+    assert body['totalSpend'] == 0
+    assert body['projected']['totalSpend'] == 100 * remaining
+
+    # 다른 달은 예정 금액 없음
+    prev = today.replace(day=1) - timedelta(days=1)
+    other = client.get(f'/api/stats/monthly-spend?year={prev.year}&month={prev.month}&projected=1').get_json()
+    assert 'projected' not in other
@@ -0,0 +1,65 @@
+""" JSON 인코딩, 내역 행 컬럼 선택, gzip 응답 """
+import gzip
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+from conftest import add
+from modules import serializer
+
+
+@pytest.mark.parametrize('use_orjson', [True, False])
+def test_dumps(monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(serializer, 'orjson', None)
+    elif serializer.orjson is None:
+        pytest.skip("orjson 없음")
+    obj = {'d': date(2025, 3, 1), 't': datetime(2025, 3, 1, 9, 30), 'n': Decimal('4500'),
+           'f': Decimal('1.5'), 's': '김밥'}
+    text = serializer.dumps(obj)
+    assert text == '{"d":"2025-03-01","t":"2025-03-01T09:30:00","n":4500,"f":1.5,"s":"김밥"}'
+    assert json.loads(serializer.dumps({'b': 1, 'a': 2}, sort_keys=True, indent=2)) == {'a': 2, 'b': 1}
+    with pytest.raises(TypeError):
+        serializer.dumps({'x': object()})
+
+
+def test_rows_keep_only_screen_fields():
+    item = {'id': 1, 'user_id': 'secret', 'date': date(2025, 3, 1), 'type': '출금', 'description': 'x',
+            'amount': 100, 'category': None, 'pay': '카드', 'created_at': 'x'}
+    assert serializer.rows([item]) == [{'id': 1, 'date': date(2025, 3, 1), 'type': '출금', 'description': 'x',
+                                         'amount': 100, 'category': None, 'pay': '카드'}]
+    assert serializer.rows([item], compact=True) == {
+        'columns': list(serializer.ROW_FIELDS), 'rows': [(1, date(2025, 3, 1), '출금', 'x', 100, None, '카드')]}
+    assert serializer.row(item) == serializer.rows([item])[0]
+
+
+@pytest.mark.skipif(not serializer.GZIP_ENABLED, reason="gzip_enabled = False")
+def test_large_json_is_gzipped(client):
+    add(client, '2025-03-01', 1000)
+    small = client.get('/transactions', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in small.headers
+
+    for i in range(40):
+        add(client, '2025-03-02', 1000 + i, desc=f'긴 설명 {i} ' * 3)
+    plain = client.get('/transactions')
+    assert 'Content-Encoding' not in plain.headers
+    assert len(plain.get_data()) >= serializer.GZIP_MIN_SIZE
+
+    resp = client.get('/transactions', headers={'Accept-Encoding': 'gzip'})
+    assert resp.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in resp.headers['Vary']
+    assert json.loads(gzip.decompress(resp.get_data())) == plain.get_json()
+
+
+@pytest.mark.skipif(not serializer.GZIP_ENABLED, reason="gzip_enabled = False")
+def test_gzip_weakens_etag(client):
+    add(client, '2025-03-01', 1000)
+    url = '/api/stats/dashboard?year=2025&month=3'
+    resp = client.get(url, headers={'Accept-Encoding': 'gzip'})
+    assert resp.headers['Content-Encoding'] == 'gzip'
+    assert resp.headers['ETag'].startswith('W/"')
+    # 약한 ETag 를 그대로 보내도 재검증은 동작
+    again = client.get(url, headers={'Accept-Encoding': 'gzip', 'If-None-Match': resp.headers['ETag']})
+    assert again.status_code == 304
@@ -0,0 +1,68 @@
+""" /api/stats/range 주/월 구간, 쓰기 후 캐시 무효화 """
+from conftest import add
+
+
+def stats_range(client, start, end, granularity):
+    resp = client.get(f'/api/stats/range?from={start}&to={end}&granularity={granularity}')
+    assert resp.status_code == 200, resp.get_json()
+    return resp.get_json()
+
+
+def test_range_week_buckets(client):
+    add(client, '2025-03-03', 1000)                  # 월요일, from 이전이라 빠짐
+    add(client, '2025-03-09', 2000)                  # 일요일 -> 03-03 주
+    add(client, '2025-03-10', 5000, type='입금')     # 월요일 -> 03-10 주
+    add(client, '2025-03-12', 700)                   # to 당일 포함
+    add(client, '2025-03-13', 9999)                  # to 다음 날이라 빠짐
+
+    body = stats_range(client, '2025-03-05', '2025-03-12', 'week')
+    # 구간은 월요일에 시작하고, 첫 구간은 from 이전 월요일부터
+    assert body['labels'] == ['2025-03-03', '2025-03-10']
+    assert body['spend'] == [2000, 700]
+    assert body['income'] == [0, 5000]
+    assert body['net'] == [-2000, 4300]
+    assert body['totals']['spend'] == 2700
+
+
+def test_range_month_buckets(client):
+    add(client, '2025-01-31', 1000)
+    add(client, '2025-02-01', 2000)
+    add(client, '2025-02-28', 3000, type='입금')
+    add(client, '2025-04-01', 4000)
+
+    body = stats_range(client, '2025-01-01', '2025-03-31', 'month')
+    assert body['labels'] == ['2025-01', '2025-02', '2025-03']
+    assert body['spend'] == [1000, 2000, 0]
+    assert body['income'] == [0, 3000, 0]
+    assert body['cumSpend'] == [1000, 3000, 3000]
+
+
+def test_range_sees_writes_after_cached_response(client):
+    assert stats_range(client, '2025-05-01', '2025-05-31', 'month')['spend'] == [0]
+    tx_id = add(client, '2025-05-10', 1500)
+    assert stats_range(client, '2025-05-01', '2025-05-31', 'month')['spend'] == [1500]
+    client.post('/edit', json={'id': tx_id, 'date': '2025-05-10', 'type': '출금', 'desc': 'x', 'amount': 2500})
+    assert stats_range(client, '2025-05-01', '2025-05-31', 'month')['spend'] == [2500]
+    client.post('/delete', json={'id': tx_id})
+    assert stats_range(client, '2025-05-01', '2025-05-31', 'month')['spend'] == [0]
+
+
+def test_range_rejects_bad_params(client):
+    for query in ('granularity=year', 'from=2025-03-10&to=2025-03-01', 'from=2025-99-01'):
+        assert client.get(f'/api/stats/range?{query}').status_code == 400, query
+
+
+def test_other_excludes_spend_without_pay(client):
+    # 결제수단 없는 출금은 spend 에만 들어가고 card/transfer/other 어디에도 안 셈
+    add(client, '2025-03-01', 1000, pay='카드')
+    add(client, '2025-03-01', 2000, pay='현금')
+    add(client, '2025-03-02', 4000)
+
+    body = stats_range(client, '2025-03-01', '2025-03-31', 'month')
+    assert body['spend'] == [7000]
+    assert body['totals']['card'] == 1000
+    assert body['totals']['other'] == 2000
+
+    monthly = client.get('/api/stats/monthly-spend?year=2025&month=3').get_json()
+    assert monthly['totalSpend'] == 7000
+    assert monthly['totalOther'] == 2000
@@ -0,0 +1,125 @@
+""" 통계 응답 캐시: 달별 버전 무효화, ETag/304, MemoryCache 한도, RedisCache 대체 클라이언트 """
+import time
+from datetime import date
+
+import pytest
+
+from conftest import add, new_user_id
+from modules import cache as stats_cache
+
+
+class DictRedis:
+    """ RedisCache 가 쓰는 get/set(ex=)/incr/mget 만 가진 대체 클라이언트 """
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def incr(self, key):
+        self.data[key] = int(self.data.get(key) or 0) + 1
+        return self.data[key]
+
+    def mget(self, keys):
+        return [self.data.get(k) for k in keys]
+
+
+@pytest.fixture
+def use_cache():
+    """ 테스트 동안만 저장소를 바꿔 끼움 """
+    before = stats_cache.get_cache()
+    yield stats_cache.set_cache
+    stats_cache.set_cache(before)
+
+
+def counting(value):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return value
+    return compute, calls
+
+
+def test_memory_cache_lru_and_ttl():
+    c = stats_cache.MemoryCache(max_size=2, ttl=60)
+    c.set('a', 1)
+    c.set('b', 2)
+    assert c.get('a') == 1      # a 를 최근에 씀
+    c.set('c', 3)               # 가장 오래 안 쓴 b 가 밀려남
+    assert (c.get('a'), c.get('b'), c.get('c')) == (1, None, 3)
+
+    c.ttl = 0
+    time.sleep(0.001)
+    assert c.get('a') is None
+
+
+def test_memory_cache_versions_are_bounded_and_never_reused():
+    c = stats_cache.MemoryCache(max_size=1, ttl=60, max_versions=2)
+    [a] = c.versions(['a'])
+    c.bump(['a'])
+    [a2] = c.versions(['a'])
+    assert a2 != a
+    c.versions(['b', 'c'])      # a 는 밀려남
+    assert c.stats()['versions'] == 2
+    [a3] = c.versions(['a'])    # 밀려난 이름은 한 번도 안 쓴 번호로 다시 시작
+    assert a3 not in (a, a2)
+
+
+@pytest.mark.parametrize('backend', ['memory', 'redis'])
+def test_bump_invalidates_only_touched_months(use_cache, backend):
+    use_cache(stats_cache.MemoryCache(ttl=60) if backend == 'memory' else stats_cache.RedisCache(DictRedis()))
+    user_id = new_user_id()
+    march, april = [(2025, 3)], [(2025, 4)]
+    compute, calls = counting({'v': 1})
+    get = stats_cache.get_or_compute
+
+    first = get('t', user_id, march, {'x': 1}, compute, str)
+    assert get('t', user_id, march, {'x': 1}, compute, str) == first and len(calls) == 1
+    get('t', user_id, april, {'x': 1}, compute, str)
+    assert len(calls) == 2
+
+    stats_cache.bump_dates(user_id, date(2025, 3, 31))
+    get('t', user_id, march, {'x': 1}, compute, str)
+    get('t', user_id, april, {'x': 1}, compute, str)
+    assert len(calls) == 3      # 3월만 다시 계산
+
+    # 빈 결과(조회 오류)는 저장하지 않음
+    empty, empty_calls = counting({})
+    get('e', user_id, march, {}, empty, str)
+    get('e', user_id, march, {}, empty, str)
+    assert len(empty_calls) == 2
+
+
+def test_etag_and_304(client):
+    url = '/api/stats/monthly-spend?year=2025&month=3'
+    add(client, '2025-03-01', 1000)
+    resp = client.get(url)
+    etag = resp.headers['ETag']
+    assert resp.status_code == 200 and 'no-cache' in resp.headers['Cache-Control']
+
+    again = client.get(url, headers={'If-None-Match': etag})
+    assert again.status_code == 304 and again.get_data() == b''
+
+    # 다른 달에 쓰면 그대로, 같은 달에 쓰면 새 본문
+    add(client, '2024-01-01', 1000)
+    assert client.get(url, headers={'If-None-Match': etag}).status_code == 304
+    add(client, '2025-03-02', 500)
+    changed = client.get(url, headers={'If-None-Match': etag})
+    assert changed.status_code == 200 and changed.headers['ETag'] != etag
+    assert changed.get_json()['totalSpend'] == 1500
+
+
+def test_stats_survive_cache_backend_errors(use_cache, client):
+    class Broken:
+        def __getattr__(self, name):
+            raise ConnectionError("캐시 서버 없음")
+
+    use_cache(Broken())
+    add(client, '2025-03-01', 1000)
+    resp = client.get('/api/stats/monthly-spend?year=2025&month=3')
+    assert resp.status_code == 200 and resp.get_json()['totalSpend'] == 1000
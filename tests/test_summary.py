@@ -0,0 +1,59 @@
+""" 요약 테이블(ledger_summary) 증감 upsert 와 원본 집계 일치 """
+from datetime import date
+
+import pymysql
+
+from conftest import add, new_user_id
+from modules import summary
+
+
+def summary_rows(db, user_id):
+    cur = db.cursor(pymysql.cursors.DictCursor)
+    try:
+        cur.execute("SELECT d, type, category, pay, amount, cnt FROM ledger_summary "
+                    "WHERE user_id = %s ORDER BY d, type", (user_id,))
+        return [(str(r['d']), r['type'], r['category'], r['pay'], int(r['amount']), int(r['cnt']))
+                for r in cur.fetchall()]
+    finally:
+        cur.close()
+
+
+def apply(db, deltas):
+    cur = db.cursor()
+    try:
+        summary.apply_deltas(cur, deltas)
+        db.commit()
+    finally:
+        cur.close()
+
+
+def test_apply_deltas_upserts_and_drops_empty_rows(db):
+    user_id = new_user_id()
+    d = date(2025, 3, 1)
+    apply(db, [(user_id, d, '출금', '식비', '카드', 1000, 1)])
+    # 같은 키는 합쳐지고 (공백/None 도 같은 키로 정규화)
+    apply(db, [(user_id, d, ' 출금 ', ' 식비', '카드', '2,500', 1), (user_id, d, '입금', None, None, 700, 1)])
+    assert summary_rows(db, user_id) == [('2025-03-01', '입금', '', '', 700, 1),
+                                         ('2025-03-01', '출금', '식비', '카드', 3500, 2)]
+
+    # 건수가 0 이 된 칸은 삭제
+    apply(db, [(user_id, d, '출금', '식비', '카드', -3500, -2)])
+    assert summary_rows(db, user_id) == [('2025-03-01', '입금', '', '', 700, 1)]
+
+
+def test_api_writes_keep_summary_in_sync(client, db):
+    first = add(client, '2025-03-01', 1000, category='식비', pay='카드')
+    add(client, '2025-03-01', 2000, category='식비', pay='카드')
+    add(client, '2025-03-02', 3000, type='입금', category='급여')
+    client.post('/edit', json={'id': first, 'date': '2025-03-05', 'type': '출금', 'desc': 'x', 'amount': 1500})
+    resp = client.post('/api/transactions/batch', json={'operations': [
+        {'op': 'create', 'date': '2025-03-06', 'type': '출금', 'desc': 'b', 'amount': 400},
+        {'op': 'delete', 'id': first},
+    ]})
+    assert resp.status_code == 200, resp.get_json()
+
+    assert summary.check(db, client.user_id) == []
+    rows = summary_rows(db, client.user_id)
+    assert sum(r[5] for r in rows) == 3
+    assert summary.rebuild(db, client.user_id) == len(rows)
+    assert summary_rows(db, client.user_id) == rows
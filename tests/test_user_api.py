@@ -0,0 +1,42 @@
+""" 가입/로그인 (아이디 중복은 INSERT 의 1062 오류로 판단) """
+import pymysql
+import pytest
+
+from conftest import PASSWORD, login_client, new_user_id
+from modules import user
+from modules.user import db_connector
+
+
+def test_register_duplicate_id(app, client):
+    resp = app.test_client().post('/api/register', json={'username': 'x', 'id': client.user_id, 'password': 'other'})
+    assert resp.status_code == 400
+    assert resp.get_json() == {'ok': False, 'error': '이미 사용 중인 아이디입니다.'}
+    assert user.create_user('x', client.user_id, 'other') == (False, 'duplicate_id')
+
+
+def test_duplicate_key_raises_1062(client):
+    db = db_connector()
+    cur = db.cursor()
+    try:
+        with pytest.raises(pymysql.err.IntegrityError) as info:
+            cur.execute("INSERT INTO user (user_name, id, password) VALUES (%s, %s, %s)", ('x', client.user_id, 'x'))
+        db.rollback()
+    finally:
+        cur.close()
+        db.close()
+    assert info.value.args[0] == user.DUP_ENTRY
+
+
+def test_register_requires_all_fields(app):
+    resp = app.test_client().post('/api/register', json={'id': new_user_id(), 'password': PASSWORD})
+    assert resp.status_code == 400
+
+
+def test_login(app):
+    client = login_client(app)
+    wrong = app.test_client().post('/login_check', json={'id': client.user_id, 'password': 'wrong'})
+    assert wrong.get_json() == {'success': False}
+
+    assert client.get('/transactions-by-date?date=2025-03-01').status_code == 200
+    client.get('/logout')
+    assert client.get('/transactions-by-date?date=2025-03-01').status_code == 401
@@ -0,0 +1,8 @@
+"""
+WSGI 진입점 - gunicorn wsgi:app / FLASK_APP=wsgi.py flask run
+
+app.py 를 불러오고 백그라운드 스레드(지출 조언 미리 계산, 반복 내역 스케줄러)를 시작합니다.
+"""
+from app import app, start_background_workers
+
+start_background_workers()